@@ -20,7 +20,8 @@
 
 
 __all__ = [
-    'JsonCacheHandler', 'TypeFetchError',
+    'BinaryCacheHandler', 'JsonCacheHandler', 'MmapCacheHandler',
+    'SQLiteCacheHandler', 'TypeFetchError',
     'EffectMode', 'Restriction', 'State',
     'JsonDataHandler', 'SQLiteDataHandler',
     'Fit',
@@ -38,37 +39,62 @@ __all__ = [
 __version__ = '0.0.0.dev10'
 
 
-from eos.cache_handler import JsonCacheHandler
-from eos.cache_handler import TypeFetchError
-from eos.const.eos import EffectMode
-from eos.const.eos import Restriction
-from eos.const.eos import State
-from eos.data_handler import JsonDataHandler
-from eos.data_handler import SQLiteDataHandler
-from eos.fit import Fit
-from eos.fleet import Fleet
-from eos.item import Booster
-from eos.item import Character
-from eos.item import Charge
-from eos.item import Drone
-from eos.item import EffectBeacon
-from eos.item import FighterSquad
-from eos.item import Implant
-from eos.item import ModuleHigh
-from eos.item import ModuleLow
-from eos.item import ModuleMid
-from eos.item import Rig
-from eos.item import Ship
-from eos.item import Skill
-from eos.item import Stance
-from eos.item import Subsystem
-from eos.item.exception import NoSuchAbilityError
-from eos.item.exception import NoSuchSideEffectError
-from eos.item_container import SlotTakenError
-from eos.restriction import ValidationError
-from eos.solar_system import SolarSystem
-from eos.source import SourceManager
-from eos.stats_container import Coordinates
-from eos.stats_container import DmgProfile
-from eos.stats_container import Orientation
-from eos.stats_container import ResistProfile
+from importlib import import_module
+
+
+# Public names are imported on first access, so that importing the package
+# does not load all of its modules
+# Format: {name: module where it is defined}
+_lazy_names = {
+    'BinaryCacheHandler': 'eos.cache_handler',
+    'JsonCacheHandler': 'eos.cache_handler',
+    'MmapCacheHandler': 'eos.cache_handler',
+    'SQLiteCacheHandler': 'eos.cache_handler',
+    'TypeFetchError': 'eos.cache_handler',
+    'EffectMode': 'eos.const.eos',
+    'Restriction': 'eos.const.eos',
+    'State': 'eos.const.eos',
+    'JsonDataHandler': 'eos.data_handler',
+    'SQLiteDataHandler': 'eos.data_handler',
+    'Fit': 'eos.fit',
+    'Fleet': 'eos.fleet',
+    'Booster': 'eos.item',
+    'Character': 'eos.item',
+    'Charge': 'eos.item',
+    'Drone': 'eos.item',
+    'EffectBeacon': 'eos.item',
+    'FighterSquad': 'eos.item',
+    'Implant': 'eos.item',
+    'ModuleHigh': 'eos.item',
+    'ModuleLow': 'eos.item',
+    'ModuleMid': 'eos.item',
+    'Rig': 'eos.item',
+    'Ship': 'eos.item',
+    'Skill': 'eos.item',
+    'Stance': 'eos.item',
+    'Subsystem': 'eos.item',
+    'NoSuchAbilityError': 'eos.item.exception',
+    'NoSuchSideEffectError': 'eos.item.exception',
+    'SlotTakenError': 'eos.item_container',
+    'ValidationError': 'eos.restriction',
+    'SolarSystem': 'eos.solar_system',
+    'SourceManager': 'eos.source',
+    'Coordinates': 'eos.stats_container',
+    'DmgProfile': 'eos.stats_container',
+    'Orientation': 'eos.stats_container',
+    'ResistProfile': 'eos.stats_container'}
+
+
+def __getattr__(name):
+    try:
+        module_name = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(__all__))
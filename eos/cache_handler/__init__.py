@@ -19,8 +19,11 @@
 # ==============================================================================
 
 
+from .binary_cache_handler import BinaryCacheHandler
 from .exception import AttrFetchError
 from .exception import BuffTemplatesFetchError
 from .exception import EffectFetchError
 from .exception import TypeFetchError
 from .json_cache_handler import JsonCacheHandler
+from .mmap_cache_handler import MmapCacheHandler
+from .sqlite_cache_handler import SQLiteCacheHandler
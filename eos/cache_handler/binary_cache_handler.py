@@ -0,0 +1,312 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import marshal
+import os
+import struct
+from enum import Enum
+from logging import getLogger
+
+from eos.util.repr import make_repr_str
+from .base import BaseCacheHandler
+from .compression import compress_attr
+from .compression import compress_buff_template
+from .compression import compress_effect
+from .compression import compress_type
+from .compression import decompress_attr
+from .compression import decompress_buff_template
+from .compression import decompress_effect
+from .compression import decompress_type
+from .exception import AttrFetchError
+from .exception import BuffTemplatesFetchError
+from .exception import EffectFetchError
+from .exception import TypeFetchError
+from .lru import ObjectCache
+
+
+logger = getLogger(__name__)
+
+
+# File starts with magic bytes, file format version and size of index
+HEADER = struct.Struct('<4sHQ')
+FORMAT_VERSION = 1
+# Version of marshal format used to serialize index and records
+MARSHAL_VERSION = 4
+
+
+def primitivize(data):
+    """Convert compressed eve object data into builtin types.
+
+    Marshal works only with exact builtin types, while compressed data may
+    contain enum members and named tuples.
+    """
+    if isinstance(data, (tuple, list)):
+        return tuple(primitivize(i) for i in data)
+    if isinstance(data, Enum):
+        return data.value
+    return data
+
+
+class BinaryCacheHandler(BaseCacheHandler):
+    """Indexed binary cache storage implementation.
+
+    Persistent cache is stored as a single file with index in its beginning,
+    which is followed by records of separate eve objects. On initialization,
+    only index is read; eve objects are decoded on first request. Attributes,
+    effects and warfare buff templates are kept in memory once decoded, while
+    item types are kept in LRU cache. Item types which are evicted from it are
+    reused while something else refers them.
+
+    Args:
+        cache_path: File path where persistent cache will be stored.
+        type_cache_size (optional): Max quantity of item types which are kept
+            in memory regardless of their usage. 1000 by default.
+    """
+
+    # Magic bytes which identify format of cache file
+    _magic = b'EOSB'
+
+    def __init__(self, cache_path, type_cache_size=1000):
+        self._cache_path = os.path.abspath(cache_path)
+        # Raw data of the cache file, excluding header and index
+        self.__data = b''
+        # Indices of records in data
+        # Format: {object ID: (offset, size)}
+        self.__type_index = {}
+        self.__attr_index = {}
+        self.__effect_index = {}
+        self.__buff_template_index = {}
+        # Storage for decoded objects
+        self.__type_cache = ObjectCache(type_cache_size)
+        # Format: {attr ID: attribute}
+        self.__attr_storage = {}
+        # Format: {effect ID: effect}
+        self.__effect_storage = {}
+        # Format: {buff ID: {buff templates}}
+        self.__buff_template_storage = {}
+        self.__fingerprint = None
+        # Read index of persistent cache, if possible
+        self.__load_persistent_cache()
+
+    def get_type(self, type_id):
+        try:
+            type_id = int(type_id)
+        except TypeError as e:
+            raise TypeFetchError(type_id) from e
+        item_type = self.__type_cache.get(type_id)
+        if item_type is not None:
+            return item_type
+        try:
+            type_data = self.__read_record(self.__type_index, type_id)
+        except KeyError as e:
+            raise TypeFetchError(type_id) from e
+        item_type = self._type_decompress(type_data)
+        self.__type_cache.add(type_id, item_type)
+        return item_type
+
+    def get_attr(self, attr_id):
+        try:
+            attr_id = int(attr_id)
+        except TypeError as e:
+            raise AttrFetchError(attr_id) from e
+        try:
+            return self.__attr_storage[attr_id]
+        except KeyError:
+            pass
+        try:
+            attr_data = self.__read_record(self.__attr_index, attr_id)
+        except KeyError as e:
+            raise AttrFetchError(attr_id) from e
+        attr = self.__attr_storage[attr_id] = decompress_attr(attr_data)
+        return attr
+
+    def get_effect(self, effect_id):
+        try:
+            effect_id = int(effect_id)
+        except TypeError as e:
+            raise EffectFetchError(effect_id) from e
+        try:
+            return self.__effect_storage[effect_id]
+        except KeyError:
+            pass
+        try:
+            effect_data = self.__read_record(self.__effect_index, effect_id)
+        except KeyError as e:
+            raise EffectFetchError(effect_id) from e
+        effect = self.__effect_storage[effect_id] = decompress_effect(
+            effect_data)
+        return effect
+
+    def get_buff_templates(self, buff_id):
+        try:
+            buff_id = int(buff_id)
+        except TypeError as e:
+            raise BuffTemplatesFetchError(buff_id) from e
+        try:
+            return self.__buff_template_storage[buff_id]
+        except KeyError:
+            pass
+        try:
+            buff_templates_data = self.__read_record(
+                self.__buff_template_index, buff_id)
+        except KeyError as e:
+            raise BuffTemplatesFetchError(buff_id) from e
+        buff_templates = self.__buff_template_storage[buff_id] = {
+            decompress_buff_template(d) for d in buff_templates_data}
+        return buff_templates
+
+    def get_fingerprint(self):
+        return self.__fingerprint
+
+    def update_cache(self, eve_objects, fingerprint):
+        index, records = self._encode(eve_objects, fingerprint)
+        index_data = marshal.dumps(index, MARSHAL_VERSION)
+        self.__update_persistent_cache(index_data, records)
+        # Read data back from persistent storage, to use the same data access
+        # mode which is used when cache handler is initialized
+        self.__load_persistent_cache()
+
+    def _encode(self, eve_objects, fingerprint):
+        """Encode eve objects into index and records.
+
+        Returns:
+            Tuple with index and list of records. Offsets in index are relative
+            to the beginning of the first record.
+        """
+        types, attrs, effects, buff_templates = eve_objects
+        buff_templates_data = {}
+        for buff_template in buff_templates:
+            buff_templates_data.setdefault(buff_template.buff_id, []).append(
+                compress_buff_template(buff_template))
+        sections = (
+            ('types', ((t.id, self._type_compress(t)) for t in types)),
+            ('attrs', ((a.id, compress_attr(a)) for a in attrs)),
+            ('effects', ((e.id, compress_effect(e)) for e in effects)),
+            ('buff_templates', buff_templates_data.items()))
+        index = {'fingerprint': fingerprint}
+        records = []
+        offset = 0
+        for section_name, section_data in sections:
+            section_index = index[section_name] = {}
+            for obj_id, obj_data in section_data:
+                record = marshal.dumps(primitivize(obj_data), MARSHAL_VERSION)
+                section_index[int(obj_id)] = (offset, len(record))
+                records.append(record)
+                offset += len(record)
+        return index, records
+
+    def _type_compress(self, item_type):
+        """Compress item type into data which will be stored in its record."""
+        return compress_type(item_type)
+
+    def _type_decompress(self, type_data):
+        """Reconstruct item type from data stored in its record."""
+        return decompress_type(type_data, self.get_effect)
+
+    def __load_persistent_cache(self):
+        # If cache file doesn't exist, bail out - we have nothing to read
+        if not os.path.exists(self._cache_path):
+            return
+        try:
+            index, data = self._read_cache_file(self._cache_path)
+        except KeyboardInterrupt:
+            raise
+        # If file is malformed, or anything else bad happens, leave memory
+        # cache empty
+        except:
+            msg = 'error during reading cache'
+            logger.error(msg)
+        else:
+            self.__update_memory_cache(index, data)
+
+    def _read_cache_file(self, cache_path):
+        """Read index and raw record data from cache file.
+
+        Returns:
+            Tuple with index and object which supports slicing and provides
+            record bytes.
+        """
+        with open(cache_path, 'rb') as file:
+            index = self._read_index(file)
+            data = file.read()
+        return index, data
+
+    def _read_index(self, file):
+        """Read index from file, leaving file position at the first record."""
+        magic, version, index_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != self._magic or version != FORMAT_VERSION:
+            msg = 'unexpected cache file format'
+            raise ValueError(msg)
+        return marshal.loads(file.read(index_size))
+
+    def __update_persistent_cache(self, index_data, records):
+        """Write passed data to persistent storage."""
+        cache_folder = os.path.dirname(self._cache_path)
+        if os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        # Write to temporary file first, to not leave half-written cache if
+        # something goes wrong
+        tmp_path = '{}.tmp'.format(self._cache_path)
+        with open(tmp_path, 'wb') as file:
+            file.write(HEADER.pack(
+                self._magic, FORMAT_VERSION, len(index_data)))
+            file.write(index_data)
+            for record in records:
+                file.write(record)
+        os.replace(tmp_path, self._cache_path)
+
+    def __update_memory_cache(self, index, data):
+        """Replace existing memory cache data with passed data."""
+        old_data = self.__data
+        # Clear storage to make sure objects composed from old data are gone
+        self.__type_cache.clear()
+        self.__attr_storage.clear()
+        self.__effect_storage.clear()
+        self.__buff_template_storage.clear()
+        self.__type_index = index['types']
+        self.__attr_index = index['attrs']
+        self.__effect_index = index['effects']
+        self.__buff_template_index = index['buff_templates']
+        self.__data = data
+        self.__fingerprint = index['fingerprint']
+        self._release_data(old_data)
+
+    def _release_data(self, data):
+        """Release raw record data which is not used by cache handler anymore.
+
+        Called after memory cache is switched to new data, when objects composed
+        from old data are not referred by cache handler.
+        """
+        pass
+
+    def __read_record(self, index, obj_id):
+        """Decode record of object with passed ID.
+
+        Raises:
+            KeyError: If there's no such object in passed index.
+        """
+        offset, size = index[obj_id]
+        return marshal.loads(self.__data[offset:offset + size])
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = [['cache_path', '_cache_path']]
+        return make_repr_str(self, spec)
@@ -0,0 +1,181 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+"""Conversion of eve objects into python primitives and back.
+
+Used by cache handlers to store eve objects persistently.
+"""
+
+
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.buff_template import WarfareBuffTemplate
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import AbilityData
+from eos.eve_obj.type import TypeFactory
+
+
+def compress_type(item_type):
+    """Compress item type into python primitives."""
+    if item_type.default_effect is not None:
+        default_effect_id = item_type.default_effect.id
+    else:
+        default_effect_id = None
+    return (
+        item_type.id,
+        item_type.group_id,
+        item_type.category_id,
+        tuple(item_type.attrs.items()),
+        tuple(item_type.effects.keys()),
+        default_effect_id,
+        tuple(item_type.abilities_data.items()),
+        tuple(item_type.required_skills.items()))
+
+
+def decompress_type(type_data, effect_getter, attrs=None):
+    """Reconstruct item type from python primitives.
+
+    Args:
+        type_data: Compressed item type.
+        effect_getter: Callable which returns effect by its ID.
+        attrs (optional): Map with base attribute values to use instead of
+            attribute values stored in compressed data.
+    """
+    default_effect_id = type_data[5]
+    if default_effect_id is None:
+        default_effect = None
+    else:
+        default_effect = effect_getter(default_effect_id)
+    if attrs is None:
+        attrs = {k: v for k, v in type_data[3]}
+    return TypeFactory.make(
+        type_id=type_data[0],
+        group_id=type_data[1],
+        category_id=type_data[2],
+        attrs=attrs,
+        effects=tuple(effect_getter(eid) for eid in type_data[4]),
+        default_effect=default_effect,
+        abilities_data={k: AbilityData(*v) for k, v in type_data[6]},
+        required_skills={k: v for k, v in type_data[7]})
+
+
+def compress_attr(attr):
+    """Compress attribute into python primitives."""
+    return (
+        attr.id,
+        attr.max_attr_id,
+        attr.default_value,
+        attr.high_is_good,
+        attr.stackable)
+
+
+def decompress_attr(attr_data):
+    """Reconstruct attribute from python primitives."""
+    return AttrFactory.make(
+        attr_id=attr_data[0],
+        max_attr_id=attr_data[1],
+        default_value=attr_data[2],
+        high_is_good=attr_data[3],
+        stackable=attr_data[4])
+
+
+def compress_effect(effect):
+    """Compress effect into python primitives."""
+    return (
+        effect.id,
+        effect.category_id,
+        effect.is_offensive,
+        effect.is_assistance,
+        effect.duration_attr_id,
+        effect.discharge_attr_id,
+        effect.range_attr_id,
+        effect.falloff_attr_id,
+        effect.tracking_speed_attr_id,
+        effect.fitting_usage_chance_attr_id,
+        effect.resist_attr_id,
+        effect.build_status,
+        tuple(_compress_modifier(m) for m in effect.modifiers))
+
+
+def decompress_effect(effect_data):
+    """Reconstruct effect from python primitives."""
+    return EffectFactory.make(
+        effect_id=effect_data[0],
+        category_id=effect_data[1],
+        is_offensive=effect_data[2],
+        is_assistance=effect_data[3],
+        duration_attr_id=effect_data[4],
+        discharge_attr_id=effect_data[5],
+        range_attr_id=effect_data[6],
+        falloff_attr_id=effect_data[7],
+        tracking_speed_attr_id=effect_data[8],
+        fitting_usage_chance_attr_id=effect_data[9],
+        resist_attr_id=effect_data[10],
+        build_status=effect_data[11],
+        modifiers=tuple(_decompress_modifier(md) for md in effect_data[12]))
+
+
+def _compress_modifier(modifier):
+    """Compress dogma modifier into python primitives."""
+    return (
+        modifier.affectee_filter,
+        modifier.affectee_domain,
+        modifier.affectee_filter_extra_arg,
+        modifier.affectee_attr_id,
+        modifier.operator,
+        modifier.aggregate_mode,
+        modifier.aggregate_key,
+        modifier.affector_attr_id)
+
+
+def _decompress_modifier(modifier_data):
+    """Reconstruct dogma modifier from python primitives."""
+    return DogmaModifier(
+        affectee_filter=modifier_data[0],
+        affectee_domain=modifier_data[1],
+        affectee_filter_extra_arg=modifier_data[2],
+        affectee_attr_id=modifier_data[3],
+        operator=modifier_data[4],
+        aggregate_mode=modifier_data[5],
+        aggregate_key=modifier_data[6],
+        affector_attr_id=modifier_data[7])
+
+
+def compress_buff_template(buff_template):
+    """Compress warfare buff template into python primitives."""
+    return (
+        buff_template.buff_id,
+        buff_template.affectee_filter,
+        buff_template.affectee_filter_extra_arg,
+        buff_template.affectee_attr_id,
+        buff_template.operator,
+        buff_template.aggregate_mode)
+
+
+def decompress_buff_template(buff_template_data):
+    """Reconstruct warfare buff template from python primitives."""
+    return WarfareBuffTemplate(
+        buff_id=buff_template_data[0],
+        affectee_filter=buff_template_data[1],
+        affectee_filter_extra_arg=buff_template_data[2],
+        affectee_attr_id=buff_template_data[3],
+        operator=buff_template_data[4],
+        aggregate_mode=buff_template_data[5])
@@ -0,0 +1,71 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from collections import OrderedDict
+from weakref import WeakValueDictionary
+
+
+class ObjectCache:
+    """Bounded cache of decoded eve objects.
+
+    Keeps limited quantity of recently used objects. Objects which are evicted
+    from it are still provided while they are referenced from somewhere else,
+    this way the same eve object is never represented by multiple instances.
+
+    Args:
+        size: Max quantity of objects which are kept regardless of their
+            usage.
+    """
+
+    def __init__(self, size):
+        self.__size = size
+        # Format: {key: object}
+        self.__recent = OrderedDict()
+        # Format: {key: object}
+        self.__refs = WeakValueDictionary()
+
+    def get(self, key):
+        """Get object by key, or None if cache doesn't have it."""
+        recent = self.__recent
+        try:
+            obj = recent[key]
+        except KeyError:
+            obj = self.__refs.get(key)
+            if obj is not None:
+                self.__add_recent(key, obj)
+        else:
+            recent.move_to_end(key)
+        return obj
+
+    def add(self, key, obj):
+        """Put object into cache."""
+        self.__refs[key] = obj
+        self.__add_recent(key, obj)
+
+    def clear(self):
+        self.__recent.clear()
+        self.__refs.clear()
+
+    def __add_recent(self, key, obj):
+        recent = self.__recent
+        recent[key] = obj
+        if len(recent) > self.__size:
+            recent.popitem(last=False)
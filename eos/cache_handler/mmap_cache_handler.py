@@ -0,0 +1,193 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import mmap
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from .binary_cache_handler import BinaryCacheHandler
+from .compression import compress_type
+from .compression import decompress_type
+
+
+# Codes of attribute value types, stored alongside values, which are kept as
+# doubles
+VALUE_FLOAT = 0
+VALUE_INT = 1
+VALUE_BOOL = 2
+
+
+class SharedTypeAttrs(Mapping):
+    """Read-only map with base attribute values of an item type.
+
+    Values are not copied into the map, it refers span of flat arrays instead.
+    Attribute IDs within span are sorted, thus lookup is done via binary
+    search. Values are stored as doubles, and converted back to their original
+    type using type codes; integers which cannot be represented by double
+    precisely lose precision.
+    """
+
+    __slots__ = ('__ids', '__values', '__type_codes', '__start', '__stop')
+
+    def __init__(self, ids, values, type_codes, start, stop):
+        self.__ids = ids
+        self.__values = values
+        self.__type_codes = type_codes
+        self.__start = start
+        self.__stop = stop
+
+    def __getitem__(self, attr_id):
+        ids = self.__ids
+        stop = self.__stop
+        try:
+            pos = bisect_left(ids, attr_id, self.__start, stop)
+        # Raised when attribute ID cannot be compared with integers
+        except TypeError as e:
+            raise KeyError(attr_id) from e
+        if pos == stop or ids[pos] != attr_id:
+            raise KeyError(attr_id)
+        value = self.__values[pos]
+        type_code = self.__type_codes[pos]
+        if type_code == VALUE_INT:
+            return int(value)
+        if type_code == VALUE_BOOL:
+            return bool(value)
+        return value
+
+    def __iter__(self):
+        return iter(self.__ids[self.__start:self.__stop])
+
+    def __len__(self):
+        return self.__stop - self.__start
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class MmapCacheHandler(BinaryCacheHandler):
+    """Memory-mapped cache storage implementation.
+
+    Uses the same approach as binary cache handler, but cache file is mapped
+    into memory read-only instead of being read. Base attribute values of item
+    types are stored in flat arrays within the file, and item types refer them
+    directly. This way, multiple processes which use the same cache file share
+    single copy of this data. Item type attribute maps are read-only.
+
+    Args:
+        cache_path: File path where persistent cache will be stored.
+        type_cache_size (optional): Max quantity of item types which are kept
+            in memory regardless of their usage. 1000 by default.
+    """
+
+    _magic = b'EOSM'
+
+    def __init__(self, cache_path, type_cache_size=1000):
+        # Containers used during cache encoding
+        self.__encoded_attr_ids = None
+        self.__encoded_attr_values = None
+        self.__encoded_attr_type_codes = None
+        # Views on memory-mapped attribute data
+        self.__attr_ids = None
+        self.__attr_values = None
+        self.__attr_type_codes = None
+        BinaryCacheHandler.__init__(self, cache_path, type_cache_size)
+
+    def _encode(self, eve_objects, fingerprint):
+        self.__encoded_attr_ids = array('I')
+        self.__encoded_attr_values = array('d')
+        self.__encoded_attr_type_codes = array('B')
+        try:
+            index, records = BinaryCacheHandler._encode(
+                self, eve_objects, fingerprint)
+            attr_arrays = (
+                self.__encoded_attr_values,
+                self.__encoded_attr_ids,
+                self.__encoded_attr_type_codes)
+        finally:
+            self.__encoded_attr_ids = None
+            self.__encoded_attr_values = None
+            self.__encoded_attr_type_codes = None
+        # Attribute arrays are stored after all the records
+        offset = sum(len(r) for r in records)
+        index['type_attrs'] = (offset, len(attr_arrays[0]))
+        for attr_array in attr_arrays:
+            records.append(attr_array.tobytes())
+        return index, records
+
+    def _type_compress(self, item_type):
+        type_data = compress_type(item_type)
+        attr_ids = self.__encoded_attr_ids
+        start = len(attr_ids)
+        for attr_id, value in sorted(item_type.attrs.items()):
+            attr_ids.append(attr_id)
+            self.__encoded_attr_values.append(value)
+            if isinstance(value, bool):
+                type_code = VALUE_BOOL
+            elif isinstance(value, int):
+                type_code = VALUE_INT
+            else:
+                type_code = VALUE_FLOAT
+            self.__encoded_attr_type_codes.append(type_code)
+        # Replace attribute values with their span in attribute arrays
+        return (*type_data[:3], (start, len(attr_ids)), *type_data[4:])
+
+    def _type_decompress(self, type_data):
+        start, stop = type_data[3]
+        attrs = SharedTypeAttrs(
+            self.__attr_ids, self.__attr_values, self.__attr_type_codes,
+            start, stop)
+        return decompress_type(type_data, self.get_effect, attrs=attrs)
+
+    def _read_cache_file(self, cache_path):
+        with open(cache_path, 'rb') as file:
+            index = self._read_index(file)
+            data_start = file.tell()
+            # Mapping stays valid after file is closed
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(mapped)[data_start:]
+        offset, count = index['type_attrs']
+        values_size = count * array('d').itemsize
+        ids_size = count * array('I').itemsize
+        attr_values = data[offset:offset + values_size].cast('d')
+        offset += values_size
+        attr_ids = data[offset:offset + ids_size].cast('I')
+        offset += ids_size
+        attr_type_codes = data[offset:offset + count].cast('B')
+        # Switch views only when all of them are built, to keep old ones usable
+        # if file cannot be read
+        self.__attr_values = attr_values
+        self.__attr_ids = attr_ids
+        self.__attr_type_codes = attr_type_codes
+        return index, data
+
+    def _release_data(self, data):
+        # Nothing is mapped before the first load
+        if not isinstance(data, memoryview):
+            return
+        mapped = data.obj
+        data.release()
+        try:
+            mapped.close()
+        # Item types composed from old data are still in use; mapping will be
+        # closed when the last of them is garbage-collected
+        except BufferError:
+            pass
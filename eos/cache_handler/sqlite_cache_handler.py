@@ -0,0 +1,372 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import os
+import sqlite3
+
+from eos.util.repr import make_repr_str
+from .base import BaseCacheHandler
+from .compression import compress_attr
+from .compression import compress_buff_template
+from .compression import compress_effect
+from .compression import compress_type
+from .compression import decompress_attr
+from .compression import decompress_buff_template
+from .compression import decompress_effect
+from .compression import decompress_type
+from .exception import AttrFetchError
+from .exception import BuffTemplatesFetchError
+from .exception import EffectFetchError
+from .exception import TypeFetchError
+from .lru import ObjectCache
+
+
+# Increment when schema changes, to make sure caches stored using old schema are
+# rebuilt
+SCHEMA_VERSION = 2
+
+# Columns without declared type keep values exactly as they were passed, e.g.
+# integer attribute values are not converted into floats
+SCHEMA = (
+    'CREATE TABLE metadata ('
+    'field_name TEXT PRIMARY KEY, field_value)',
+    'CREATE TABLE types ('
+    'type_id INTEGER PRIMARY KEY, group_id, category_id, default_effect_id)',
+    'CREATE TABLE type_attrs ('
+    'type_id INTEGER, attr_id INTEGER, value, is_bool INTEGER, '
+    'PRIMARY KEY (type_id, attr_id)) WITHOUT ROWID',
+    'CREATE TABLE type_effects ('
+    'type_id INTEGER, effect_id INTEGER, '
+    'PRIMARY KEY (type_id, effect_id)) WITHOUT ROWID',
+    'CREATE TABLE type_abilities ('
+    'type_id INTEGER, ability_id INTEGER, cooldown_time, charge_quantity, '
+    'PRIMARY KEY (type_id, ability_id)) WITHOUT ROWID',
+    'CREATE TABLE type_skills ('
+    'type_id INTEGER, skill_type_id INTEGER, level, '
+    'PRIMARY KEY (type_id, skill_type_id)) WITHOUT ROWID',
+    'CREATE TABLE attrs ('
+    'attr_id INTEGER PRIMARY KEY, max_attr_id, default_value, high_is_good, '
+    'stackable)',
+    'CREATE TABLE effects ('
+    'effect_id INTEGER PRIMARY KEY, category_id, is_offensive, '
+    'is_assistance, duration_attr_id, discharge_attr_id, range_attr_id, '
+    'falloff_attr_id, tracking_speed_attr_id, fitting_usage_chance_attr_id, '
+    'resist_attr_id, build_status)',
+    'CREATE TABLE modifiers ('
+    'effect_id INTEGER, position INTEGER, affectee_filter, affectee_domain, '
+    'affectee_filter_extra_arg, affectee_attr_id, operator, aggregate_mode, '
+    'aggregate_key, affector_attr_id, '
+    'PRIMARY KEY (effect_id, position)) WITHOUT ROWID',
+    'CREATE TABLE buff_templates ('
+    'buff_id INTEGER, affectee_filter, affectee_filter_extra_arg, '
+    'affectee_attr_id, operator, aggregate_mode)',
+    'CREATE INDEX buff_templates_buff_id ON buff_templates (buff_id)')
+
+# Item type data is fetched using single query, every row of which starts with
+# kind of data it contains
+TYPE_ROW = 0
+TYPE_ATTR_ROW = 1
+TYPE_EFFECT_ROW = 2
+TYPE_ABILITY_ROW = 3
+TYPE_SKILL_ROW = 4
+TYPE_QUERY = (
+    'SELECT {}, group_id, category_id, default_effect_id '
+    'FROM types WHERE type_id = :type_id '
+    'UNION ALL SELECT {}, attr_id, value, is_bool '
+    'FROM type_attrs WHERE type_id = :type_id '
+    'UNION ALL SELECT {}, effect_id, NULL, NULL '
+    'FROM type_effects WHERE type_id = :type_id '
+    'UNION ALL SELECT {}, ability_id, cooldown_time, charge_quantity '
+    'FROM type_abilities WHERE type_id = :type_id '
+    'UNION ALL SELECT {}, skill_type_id, level, NULL '
+    'FROM type_skills WHERE type_id = :type_id'
+).format(
+    TYPE_ROW, TYPE_ATTR_ROW, TYPE_EFFECT_ROW, TYPE_ABILITY_ROW, TYPE_SKILL_ROW)
+
+TABLES = (
+    'metadata', 'types', 'type_attrs', 'type_effects', 'type_abilities',
+    'type_skills', 'attrs', 'effects', 'modifiers', 'buff_templates')
+
+
+class SQLiteCacheHandler(BaseCacheHandler):
+    """SQLite cache storage implementation.
+
+    Eve objects are stored in indexed tables, and are loaded from database
+    only when requested. Recently used objects are kept in memory, thus
+    initialization is fast and memory consumption is bounded, at the cost of
+    slower first access to each object.
+
+    Handler keeps database connection open until it is closed, either
+    explicitly or by using handler as context manager. The connection is
+    created with default sqlite3 settings, thus handler can be used only from
+    the thread which created it.
+
+    Args:
+        cache_path: File path where persistent cache will be stored (.sqlite).
+        obj_cache_size (optional): Max quantity of objects of each kind (item
+            types, attributes, effects) which are kept in memory regardless of
+            their usage. 1000 by default.
+    """
+
+    def __init__(self, cache_path, obj_cache_size=1000):
+        self._cache_path = os.path.abspath(cache_path)
+        cache_folder = os.path.dirname(self._cache_path)
+        if os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        self.__conn = sqlite3.connect(self._cache_path)
+        self.__has_schema = self.__check_schema()
+        self.__fingerprint = self.__load_fingerprint()
+        self.__type_cache = ObjectCache(obj_cache_size)
+        self.__attr_cache = ObjectCache(obj_cache_size)
+        self.__effect_cache = ObjectCache(obj_cache_size)
+        # Buff templates are stored in sets which cannot be referenced weakly,
+        # and there are just a few of them - thus all are kept in memory
+        # Format: {buff ID: {buff templates}}
+        self.__buff_template_storage = {}
+
+    def get_type(self, type_id):
+        try:
+            type_id = int(type_id)
+        except TypeError as e:
+            raise TypeFetchError(type_id) from e
+        item_type = self.__type_cache.get(type_id)
+        if item_type is not None:
+            return item_type
+        type_row = None
+        attrs = []
+        effect_ids = []
+        abilities_data = []
+        required_skills = []
+        for kind, *row in self.__query(TYPE_QUERY, type_id=type_id):
+            if kind == TYPE_ROW:
+                type_row = row
+            elif kind == TYPE_ATTR_ROW:
+                attr_id, value, is_bool = row
+                # SQLite has no boolean type, and returns booleans as integers
+                if is_bool:
+                    value = bool(value)
+                attrs.append((attr_id, value))
+            elif kind == TYPE_EFFECT_ROW:
+                effect_ids.append(row[0])
+            elif kind == TYPE_ABILITY_ROW:
+                abilities_data.append((row[0], row[1:]))
+            elif kind == TYPE_SKILL_ROW:
+                required_skills.append(row[:2])
+        if type_row is None:
+            raise TypeFetchError(type_id)
+        group_id, category_id, default_effect_id = type_row
+        type_data = (
+            type_id, group_id, category_id, attrs, effect_ids,
+            default_effect_id, abilities_data, required_skills)
+        item_type = decompress_type(type_data, self.get_effect)
+        self.__type_cache.add(type_id, item_type)
+        return item_type
+
+    def get_attr(self, attr_id):
+        try:
+            attr_id = int(attr_id)
+        except TypeError as e:
+            raise AttrFetchError(attr_id) from e
+        attr = self.__attr_cache.get(attr_id)
+        if attr is not None:
+            return attr
+        rows = self.__query(
+            'SELECT attr_id, max_attr_id, default_value, high_is_good, '
+            'stackable FROM attrs WHERE attr_id = ?', attr_id)
+        if not rows:
+            raise AttrFetchError(attr_id)
+        attr = decompress_attr(rows[0])
+        self.__attr_cache.add(attr_id, attr)
+        return attr
+
+    def get_effect(self, effect_id):
+        try:
+            effect_id = int(effect_id)
+        except TypeError as e:
+            raise EffectFetchError(effect_id) from e
+        effect = self.__effect_cache.get(effect_id)
+        if effect is not None:
+            return effect
+        rows = self.__query(
+            'SELECT effect_id, category_id, is_offensive, is_assistance, '
+            'duration_attr_id, discharge_attr_id, range_attr_id, '
+            'falloff_attr_id, tracking_speed_attr_id, '
+            'fitting_usage_chance_attr_id, resist_attr_id, build_status '
+            'FROM effects WHERE effect_id = ?', effect_id)
+        if not rows:
+            raise EffectFetchError(effect_id)
+        modifiers_data = self.__query(
+            'SELECT affectee_filter, affectee_domain, '
+            'affectee_filter_extra_arg, affectee_attr_id, operator, '
+            'aggregate_mode, aggregate_key, affector_attr_id '
+            'FROM modifiers WHERE effect_id = ? ORDER BY position', effect_id)
+        effect = decompress_effect((*rows[0], modifiers_data))
+        self.__effect_cache.add(effect_id, effect)
+        return effect
+
+    def get_buff_templates(self, buff_id):
+        try:
+            buff_id = int(buff_id)
+        except TypeError as e:
+            raise BuffTemplatesFetchError(buff_id) from e
+        try:
+            return self.__buff_template_storage[buff_id]
+        except KeyError:
+            pass
+        rows = self.__query(
+            'SELECT buff_id, affectee_filter, affectee_filter_extra_arg, '
+            'affectee_attr_id, operator, aggregate_mode '
+            'FROM buff_templates WHERE buff_id = ?', buff_id)
+        if not rows:
+            raise BuffTemplatesFetchError(buff_id)
+        buff_templates = self.__buff_template_storage[buff_id] = {
+            decompress_buff_template(r) for r in rows}
+        return buff_templates
+
+    def get_fingerprint(self):
+        return self.__fingerprint
+
+    def update_cache(self, eve_objects, fingerprint):
+        types, attrs, effects, buff_templates = eve_objects
+        conn = self.__conn
+        # Connection used as context manager commits transaction if everything
+        # went fine, and rolls it back otherwise
+        with conn:
+            for table in TABLES:
+                conn.execute('DROP TABLE IF EXISTS {}'.format(table))
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO metadata VALUES ('schema_version', ?)",
+                (SCHEMA_VERSION,))
+            conn.execute(
+                "INSERT INTO metadata VALUES ('fingerprint', ?)",
+                (fingerprint,))
+            self.__insert_types(types)
+            conn.executemany(
+                'INSERT INTO attrs VALUES (?, ?, ?, ?, ?)',
+                (compress_attr(a) for a in attrs))
+            self.__insert_effects(effects)
+            conn.executemany(
+                'INSERT INTO buff_templates VALUES (?, ?, ?, ?, ?, ?)',
+                (compress_buff_template(t) for t in buff_templates))
+        self.__has_schema = True
+        self.__fingerprint = fingerprint
+        # Clear storage to make sure objects composed from old data are gone
+        self.__type_cache.clear()
+        self.__attr_cache.clear()
+        self.__effect_cache.clear()
+        self.__buff_template_storage.clear()
+
+    def __insert_types(self, types):
+        types_data = []
+        type_attrs_data = []
+        type_effects_data = []
+        type_abilities_data = []
+        type_skills_data = []
+        for item_type in types:
+            (
+                type_id, group_id, category_id, attrs, effect_ids,
+                default_effect_id, abilities_data, required_skills
+            ) = compress_type(item_type)
+            types_data.append(
+                (type_id, group_id, category_id, default_effect_id))
+            type_attrs_data.extend(
+                (type_id, attr_id, value, type(value) is bool)
+                for attr_id, value in attrs)
+            type_effects_data.extend((type_id, e) for e in effect_ids)
+            type_abilities_data.extend(
+                (type_id, ability_id, *ability_data)
+                for ability_id, ability_data in abilities_data)
+            type_skills_data.extend((type_id, *s) for s in required_skills)
+        conn = self.__conn
+        conn.executemany('INSERT INTO types VALUES (?, ?, ?, ?)', types_data)
+        conn.executemany(
+            'INSERT INTO type_attrs VALUES (?, ?, ?, ?)', type_attrs_data)
+        conn.executemany(
+            'INSERT INTO type_effects VALUES (?, ?)', type_effects_data)
+        conn.executemany(
+            'INSERT INTO type_abilities VALUES (?, ?, ?, ?)',
+            type_abilities_data)
+        conn.executemany(
+            'INSERT INTO type_skills VALUES (?, ?, ?)', type_skills_data)
+
+    def __insert_effects(self, effects):
+        effects_data = []
+        modifiers_data = []
+        for effect in effects:
+            effect_data = compress_effect(effect)
+            effect_id = effect_data[0]
+            effects_data.append(effect_data[:-1])
+            modifiers_data.extend(
+                (effect_id, position, *modifier_data)
+                for position, modifier_data in enumerate(effect_data[-1]))
+        conn = self.__conn
+        conn.executemany(
+            'INSERT INTO effects VALUES '
+            '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', effects_data)
+        conn.executemany(
+            'INSERT INTO modifiers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            modifiers_data)
+
+    def close(self):
+        """Close database connection."""
+        self.__conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __check_schema(self):
+        """Check if database contains all the tables cache needs."""
+        conn = self.__conn
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        if not set(TABLES).issubset(r[0] for r in rows):
+            return False
+        rows = conn.execute(
+            'SELECT field_value FROM metadata '
+            "WHERE field_name = 'schema_version'").fetchall()
+        return bool(rows) and rows[0][0] == SCHEMA_VERSION
+
+    def __load_fingerprint(self):
+        rows = self.__query(
+            'SELECT field_value FROM metadata '
+            "WHERE field_name = 'fingerprint'")
+        if not rows:
+            return None
+        return rows[0][0]
+
+    def __query(self, statement, *args, **kwargs):
+        """Run query and return all the rows it produced.
+
+        If there's no data in database yet, nothing is returned.
+        """
+        if not self.__has_schema:
+            return []
+        return self.__conn.execute(statement, kwargs or args).fetchall()
+
+    # Auxiliary methods
+    def __repr__(self):
+        spec = [['cache_path', '_cache_path']]
+        return make_repr_str(self, spec)
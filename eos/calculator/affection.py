@@ -29,6 +29,7 @@ from eos.item import Ship
 from eos.util.keyed_storage import KeyedStorage
 from .exception import UnexpectedDomainError
 from .exception import UnknownAffecteeFilterError
+from .misc import AffectorSpecStorage
 
 
 logger = getLogger(__name__)
@@ -79,31 +80,32 @@ class AffectionRegister:
 
         # All active affector specs which affect one specific item (via ship,
         # character, other reference or self) are kept here
-        # Format: {affectee item: {affector specs}}
-        self.__affectors_item_active = KeyedStorage()
+        # Format: {affectee item: {affectee attr ID: {affector specs}}}
+        self.__affectors_item_active = AffectorSpecStorage()
 
         # Affector specs influencing all items belonging to certain fit and
         # domain
-        # Format: {(affectee fit, affectee domain): {affector specs}}
-        self.__affectors_domain = KeyedStorage()
+        # Format: {(affectee fit, affectee domain): {affectee attr ID:
+        # {affector specs}}}
+        self.__affectors_domain = AffectorSpecStorage()
 
         # Affector specs influencing items belonging to certain fit, domain and
         # group
-        # Format: {(affectee fit, affectee domain, affectee group ID): {affector
-        # specs}}
-        self.__affectors_domain_group = KeyedStorage()
+        # Format: {(affectee fit, affectee domain, affectee group ID): {affectee
+        # attr ID: {affector specs}}}
+        self.__affectors_domain_group = AffectorSpecStorage()
 
         # Affector specs influencing items belonging to certain fit and domain,
         # and having certain skill requirement
         # Format: {(affectee fit, affectee domain, affectee skill requirement
-        # type ID): {affector specs}}
-        self.__affectors_domain_skillrq = KeyedStorage()
+        # type ID): {affectee attr ID: {affector specs}}}
+        self.__affectors_domain_skillrq = AffectorSpecStorage()
 
         # Affector specs influencing owner-modifiable items belonging to certain
         # fit and having certain skill requirement
-        # Format: {(affectee fit, affectee skill requirement type ID): {affector
-        # specs}}
-        self.__affectors_owner_skillrq = KeyedStorage()
+        # Format: {(affectee fit, affectee skill requirement type ID): {affectee
+        # attr ID: {affector specs}}}
+        self.__affectors_owner_skillrq = AffectorSpecStorage()
 
     # Query methods
     def get_local_affectee_items(self, affector_spec):
@@ -149,35 +151,46 @@ class AffectionRegister:
             affectee_fits = {i._fit for i in tgt_items if isinstance(i, Ship)}
             return getter(self, affector_spec, ModDomain.ship, affectee_fits)
 
-    def get_affector_specs(self, affectee_item):
-        """Get all affector specs, which influence passed item."""
+    def get_affector_specs(self, affectee_item, affectee_attr_id):
+        """Get affector specs which influence passed item attribute.
+
+        Args:
+            affectee_item: Item, for which we're getting affector specs.
+            affectee_attr_id: Only affector specs which influence attribute
+                with this ID will be returned.
+        """
         affectee_fit = affectee_item._fit
         affector_specs = set()
         # Item
         affector_storage = self.__affectors_item_active
         key = affectee_item
-        affector_specs.update(affector_storage.get(key, ()))
+        affector_specs.update(
+            affector_storage.get_attr_data(key, affectee_attr_id))
         affectee_domain = affectee_item._modifier_domain
         if affectee_domain is not None:
             # Domain
             affector_storage = self.__affectors_domain
             key = (affectee_fit, affectee_domain)
-            affector_specs.update(affector_storage.get(key, ()))
+            affector_specs.update(
+                affector_storage.get_attr_data(key, affectee_attr_id))
             # Domain and group
             affector_storage = self.__affectors_domain_group
             key = (affectee_fit, affectee_domain, affectee_item._type.group_id)
-            affector_specs.update(affector_storage.get(key, ()))
+            affector_specs.update(
+                affector_storage.get_attr_data(key, affectee_attr_id))
             # Domain and skill requirement
             affector_storage = self.__affectors_domain_skillrq
             for affectee_srq_type_id in affectee_item._type.required_skills:
                 key = (affectee_fit, affectee_domain, affectee_srq_type_id)
-                affector_specs.update(affector_storage.get(key, ()))
+                affector_specs.update(
+                    affector_storage.get_attr_data(key, affectee_attr_id))
         # Owner-modifiable and skill requirement
         if affectee_item._owner_modifiable:
             affector_storage = self.__affectors_owner_skillrq
             for affectee_srq_type_id in affectee_item._type.required_skills:
                 key = (affectee_fit, affectee_srq_type_id)
-                affector_specs.update(affector_storage.get(key, ()))
+                affector_specs.update(
+                    affector_storage.get_attr_data(key, affectee_attr_id))
         return affector_specs
 
     # Maintenance methods
@@ -428,7 +441,7 @@ class AffectionRegister:
             return
         awaitable_to_deactivate = set()
         for affector_spec in (
-            self.__affectors_item_active.get(affectee_item, ())
+            self.__affectors_item_active.get_data(affectee_item)
         ):
             if affector_spec.modifier.affectee_domain in (
                 ModDomain.ship, ModDomain.character, ModDomain.self
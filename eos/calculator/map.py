@@ -29,6 +29,8 @@ from eos.const.eos import ModAggregateMode
 from eos.const.eos import ModOperator
 from eos.const.eve import AttrId
 from eos.const.eve import TypeCategoryId
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.modifier import ModificationCalculationError
 from eos.pubsub.message import AttrsValueChanged
 from eos.util.keyed_storage import KeyedStorage
 from .exception import AttrMetadataError
@@ -44,6 +46,15 @@ logger = getLogger(__name__)
 # Stacking penalty base constant, used in attribute calculations
 PENALTY_BASE = 1 / math.exp((1 / 2.67) ** 2)
 
+# Stacking penalty coefficients for modifications in penalization chain, in
+# order of their strength. 12th modification and further are considered as
+# non-significant and are ignored
+PENALTY_COEFFICIENTS = tuple(PENALTY_BASE ** (pos ** 2) for pos in range(11))
+
+# Vectorized penalization has significant fixed cost, and pays off only when
+# there are many groups of values to penalize
+PENALIZE_VECTORIZED_MIN_GROUPS = 32
+
 # Items belonging to these categories never have their effects stacking
 # penalized
 PENALTY_IMMUNE_CATEGORY_IDS = (
@@ -101,6 +112,373 @@ LIMITED_PRECISION_ATTR_IDS = (
 CALCULATE_RAISABLE_EXCEPTIONS = (AttrMetadataError, BaseValueError)
 
 
+class ModificationPlan:
+    """Compiled modification plan of single attribute on single item.
+
+    Keeps affector specs which modify the attribute, pre-grouped by the way
+    their modifications are aggregated, together with data which does not
+    change while affector spec is registered - normalization function, stacking
+    penalty flag and resistance attribute ID. Thanks to it, recalculation of
+    attribute value re-reads only modification values.
+
+    Args:
+        attr: Attribute which is being modified.
+        affector_specs: Iterable with affector specs modifying the attribute.
+    """
+
+    __slots__ = ('__attr', '__stack', '__aggregate', '__dynamic', '__locations')
+
+    def __init__(self, attr, affector_specs):
+        self.__attr = attr
+        # Modifications of dogma modifiers which are stacked
+        # Format: {(operator, penalize): {affector spec: (affector attr map,
+        # affector attr ID, normalization function, resist attr ID)}}
+        self.__stack = {}
+        # Modifications of dogma modifiers which are aggregated using minimum or
+        # maximum
+        # Format: {(aggregate mode, operator, aggregate key): {affector spec:
+        # (affector attr map, affector attr ID, normalization function, resist
+        # attr ID, penalize)}}
+        self.__aggregate = {}
+        # Modifications which can be known only at the time of calculation,
+        # i.e. ones provided by python modifiers
+        # Format: {affector spec: resist attr ID}
+        self.__dynamic = {}
+        # Where affector spec is stored, used to remove it
+        # Format: {affector spec: (container, key)}
+        self.__locations = {}
+        for affector_spec in affector_specs:
+            self.add(affector_spec)
+
+    def add(self, affector_spec):
+        """Add affector spec to the plan."""
+        if affector_spec in self.__locations:
+            return
+        affector_item = affector_spec.item
+        affector_modifier = affector_spec.modifier
+        resist_attr_id = affector_spec.effect.resist_attr_id
+        if not isinstance(affector_modifier, DogmaModifier):
+            self.__dynamic[affector_spec] = resist_attr_id
+            self.__locations[affector_spec] = (self.__dynamic, None)
+            return
+        mod_operator = affector_modifier.operator
+        try:
+            normalization_func = NORMALIZATION_MAP[mod_operator]
+        # Log error on any unknown operator types
+        except KeyError:
+            msg = (
+                'malformed modifier on item type {}: unknown operator {}'
+            ).format(affector_item._type_id, mod_operator)
+            logger.warning(msg)
+            return
+        penalize = self.__get_penalize(affector_item, mod_operator)
+        mod_aggregate_mode = affector_modifier.aggregate_mode
+        if mod_aggregate_mode == ModAggregateMode.stack:
+            container = self.__stack
+            key = (mod_operator, penalize)
+            entry = (
+                affector_item.attrs, affector_modifier.affector_attr_id,
+                normalization_func, resist_attr_id)
+        elif mod_aggregate_mode in (
+            ModAggregateMode.minimum, ModAggregateMode.maximum
+        ):
+            container = self.__aggregate
+            key = (
+                mod_aggregate_mode, mod_operator,
+                affector_modifier.aggregate_key)
+            entry = (
+                affector_item.attrs, affector_modifier.affector_attr_id,
+                normalization_func, resist_attr_id, penalize)
+        else:
+            return
+        container.setdefault(key, {})[affector_spec] = entry
+        self.__locations[affector_spec] = (container, key)
+
+    def remove(self, affector_spec):
+        """Remove affector spec from the plan."""
+        try:
+            container, key = self.__locations.pop(affector_spec)
+        except KeyError:
+            return
+        if container is self.__dynamic:
+            del container[affector_spec]
+            return
+        bucket = container[key]
+        del bucket[affector_spec]
+        if not bucket:
+            del container[key]
+
+    def apply(self, affectee_item, value):
+        """Apply modifications from the plan to passed base value.
+
+        Args:
+            affectee_item: Item which carries attribute being calculated.
+            value: Base value of attribute.
+
+        Returns:
+            Modified attribute value.
+        """
+        stack, stack_penalized = self.collect(affectee_item)
+        # When data gathering is complete, process penalized modifications. They
+        # are penalized on per-operator basis
+        for mod_operator, mod_values in stack_penalized.items():
+            penalized_value = penalize_values(mod_values)
+            stack.setdefault(mod_operator, []).append(penalized_value)
+        return self.fold(value, stack)
+
+    def collect(self, affectee_item):
+        """Collect normalized modification values.
+
+        Args:
+            affectee_item: Item which carries attribute being calculated.
+
+        Returns:
+            Tuple with two maps in {operator: [values]} format. First contains
+            modifications which should not be stacking penalized, second - ones
+            which should.
+        """
+        carrier_item = affectee_item._solsys_carrier
+        # Format: {operator: [values]}
+        stack = {}
+        # Format: {operator: [values]}
+        stack_penalized = {}
+        for (mod_operator, penalize), bucket in self.__stack.items():
+            mod_values = []
+            for (
+                affector_attrs, affector_attr_id,
+                normalization_func, resist_attr_id
+            ) in bucket.values():
+                try:
+                    mod_value = affector_attrs[affector_attr_id]
+                # Errors are logged in attribute map of affector item
+                except KeyError:
+                    continue
+                # Resistance attribute actually defines resonance, where 1
+                # means 0% resistance and 0 means 100% resistance
+                mod_value = normalization_func(mod_value) * self.__get_resist(
+                    resist_attr_id, carrier_item)
+                mod_values.append(mod_value)
+            if not mod_values:
+                continue
+            if penalize:
+                stack_penalized.setdefault(mod_operator, []).extend(mod_values)
+            else:
+                stack.setdefault(mod_operator, []).extend(mod_values)
+        # Format: {(aggregate mode, operator, aggregate key): [(value,
+        # penalize)]}
+        aggregates = {}
+        for aggregate_data, bucket in self.__aggregate.items():
+            for (
+                affector_attrs, affector_attr_id,
+                normalization_func, resist_attr_id, penalize
+            ) in bucket.values():
+                try:
+                    mod_value = affector_attrs[affector_attr_id]
+                except KeyError:
+                    continue
+                mod_value = normalization_func(mod_value) * self.__get_resist(
+                    resist_attr_id, carrier_item)
+                aggregates.setdefault(aggregate_data, []).append(
+                    (mod_value, penalize))
+        # Modifications of python modifiers are fully processed here
+        for affector_spec, resist_attr_id in self.__dynamic.items():
+            affector_item = affector_spec.item
+            try:
+                (
+                    mod_operator, mod_value,
+                    mod_aggregate_mode, mod_aggregate_key
+                ) = affector_spec.modifier.get_modification(affector_item)
+            # Do nothing here - errors should be logged in modification
+            # getter or even earlier
+            except ModificationCalculationError:
+                continue
+            try:
+                normalization_func = NORMALIZATION_MAP[mod_operator]
+            except KeyError:
+                msg = (
+                    'malformed modifier on item type {}: unknown operator {}'
+                ).format(affector_item._type_id, mod_operator)
+                logger.warning(msg)
+                continue
+            mod_value = normalization_func(mod_value) * self.__get_resist(
+                resist_attr_id, carrier_item)
+            penalize = self.__get_penalize(affector_item, mod_operator)
+            if mod_aggregate_mode == ModAggregateMode.stack:
+                if penalize:
+                    stack_penalized.setdefault(mod_operator, []).append(
+                        mod_value)
+                else:
+                    stack.setdefault(mod_operator, []).append(mod_value)
+            elif mod_aggregate_mode in (
+                ModAggregateMode.minimum, ModAggregateMode.maximum
+            ):
+                aggregates.setdefault(
+                    (mod_aggregate_mode, mod_operator, mod_aggregate_key),
+                    []).append((mod_value, penalize))
+        for (mod_aggregate_mode, mod_operator, _), mod_data in (
+            aggregates.items()
+        ):
+            if mod_aggregate_mode == ModAggregateMode.minimum:
+                mod_value, penalize = min(mod_data, key=lambda i: (i[0], i[1]))
+            else:
+                mod_value, penalize = max(
+                    mod_data, key=lambda i: (i[0], not i[1]))
+            if penalize:
+                stack_penalized.setdefault(mod_operator, []).append(mod_value)
+            else:
+                stack.setdefault(mod_operator, []).append(mod_value)
+        return stack, stack_penalized
+
+    def fold(self, value, stack):
+        """Apply modifications to passed base value according to operator order.
+
+        Args:
+            value: Base value of attribute.
+            stack: Map with modification values which should be applied, in
+                {operator: [values]} format. Stacking penalty should be applied
+                to them beforehand.
+
+        Returns:
+            Modified attribute value.
+        """
+        attr = self.__attr
+        for mod_operator in sorted(stack):
+            mod_values = stack[mod_operator]
+            # Pick best modification for assignments, based on high_is_good
+            # value
+            if mod_operator in ASSIGNMENT_OPERATORS:
+                if attr.high_is_good:
+                    value = max(mod_values)
+                else:
+                    value = min(mod_values)
+            elif mod_operator in ADDITION_OPERATORS:
+                for mod_value in mod_values:
+                    value += mod_value
+            elif mod_operator in MULTIPLICATION_OPERATORS:
+                for mod_value in mod_values:
+                    value *= 1 + mod_value
+        return value
+
+    def __get_penalize(self, affector_item, mod_operator):
+        """Decide if modification should be stacking penalized or not."""
+        return (
+            not self.__attr.stackable and
+            affector_item._type.category_id not in
+            PENALTY_IMMUNE_CATEGORY_IDS and
+            mod_operator in PENALIZABLE_OPERATORS)
+
+    @staticmethod
+    def __get_resist(resist_attr_id, carrier_item):
+        if resist_attr_id and carrier_item is not None:
+            try:
+                return carrier_item.attrs[resist_attr_id]
+            except KeyError:
+                return 1
+        return 1
+
+
+def penalize_values(mod_values):
+    """Calculate aggregated reduced multiplier.
+
+    Assuming all multipliers received should be stacking penalized, and that
+    they are normalized to reduced multiplier form, calculate final
+    reduced multiplier.
+
+    Args:
+        mod_values: Iterable with reduced multipliers.
+
+    Returns:
+        Final aggregated reduced multiplier.
+    """
+    # Gather positive multipliers into one chain, negative into another.
+    # Strongest modifications always go first
+    chain_positive = sorted((v for v in mod_values if v >= 0), reverse=True)
+    chain_negative = sorted(v for v in mod_values if v < 0)
+    # Base final multiplier on 1
+    value = 1
+    for penalization_chain in (chain_positive, chain_negative):
+        # Same for intermediate per-chain value
+        chain_value = 1
+        # Apply stacking penalty based on modification position. Zip stops on
+        # the shortest sequence, so insignificant modifications are ignored
+        for mod_value, coefficient in zip(
+            penalization_chain, PENALTY_COEFFICIENTS
+        ):
+            chain_value *= 1 + mod_value * coefficient
+        value *= chain_value
+    return value - 1
+
+
+def penalize_values_batch(mod_value_groups):
+    """Calculate aggregated reduced multipliers for multiple value groups.
+
+    Every group is penalized independently, and results are exactly the same as
+    penalize_values() produces. When there are many groups and NumPy is
+    available, all the groups are processed in one vectorized pass.
+
+    Args:
+        mod_value_groups: Sequence with sequences of reduced multipliers.
+
+    Returns:
+        List with final aggregated reduced multipliers, one per group.
+    """
+    if len(mod_value_groups) < PENALIZE_VECTORIZED_MIN_GROUPS:
+        return [penalize_values(g) for g in mod_value_groups]
+    numpy = _get_numpy()
+    if numpy is None:
+        return [penalize_values(g) for g in mod_value_groups]
+    group_lengths = [len(g) for g in mod_value_groups]
+    value_count = sum(group_lengths)
+    if value_count == 0:
+        return [0] * len(mod_value_groups)
+    values = numpy.fromiter(
+        chain.from_iterable(mod_value_groups), dtype=float, count=value_count)
+    # Every group is split into 2 chains - positive and negative
+    chain_ids = (
+        numpy.repeat(numpy.arange(len(group_lengths)), group_lengths) * 2 +
+        (values < 0))
+    # Sort values within chains, strongest modifications go first
+    order = numpy.lexsort((-numpy.abs(values), chain_ids))
+    chain_ids = chain_ids[order]
+    values = values[order]
+    # Find position of each value within its chain
+    chain_starts = numpy.flatnonzero(numpy.concatenate((
+        [True], chain_ids[1:] != chain_ids[:-1])))
+    chain_lengths = numpy.diff(numpy.append(chain_starts, value_count))
+    positions = (
+        numpy.arange(value_count) - numpy.repeat(chain_starts, chain_lengths))
+    significant = positions < len(PENALTY_COEFFICIENTS)
+    coefficients = numpy.array(PENALTY_COEFFICIENTS)[
+        numpy.minimum(positions, len(PENALTY_COEFFICIENTS) - 1)]
+    factors = numpy.where(significant, 1 + values * coefficients, 1)
+    # Multiply chain values in the same order as penalize_values() does, to
+    # get the same rounding errors
+    chain_values = numpy.ones(len(group_lengths) * 2)
+    numpy.multiply.at(chain_values, chain_ids, factors)
+    results = chain_values[0::2] * chain_values[1::2]
+    return (results - 1).tolist()
+
+
+def _get_numpy():
+    """Import NumPy on first use, as it is slow to import.
+
+    Returns:
+        NumPy module, or None if it is not available.
+    """
+    global _numpy
+    if _numpy is _NOT_IMPORTED:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+_NOT_IMPORTED = object()
+_numpy = _NOT_IMPORTED
+
+
 class MutableAttrMap:
     """Map which contains modified attribute values.
 
@@ -117,6 +495,17 @@ class MutableAttrMap:
         # are not needed most of the time
         self.__override_callbacks = None
         self.__cap_map = None
+        # Compiled modification plans, initialized as None for the same reason
+        # Format: {attribute ID: modification plan}
+        self.__mod_plans = None
+        # Attributes which cannot be calculated, initialized as None for the
+        # same reason
+        # Format: {attribute ID: exception type}
+        self.__missing_attrs = None
+        # Attribute metadata map and calculation service of item's solar
+        # system, bound on first calculation after item is loaded
+        self.__attr_metadata = None
+        self.__calculator = None
 
     def __getitem__(self, attr_id):
         # Overridden values are priority. Access 'private' override callbacks
@@ -133,9 +522,14 @@ class MutableAttrMap:
             value = self.__modified_attrs[attr_id]
         # Else, we have to run full calculation process
         except KeyError:
+            # Unless we already know that attribute cannot be calculated
+            missing_attrs = self.__missing_attrs
+            if missing_attrs is not None and attr_id in missing_attrs:
+                raise KeyError(attr_id) from missing_attrs[attr_id](attr_id)
             try:
                 value = self.__calculate(attr_id)
             except CALCULATE_RAISABLE_EXCEPTIONS as e:
+                self.__set_missing(attr_id, e)
                 raise KeyError(attr_id) from e
             else:
                 self.__modified_attrs[attr_id] = value
@@ -158,6 +552,10 @@ class MutableAttrMap:
         Returns:
             True if attribute was calculated, False if it wasn't.
         """
+        if self.__missing_attrs is not None:
+            self.__missing_attrs.pop(attr_id, None)
+            if not self.__missing_attrs:
+                self.__missing_attrs = None
         try:
             del self.__modified_attrs[attr_id]
         except KeyError:
@@ -165,6 +563,30 @@ class MutableAttrMap:
         else:
             return True
 
+    def _add_affector_spec(self, affector_spec):
+        """Add affector spec to modification plan of attribute it affects.
+
+        Should be called when affector spec starts to modify the item.
+        """
+        try:
+            mod_plan = self.__mod_plans[affector_spec.modifier.affectee_attr_id]
+        # If plan was not compiled yet, it will take affector spec into
+        # consideration when it will be
+        except (KeyError, TypeError):
+            return
+        mod_plan.add(affector_spec)
+
+    def _rm_affector_spec(self, affector_spec):
+        """Remove affector spec from modification plan of attribute it affects.
+
+        Should be called when affector spec stops modifying the item.
+        """
+        try:
+            mod_plan = self.__mod_plans[affector_spec.modifier.affectee_attr_id]
+        except (KeyError, TypeError):
+            return
+        mod_plan.remove(affector_spec)
+
     def get(self, attr_id, default=None):
         # Almost copy-paste of __getitem__ due to performance reasons -
         # attribute getters should make as few calls as possible, especially
@@ -178,9 +600,13 @@ class MutableAttrMap:
         try:
             value = self.__modified_attrs[attr_id]
         except KeyError:
+            missing_attrs = self.__missing_attrs
+            if missing_attrs is not None and attr_id in missing_attrs:
+                return default
             try:
                 value = self.__calculate(attr_id)
-            except CALCULATE_RAISABLE_EXCEPTIONS:
+            except CALCULATE_RAISABLE_EXCEPTIONS as e:
+                self.__set_missing(attr_id, e)
                 return default
             else:
                 self.__modified_attrs[attr_id] = value
@@ -193,7 +619,14 @@ class MutableAttrMap:
             self.__override_callbacks or {}))
 
     def items(self):
-        return set((attr_id, self.get(attr_id)) for attr_id in self.keys())
+        attr_ids = self.keys()
+        # Calculate everything which is not calculated yet at once, to process
+        # stacking penalties in one batch
+        failed_attr_ids = self.__calculate_batch(
+            attr_ids.difference(self.__override_callbacks or ()))
+        return set(
+            (attr_id, None if attr_id in failed_attr_ids else self.get(attr_id))
+            for attr_id in attr_ids)
 
     def _clear(self):
         """
@@ -203,6 +636,10 @@ class MutableAttrMap:
         """
         self.__modified_attrs.clear()
         self.__cap_map = None
+        self.__mod_plans = None
+        self.__missing_attrs = None
+        self.__attr_metadata = None
+        self.__calculator = None
 
     def __calculate(self, attr_id):
         """Run calculations to find the actual value of attribute.
@@ -213,6 +650,87 @@ class MutableAttrMap:
         Returns:
             Calculated attribute value.
 
+        Raises:
+            AttrMetadataError: If metadata of attribute being calculated cannot
+                be fetched.
+            BaseValueError: If base value for attribute being calculated cannot
+                be found.
+        """
+        attr, value, mod_plan = self.__prepare(attr_id)
+        value = mod_plan.apply(self.__item, value)
+        return self.__finalize(attr_id, attr, value)
+
+    def __calculate_batch(self, attr_ids):
+        """Calculate and store values of multiple attributes.
+
+        Stacking penalties of all the attributes are calculated in one pass.
+
+        Args:
+            attr_ids: Iterable with IDs of attributes to be calculated.
+
+        Returns:
+            Set with IDs of attributes which could not be calculated.
+        """
+        item = self.__item
+        failed_attr_ids = set()
+        # Format: [(attribute ID, attribute, base value, modification plan,
+        # stack, penalized operators)]
+        pending = []
+        # Format: [[values]]
+        penalized_groups = []
+        for attr_id in attr_ids:
+            # Attribute could've been calculated as dependency of some other
+            # attribute
+            if attr_id in self.__modified_attrs:
+                continue
+            if (
+                self.__missing_attrs is not None and
+                attr_id in self.__missing_attrs
+            ):
+                failed_attr_ids.add(attr_id)
+                continue
+            try:
+                attr, value, mod_plan = self.__prepare(attr_id)
+            except CALCULATE_RAISABLE_EXCEPTIONS as e:
+                self.__set_missing(attr_id, e)
+                failed_attr_ids.add(attr_id)
+                continue
+            stack, stack_penalized = mod_plan.collect(item)
+            penalized_operators = []
+            for mod_operator, mod_values in stack_penalized.items():
+                penalized_operators.append(mod_operator)
+                penalized_groups.append(mod_values)
+            pending.append((
+                attr_id, attr, value, mod_plan, stack, penalized_operators))
+        penalized_values = iter(penalize_values_batch(penalized_groups))
+        for (
+            attr_id, attr, value, mod_plan, stack, penalized_operators
+        ) in pending:
+            for mod_operator in penalized_operators:
+                stack.setdefault(mod_operator, []).append(
+                    next(penalized_values))
+            value = mod_plan.fold(value, stack)
+            self.__modified_attrs[attr_id] = self.__finalize(
+                attr_id, attr, value)
+        return failed_attr_ids
+
+    def __set_missing(self, attr_id, error):
+        """Remember that attribute cannot be calculated."""
+        # Failures are remembered only when map is bound to solar system -
+        # otherwise, they may be caused by item not being loaded yet
+        if self.__attr_metadata is None:
+            return
+        if self.__missing_attrs is None:
+            self.__missing_attrs = {}
+        self.__missing_attrs[attr_id] = type(error)
+
+    def __prepare(self, attr_id):
+        """Fetch data needed to calculate attribute value.
+
+        Returns:
+            Tuple with attribute metadata, attribute base value and compiled
+            modification plan.
+
         Raises:
             AttrMetadataError: If metadata of attribute being calculated cannot
                 be fetched.
@@ -221,10 +739,16 @@ class MutableAttrMap:
         """
         item = self.__item
         # Attribute object for attribute being calculated
+        attr_metadata = self.__attr_metadata
+        if attr_metadata is None:
+            attr_metadata = self.__bind()
         try:
-            attr = item._fit.solar_system.source.cache_handler.get_attr(attr_id)
+            # Item is not in solar system, or solar system has no source
+            if attr_metadata is None:
+                raise AttrFetchError(attr_id)
+            attr = attr_metadata[attr_id]
         # Raise error if we can't get metadata for requested attribute
-        except (AttributeError, AttrFetchError) as e:
+        except AttrFetchError as e:
             msg = (
                 'unable to fetch metadata for attribute {}, '
                 'requested for item type {}'
@@ -245,89 +769,39 @@ class MutableAttrMap:
                 ).format(attr_id, item._type_id)
                 logger.info(msg)
                 raise BaseValueError(attr_id)
-        # Format: {operator: [values]}
-        stack = {}
-        # Format: {operator: [values]}
-        stack_penalized = {}
-        # Format: {(operator, aggregate key): [(value, penalize)]}
-        aggregate_min = {}
-        # Format: {(operator, aggregate key): [(value, penalize)]}
-        aggregate_max = {}
-        # Now, go through all affectors affecting our item
-        for (
-            mod_operator, mod_value, resist_value,
-            mod_aggregate_mode, mod_aggregate_key, affector_item) in (
-                item._fit.solar_system._calculator.get_modifications(
-                    item, attr_id)
-        ):
-            # Normalize operations to just three types: assignments, additions,
-            # reduced multiplications
-            try:
-                normalization_func = NORMALIZATION_MAP[mod_operator]
-            # Log error on any unknown operator types
-            except KeyError:
-                msg = (
-                    'malformed modifier on item type {}: unknown operator {}'
-                ).format(affector_item._type_id, mod_operator)
-                logger.warning(msg)
-                continue
-            # Resistance attribute actually defines resonance, where 1 means 0%
-            # resistance and 0 means 100% resistance
-            mod_value = normalization_func(mod_value) * resist_value
-            # Decide if modification should be stacking penalized or not
-            penalize = (
-                not attr.stackable and
-                affector_item._type.category_id not in
-                PENALTY_IMMUNE_CATEGORY_IDS and
-                mod_operator in PENALIZABLE_OPERATORS)
-            if mod_aggregate_mode == ModAggregateMode.stack:
-                if penalize:
-                    stack_penalized.setdefault(mod_operator, []).append(
-                        mod_value)
-                else:
-                    stack.setdefault(mod_operator, []).append(mod_value)
-            elif mod_aggregate_mode == ModAggregateMode.minimum:
-                aggregate_min.setdefault(
-                    (mod_operator, mod_aggregate_key), []).append(
-                    (mod_value, penalize))
-            elif mod_aggregate_mode == ModAggregateMode.maximum:
-                aggregate_max.setdefault(
-                    (mod_operator, mod_aggregate_key), []).append(
-                    (mod_value, penalize))
-        for container, aggregate_func, sort_func in (
-            (aggregate_min, min, lambda i: (i[0], i[1])),
-            (aggregate_max, max, lambda i: (i[0], not i[1]))
-        ):
-            for k, v in container.items():
-                mod_operator = k[0]
-                mod_value, penalize = aggregate_func(v, key=sort_func)
-                if penalize:
-                    stack_penalized.setdefault(mod_operator, []).append(
-                        mod_value)
-                else:
-                    stack.setdefault(mod_operator, []).append(mod_value)
-        # When data gathering is complete, process penalized modifications. They
-        # are penalized on per-operator basis
-        for mod_operator, mod_values in stack_penalized.items():
-            penalized_value = self.__penalize_values(mod_values)
-            stack.setdefault(mod_operator, []).append(penalized_value)
-        # Calculate value of non-penalized modifications, according to operator
-        # order
-        for mod_operator in sorted(stack):
-            mod_values = stack[mod_operator]
-            # Pick best modification for assignments, based on high_is_good
-            # value
-            if mod_operator in ASSIGNMENT_OPERATORS:
-                if attr.high_is_good:
-                    value = max(mod_values)
-                else:
-                    value = min(mod_values)
-            elif mod_operator in ADDITION_OPERATORS:
-                for mod_value in mod_values:
-                    value += mod_value
-            elif mod_operator in MULTIPLICATION_OPERATORS:
-                for mod_value in mod_values:
-                    value *= 1 + mod_value
+        # Compile modification plan if there's none
+        mod_plans = self.__mod_plans
+        if mod_plans is None:
+            mod_plans = self.__mod_plans = {}
+        try:
+            mod_plan = mod_plans[attr_id]
+        except KeyError:
+            mod_plan = mod_plans[attr_id] = ModificationPlan(
+                attr, self.__calculator.get_affector_specs(item, attr_id))
+        return attr, value, mod_plan
+
+    def __bind(self):
+        """Bind map to facilities of item's solar system.
+
+        Returns:
+            Attribute metadata map, or None if item does not belong to any solar
+            system or solar system has no source.
+        """
+        fit = self.__item._fit
+        if fit is None:
+            return None
+        solar_system = fit.solar_system
+        if solar_system is None:
+            return None
+        attr_metadata = solar_system._attr_metadata
+        # Do not bind anything when there's no source
+        if attr_metadata is not None:
+            self.__attr_metadata = attr_metadata
+            self.__calculator = solar_system._calculator
+        return attr_metadata
+
+    def __finalize(self, attr_id, attr, value):
+        """Apply value cap and rounding to modified attribute value."""
         # If attribute has upper cap, do not let its value to grow above it
         if attr.max_attr_id is not None:
             try:
@@ -346,44 +820,6 @@ class MutableAttrMap:
             value = round(value, 2)
         return value
 
-    def __penalize_values(self, mod_values):
-        """Calculate aggregated reduced multiplier.
-
-        Assuming all multipliers received should be stacking penalized, and that
-        they are normalized to reduced multiplier form, calculate final
-        reduced multiplier.
-
-        Args:
-            mod_values: Iterable with reduced multipliers.
-
-        Returns:
-            Final aggregated reduced multiplier.
-        """
-        # Gather positive multipliers into one chain, negative into another
-        chain_positive = []
-        chain_negative = []
-        for mod_value in mod_values:
-            if mod_value >= 0:
-                chain_positive.append(mod_value)
-            else:
-                chain_negative.append(mod_value)
-        # Strongest modifications always go first
-        chain_positive.sort(reverse=True)
-        chain_negative.sort()
-        # Base final multiplier on 1
-        value = 1
-        for penalization_chain in (chain_positive, chain_negative):
-            # Same for intermediate per-chain value
-            chain_value = 1
-            for pos, mod_value in enumerate(penalization_chain):
-                # Ignore 12th modification and further as non-significant
-                if pos > 10:
-                    break
-                # Apply stacking penalty based on modification position
-                chain_value *= 1 + mod_value * PENALTY_BASE ** (pos ** 2)
-            value *= chain_value
-        return value - 1
-
     # Override-related methods
     @property
     def _override_callbacks(self):
@@ -426,9 +862,13 @@ class MutableAttrMap:
         try:
             value = self.__modified_attrs[attr_id]
         except KeyError:
+            missing_attrs = self.__missing_attrs
+            if missing_attrs is not None and attr_id in missing_attrs:
+                return default
             try:
                 value = self.__calculate(attr_id)
-            except CALCULATE_RAISABLE_EXCEPTIONS:
+            except CALCULATE_RAISABLE_EXCEPTIONS as e:
+                self.__set_missing(attr_id, e)
                 return default
             else:
                 self.__modified_attrs[attr_id] = value
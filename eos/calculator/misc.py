@@ -19,12 +19,196 @@
 # ==============================================================================
 
 
-from collections import namedtuple
+from weakref import WeakKeyDictionary
+from weakref import ref
 
+from eos.cache_handler import AttrFetchError
+from eos.util.repr import make_repr_str
 
-# Affector specification is calculator-specific entity, used in affection
-# register
-AffectorSpec = namedtuple('AffectorSpec', ('item', 'effect', 'modifier'))
 
-# Projector is calculator-specific entity, used in projection register
-Projector = namedtuple('Projector', ('item', 'effect'))
+class AffectorSpec:
+    """Affector specification is calculator-specific entity.
+
+    It is used in affection register. Instances are created once per item,
+    effect and modifier and reused while effect is running, thus hash is
+    computed only once.
+    """
+
+    __slots__ = ('item', 'effect', 'modifier', '__hash')
+
+    def __init__(self, item, effect, modifier):
+        self.item = item
+        self.effect = effect
+        self.modifier = modifier
+        self.__hash = hash((item, effect, modifier))
+
+    # Iterator is needed to support tuple-style unpacking
+    def __iter__(self):
+        yield self.item
+        yield self.effect
+        yield self.modifier
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, AffectorSpec):
+            return NotImplemented
+        return (
+            self.item is other.item and
+            self.effect is other.effect and
+            self.modifier is other.modifier)
+
+    def __hash__(self):
+        return self.__hash
+
+    def __repr__(self):
+        spec = ['item', 'effect', 'modifier']
+        return make_repr_str(self, spec)
+
+
+class Projector:
+    """Projector is calculator-specific entity.
+
+    It is used in projection register. Like affector specs, instances are
+    reused while effect is running.
+    """
+
+    __slots__ = ('item', 'effect', '__hash')
+
+    def __init__(self, item, effect):
+        self.item = item
+        self.effect = effect
+        self.__hash = hash((item, effect))
+
+    # Iterator is needed to support tuple-style unpacking
+    def __iter__(self):
+        yield self.item
+        yield self.effect
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Projector):
+            return NotImplemented
+        return self.item is other.item and self.effect is other.effect
+
+    def __hash__(self):
+        return self.__hash
+
+    def __repr__(self):
+        spec = ['item', 'effect']
+        return make_repr_str(self, spec)
+
+
+class AffectorSpecStorage(dict):
+    """Container for affector specs with keyed access.
+
+    Unlike regular keyed storage, it additionally groups affector specs by ID of
+    attribute their modifiers affect, which allows to fetch only affector specs
+    relevant for calculation of specific attribute.
+
+    Format: {key: {affectee attribute ID: {affector specs}}}
+    """
+
+    def get_attr_data(self, key, affectee_attr_id):
+        """Get affector specs which affect attribute with passed ID."""
+        try:
+            return self[key][affectee_attr_id]
+        except KeyError:
+            return ()
+
+    def get_data(self, key):
+        """Get all affector specs stored against passed key."""
+        affector_specs = set()
+        for attr_affector_specs in self.get(key, {}).values():
+            affector_specs.update(attr_affector_specs)
+        return affector_specs
+
+    def add_data_set(self, key, affector_specs):
+        """Add multiple affector specs against passed key."""
+        for affector_spec in affector_specs:
+            self.add_data_entry(key, affector_spec)
+
+    def rm_data_set(self, key, affector_specs):
+        """Remove multiple affector specs stored against passed key."""
+        for affector_spec in affector_specs:
+            self.rm_data_entry(key, affector_spec)
+
+    def add_data_entry(self, key, affector_spec):
+        """Add affector spec against passed key.
+
+        If containers accessed by passed key and affectee attribute ID don't
+        exist, create them.
+        """
+        affectee_attr_id = affector_spec.modifier.affectee_attr_id
+        try:
+            attr_storage = self[key]
+        except KeyError:
+            attr_storage = self[key] = {}
+        try:
+            attr_storage[affectee_attr_id].add(affector_spec)
+        except KeyError:
+            attr_storage[affectee_attr_id] = {affector_spec}
+
+    def rm_data_entry(self, key, affector_spec):
+        """Remove affector spec stored against passed key.
+
+        If affector spec is not stored, silently ignore it. Empty containers are
+        removed.
+        """
+        affectee_attr_id = affector_spec.modifier.affectee_attr_id
+        try:
+            attr_storage = self[key]
+            affector_specs = attr_storage[affectee_attr_id]
+        except KeyError:
+            return
+        affector_specs.discard(affector_spec)
+        if not affector_specs:
+            del attr_storage[affectee_attr_id]
+            if not attr_storage:
+                del self[key]
+
+
+class AttrMetadataMap(dict):
+    """Attribute metadata of single source, resolved by attribute ID.
+
+    Metadata is requested from cache handler only when attribute is accessed
+    for the first time. If cache handler has no metadata for attribute, or is
+    not alive anymore, AttrFetchError is raised, and nothing is stored. Map
+    refers cache handler weakly, as maps are stored against cache handlers in
+    weak-keyed registry.
+
+    Format: {attribute ID: attribute}
+    """
+
+    def __init__(self, cache_handler):
+        dict.__init__(self)
+        self.__cache_handler = ref(cache_handler)
+
+    def __missing__(self, attr_id):
+        cache_handler = self.__cache_handler()
+        if cache_handler is None:
+            raise AttrFetchError(attr_id)
+        attr = cache_handler.get_attr(attr_id)
+        self[attr_id] = attr
+        return attr
+
+
+# Metadata maps are shared by all solar systems which use the same source
+# Format: {cache handler: (fingerprint, attribute metadata map)}
+attr_metadata_maps = WeakKeyDictionary()
+
+
+def get_attr_metadata_map(cache_handler):
+    """Get attribute metadata map for passed cache handler."""
+    fingerprint = cache_handler.get_fingerprint()
+    try:
+        map_fingerprint, attr_metadata = attr_metadata_maps[cache_handler]
+    except KeyError:
+        pass
+    else:
+        if map_fingerprint == fingerprint:
+            return attr_metadata
+    attr_metadata = AttrMetadataMap(cache_handler)
+    attr_metadata_maps[cache_handler] = (fingerprint, attr_metadata)
+    return attr_metadata
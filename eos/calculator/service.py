@@ -19,13 +19,14 @@
 # ==============================================================================
 
 
+from weakref import WeakKeyDictionary
+
 from eos.cache_handler import BuffTemplatesFetchError
 from eos.const.eve import AttrId
 from eos.const.eve import EffectCategoryId
 from eos.eve_obj.effect.warfare_buff.base import WarfareBuffEffect
 from eos.eve_obj.modifier import BasePythonModifier
 from eos.eve_obj.modifier import DogmaModifier
-from eos.eve_obj.modifier import ModificationCalculationError
 from eos.item.mixin.solar_system import SolarSystemItemMixin
 from eos.pubsub.message import AttrsValueChanged
 from eos.pubsub.message import AttrsValueChangedMasked
@@ -51,6 +52,12 @@ WARFARE_BUFF_ATTRS = {
     AttrId.warfare_buff_3_id: AttrId.warfare_buff_3_value,
     AttrId.warfare_buff_4_id: AttrId.warfare_buff_4_value}
 
+# Modifiers made out of warfare buff templates. They do not depend on fit or
+# item, so they are shared by all solar systems which use the same source
+# Format: {cache handler: (fingerprint, {(buff ID, affector attr ID):
+# modifiers})}
+buff_modifier_cache = WeakKeyDictionary()
+
 
 class CalculationService(BaseSubscriber):
     """Service which supports attribute calculation.
@@ -66,54 +73,37 @@ class CalculationService(BaseSubscriber):
         self.__projections = ProjectionRegister()
         # Format: {projector: {modifiers}}
         self.__warfare_buffs = KeyedStorage()
+        # Projectors of running warfare buff effects
+        # Format: {fit: {projectors}}
+        self.__fit_warfare_projectors = KeyedStorage()
+        # Affector specs with dogma modifiers, indexed by affector attribute
+        # they use, to quickly find dependents of changed attribute
+        # Format: {(affector item, affector attr ID): {affector specs}}
+        self.__local_dependents = KeyedStorage()
+        # Format: {(affector item, affector attr ID): {affector specs}}
+        self.__projected_dependents = KeyedStorage()
+        # Affector specs and projectors of running effects, created when effect
+        # starts and reused until it stops
+        # Format: {(item, effect ID): (projector, local affector specs,
+        # projected affector specs)}
+        self.__effect_entities = {}
         # Container with affector specs which will receive messages
         # Format: {message type: set(affector specs)}
         self.__subscribed_affectors = KeyedStorage()
 
-    def get_modifications(self, affectee_item, affectee_attr_id):
-        """Get modifications of affectee attribute on affectee item.
+    def get_affector_specs(self, affectee_item, affectee_attr_id):
+        """Get affector specs which modify affectee attribute on affectee item.
 
         Args:
-            affectee_item: Item, for which we're getting modifications.
-            affectee_attr_id: Affectee attribute ID; only modifications which
+            affectee_item: Item, for which we're getting affector specs.
+            affectee_attr_id: Affectee attribute ID; only affector specs which
                 influence attribute with this ID will be returned.
 
         Returns:
-            Set with tuples in (modification operator, modification value,
-            resistance value, affector item) format.
+            Set with affector specs.
         """
-        # Use list because we can have multiple tuples with the same values
-        # as valid configuration
-        mods = []
-        for affector_spec in self.__affections.get_affector_specs(
-            affectee_item
-        ):
-            affector_modifier = affector_spec.modifier
-            affector_item = affector_spec.item
-            if affector_modifier.affectee_attr_id != affectee_attr_id:
-                continue
-            try:
-                mod_op, mod_value, mod_aggregate_mode, mod_aggregate_key = (
-                    affector_modifier.get_modification(affector_item))
-            # Do nothing here - errors should be logged in modification
-            # getter or even earlier
-            except ModificationCalculationError:
-                continue
-            # Get resistance value
-            resist_attr_id = affector_spec.effect.resist_attr_id
-            carrier_item = affectee_item._solsys_carrier
-            if resist_attr_id and carrier_item is not None:
-                try:
-                    resist_value = carrier_item.attrs[resist_attr_id]
-                except KeyError:
-                    resist_value = 1
-            else:
-                resist_value = 1
-            mods.append((
-                mod_op, mod_value, resist_value,
-                mod_aggregate_mode, mod_aggregate_key,
-                affector_item))
-        return mods
+        return self.__affections.get_affector_specs(
+            affectee_item, affectee_attr_id)
 
     # Handle fits
     def _handle_fit_added(self, fit):
@@ -124,27 +114,7 @@ class CalculationService(BaseSubscriber):
 
     # Handle item changes which are significant for calculator
     def _handle_fleet_fit_added(self, msg):
-        fits_effect_applications = {}
-        for projector in self.__projections.get_projectors():
-            if not isinstance(projector.effect, WarfareBuffEffect):
-                continue
-            projector_fit = projector.item._fit
-            # Affect this fit by buffs existing in fleet
-            if (
-                msg.fit.ship is not None and
-                projector_fit.fleet is msg.fit.fleet
-            ):
-                fits_effect_applications.setdefault(
-                    projector_fit, []).append(
-                    (projector, [msg.fit.ship]))
-            # Affect other fits by buffs from this fit
-            if projector_fit is msg.fit:
-                for fit in msg.fit.fleet.fits:
-                    if fit is msg.fit:
-                        continue
-                    fits_effect_applications.setdefault(
-                        projector_fit, []).append(
-                        (projector, [fit.ship]))
+        fits_effect_applications = self.__get_fleet_buff_applications(msg.fit)
         # Apply warfare buffs
         if fits_effect_applications:
             for fit, effect_applications in fits_effect_applications.items():
@@ -155,27 +125,8 @@ class CalculationService(BaseSubscriber):
                 fit._publish_bulk(msgs)
 
     def _handle_fleet_fit_removed(self, msg):
-        fits_effect_unapplications = {}
-        for projector in self.__projections.get_projectors():
-            if not isinstance(projector.effect, WarfareBuffEffect):
-                continue
-            projector_fit = projector.item._fit
-            # Unaffect this fit by buffs existing in fleet
-            if (
-                msg.fit.ship is not None and
-                projector_fit.fleet is msg.fit.fleet
-            ):
-                fits_effect_unapplications.setdefault(
-                    projector_fit, []).append(
-                    (projector, [msg.fit.ship]))
-            # Unaffect other fits by buffs from this fit
-            if projector_fit is msg.fit:
-                for fit in msg.fit.fleet.fits:
-                    if fit is msg.fit:
-                        continue
-                    fits_effect_unapplications.setdefault(
-                        projector_fit, []).append(
-                        (projector, [fit.ship]))
+        fits_effect_unapplications = self.__get_fleet_buff_applications(
+            msg.fit)
         # Unapply warfare buffs
         if fits_effect_unapplications:
             for fit, effect_unapplications in (
@@ -202,6 +153,10 @@ class CalculationService(BaseSubscriber):
     def _handle_effects_started(self, msg):
         item = msg.item
         effect_ids = msg.effect_ids
+        item_effects = item._type_effects
+        for effect_id in effect_ids:
+            self.__effect_entities[(item, effect_id)] = (
+                self.__make_effect_entities(item, item_effects[effect_id]))
         attr_changes = {}
         for affector_spec in self.__generate_local_affector_specs(
             item, effect_ids
@@ -209,11 +164,13 @@ class CalculationService(BaseSubscriber):
             # Register the affector spec
             if isinstance(affector_spec.modifier, BasePythonModifier):
                 self.__subscribe_python_affector_spec(msg.fit, affector_spec)
+            self.__index_dependent(self.__local_dependents, affector_spec)
             self.__affections.register_local_affector_spec(affector_spec)
             # Clear values of attributes dependent on the affector spec
             for affectee_item in self.__affections.get_local_affectee_items(
                 affector_spec
             ):
+                affectee_item.attrs._add_affector_spec(affector_spec)
                 attr_id = affector_spec.modifier.affectee_attr_id
                 if affectee_item.attrs._force_recalc(attr_id):
                     attr_ids = attr_changes.setdefault(affectee_item, set())
@@ -221,6 +178,14 @@ class CalculationService(BaseSubscriber):
         # Register projectors
         for projector in self.__generate_projectors(item, effect_ids):
             self.__projections.register_projector(projector)
+            if isinstance(projector.effect, WarfareBuffEffect):
+                self.__fit_warfare_projectors.add_data_entry(
+                    msg.fit, projector)
+            _, _, projected_specs = self.__get_effect_entities(
+                item, projector.effect.id)
+            for affector_spec in projected_specs:
+                self.__index_dependent(
+                    self.__projected_dependents, affector_spec)
         # Register warfare buffs
         effect_applications = []
         item_fleet = msg.fit.fleet
@@ -228,27 +193,22 @@ class CalculationService(BaseSubscriber):
             effect = item._type_effects[effect_id]
             if not isinstance(effect, WarfareBuffEffect):
                 continue
-            projector = Projector(item, effect)
+            projector, _, _ = self.__get_effect_entities(item, effect_id)
             for buff_id_attr_id in WARFARE_BUFF_ATTRS:
                 try:
                     buff_id = item.attrs[buff_id_attr_id]
                 except KeyError:
                     continue
-                getter = (
-                    self.__solar_system.source.cache_handler.get_buff_templates)
-                try:
-                    buff_templates = getter(buff_id)
-                except BuffTemplatesFetchError:
+                buff_modifiers = self.__get_buff_modifiers(
+                    buff_id, WARFARE_BUFF_ATTRS[buff_id_attr_id])
+                if not buff_modifiers:
                     continue
-                affector_attr_id = WARFARE_BUFF_ATTRS[buff_id_attr_id]
-                if not buff_templates:
-                    continue
-                for buff_template in buff_templates:
-                    modifier = DogmaModifier._make_from_buff_template(
-                        buff_template, affector_attr_id)
+                for modifier in buff_modifiers:
                     affector_spec = AffectorSpec(item, effect, modifier)
                     self.__warfare_buffs.add_data_entry(
                         projector, affector_spec)
+                    self.__index_dependent(
+                        self.__projected_dependents, affector_spec)
                 tgt_ships = []
                 for tgt_fit in self.__solar_system.fits:
                     if (
@@ -275,7 +235,8 @@ class CalculationService(BaseSubscriber):
         for projector in self.__generate_projectors(msg.item, msg.effect_ids):
             if projector not in self.__warfare_buffs:
                 continue
-            tgt_ships = self.__projections.get_projector_tgts(projector)
+            # Copy targets, as register's set is emptied during unapplication
+            tgt_ships = set(self.__projections.get_projector_tgts(projector))
             effect_unapplications.append((projector, tgt_ships))
         # Unapply and unregister warfare buffs
         if effect_unapplications:
@@ -285,7 +246,7 @@ class CalculationService(BaseSubscriber):
                     projector.item, projector.effect.id, tgt_items))
             msg.fit._publish_bulk(msgs)
             for projector, _ in effect_unapplications:
-                del self.__warfare_buffs[projector]
+                self.__unregister_warfare_buffs(projector)
         attr_changes = {}
         # Remove values of affectee attributes
         for affector_spec in self.__generate_local_affector_specs(
@@ -295,17 +256,28 @@ class CalculationService(BaseSubscriber):
             for affectee_item in self.__affections.get_local_affectee_items(
                 affector_spec
             ):
+                affectee_item.attrs._rm_affector_spec(affector_spec)
                 attr_id = affector_spec.modifier.affectee_attr_id
                 if affectee_item.attrs._force_recalc(attr_id):
                     attr_ids = attr_changes.setdefault(affectee_item, set())
                     attr_ids.add(attr_id)
             # Unregister the affector spec
             self.__affections.unregister_local_affector_spec(affector_spec)
+            self.__unindex_dependent(self.__local_dependents, affector_spec)
             if isinstance(affector_spec.modifier, BasePythonModifier):
                 self.__unsubscribe_python_affector_spec(msg.fit, affector_spec)
         # Unregister projectors
         for projector in self.__generate_projectors(msg.item, msg.effect_ids):
             self.__projections.unregister_projector(projector)
+            if isinstance(projector.effect, WarfareBuffEffect):
+                self.__fit_warfare_projectors.rm_data_entry(msg.fit, projector)
+            _, _, projected_specs = self.__get_effect_entities(
+                msg.item, projector.effect.id)
+            for affector_spec in projected_specs:
+                self.__unindex_dependent(
+                    self.__projected_dependents, affector_spec)
+        for effect_id in msg.effect_ids:
+            self.__effect_entities.pop((msg.item, effect_id), None)
         if attr_changes:
             self.__publish_attr_changes(attr_changes)
 
@@ -321,6 +293,7 @@ class CalculationService(BaseSubscriber):
             for affectee_item in self.__affections.get_projected_affectee_items(
                 affector_spec, msg.tgt_items
             ):
+                affectee_item.attrs._add_affector_spec(affector_spec)
                 attr_id = affector_spec.modifier.affectee_attr_id
                 if affectee_item.attrs._force_recalc(attr_id):
                     attr_ids = attr_changes.setdefault(affectee_item, set())
@@ -340,6 +313,7 @@ class CalculationService(BaseSubscriber):
             for affectee_item in self.__affections.get_projected_affectee_items(
                 affector_spec, msg.tgt_items
             ):
+                affectee_item.attrs._rm_affector_spec(affector_spec)
                 attr_id = affector_spec.modifier.affectee_attr_id
                 if affectee_item.attrs._force_recalc(attr_id):
                     attr_ids = attr_changes.setdefault(affectee_item, set())
@@ -367,13 +341,14 @@ class CalculationService(BaseSubscriber):
         effect_unapplications = []
         # Unapply warfare buffs
         for item, attr_ids in msg.attr_changes.items():
-            for effect in item._type_effects.values():
-                projector = Projector(item, effect)
+            if not attr_ids.intersection(WARFARE_BUFF_ATTRS):
+                continue
+            for effect_id in item._running_effect_ids:
+                projector, _, _ = self.__get_effect_entities(item, effect_id)
                 if projector not in self.__warfare_buffs:
                     continue
-                if not attr_ids.intersection(WARFARE_BUFF_ATTRS):
-                    continue
-                tgt_items = self.__projections.get_projector_tgts(projector)
+                tgt_items = set(
+                    self.__projections.get_projector_tgts(projector))
                 effect_unapplications.append((projector, tgt_items))
         msgs = []
         for projector, tgt_items in effect_unapplications:
@@ -382,62 +357,44 @@ class CalculationService(BaseSubscriber):
         msg.fit._publish_bulk(msgs)
         attr_changes = {}
         for item, attr_ids in msg.attr_changes.items():
-            # Remove values of affectee attributes capped by the changing
-            # attribute
             for attr_id in attr_ids:
+                # Remove values of affectee attributes capped by the changing
+                # attribute
                 for capped_attr_id in item.attrs._cap_map.get(attr_id, ()):
                     if item.attrs._force_recalc(capped_attr_id):
                         attr_changes.setdefault(item, set()).add(capped_attr_id)
-            # Force attribute recalculation when local affector spec
-            # modification changes
-            for affector_spec in self.__generate_local_affector_specs(
-                item, item._running_effect_ids
-            ):
-                affector_modifier = affector_spec.modifier
-                # Only dogma modifiers have source attribute specified, python
-                # modifiers are processed separately
-                if (
-                    not isinstance(affector_modifier, DogmaModifier) or
-                    affector_modifier.affector_attr_id not in attr_ids
-                ):
-                    continue
-                # Remove values
-                for affectee_item in affections.get_local_affectee_items(
-                    affector_spec
-                ):
-                    attr_id = affector_modifier.affectee_attr_id
-                    if affectee_item.attrs._force_recalc(attr_id):
-                        attr_changes.setdefault(affectee_item, set()).add(
-                            attr_id)
-            # Force attribute recalculation when projected affector spec
-            # modification changes
-            for projector in self.__generate_projectors(
-                item, item._running_effect_ids
-            ):
-                tgt_items = projections.get_projector_tgts(projector)
-                # When projector doesn't target any items, then we do not need
-                # to clean anything
-                if not tgt_items:
-                    continue
-                for affector_spec in self.__generate_projected_affectors(
-                    item, (projector.effect.id,)
+                # Force attribute recalculation when local affector spec
+                # modification changes
+                for affector_spec in self.__local_dependents.get(
+                    (item, attr_id), ()
                 ):
-                    affector_modifier = affector_spec.modifier
-                    # Only dogma modifiers have source attribute specified,
-                    # python modifiers are processed separately
-                    if (
-                        not isinstance(affector_modifier, DogmaModifier) or
-                        affector_modifier.affector_attr_id not in attr_ids
+                    affectee_attr_id = affector_spec.modifier.affectee_attr_id
+                    for affectee_item in affections.get_local_affectee_items(
+                        affector_spec
                     ):
+                        if affectee_item.attrs._force_recalc(affectee_attr_id):
+                            attr_changes.setdefault(affectee_item, set()).add(
+                                affectee_attr_id)
+                # Force attribute recalculation when projected affector spec
+                # modification changes
+                for affector_spec in self.__projected_dependents.get(
+                    (item, attr_id), ()
+                ):
+                    projector, _, _ = self.__get_effect_entities(
+                        item, affector_spec.effect.id)
+                    tgt_items = projections.get_projector_tgts(projector)
+                    # When projector doesn't target any items, then we do not
+                    # need to clean anything
+                    if not tgt_items:
                         continue
+                    affectee_attr_id = affector_spec.modifier.affectee_attr_id
                     for affectee_item in (
                         affections.get_projected_affectee_items(
                             affector_spec, tgt_items)
                     ):
-                        attr_id = affector_modifier.affectee_attr_id
-                        if affectee_item.attrs._force_recalc(attr_id):
+                        if affectee_item.attrs._force_recalc(affectee_attr_id):
                             attr_changes.setdefault(affectee_item, set()).add(
-                                attr_id)
+                                affectee_attr_id)
             # Force attribute recalculation if changed attribute defines
             # resistance to some effect
             for projector in projections.get_tgt_projectors(item):
@@ -459,7 +416,7 @@ class CalculationService(BaseSubscriber):
         # Unregister warfare buffs only after composing list of attributes we
         # should update
         for projector, tgt_items in effect_unapplications:
-            del self.__warfare_buffs[projector]
+            self.__unregister_warfare_buffs(projector)
         if attr_changes:
             self.__publish_attr_changes(attr_changes)
         # Register warfare buffs
@@ -472,28 +429,22 @@ class CalculationService(BaseSubscriber):
                 effect = item._type_effects[effect_id]
                 if not isinstance(effect, WarfareBuffEffect):
                     continue
-                projector = Projector(item, effect)
+                projector, _, _ = self.__get_effect_entities(item, effect_id)
                 for buff_id_attr_id in WARFARE_BUFF_ATTRS:
                     try:
                         buff_id = item.attrs[buff_id_attr_id]
                     except KeyError:
                         continue
-                    getter = (
-                        self.__solar_system.source.
-                        cache_handler.get_buff_templates)
-                    try:
-                        buff_templates = getter(buff_id)
-                    except BuffTemplatesFetchError:
-                        continue
-                    affector_attr_id = WARFARE_BUFF_ATTRS[buff_id_attr_id]
-                    if not buff_templates:
+                    buff_modifiers = self.__get_buff_modifiers(
+                        buff_id, WARFARE_BUFF_ATTRS[buff_id_attr_id])
+                    if not buff_modifiers:
                         continue
-                    for buff_template in buff_templates:
-                        modifier = DogmaModifier._make_from_buff_template(
-                            buff_template, affector_attr_id)
+                    for modifier in buff_modifiers:
                         affector_spec = AffectorSpec(item, effect, modifier)
                         self.__warfare_buffs.add_data_entry(
                             projector, affector_spec)
+                        self.__index_dependent(
+                            self.__projected_dependents, affector_spec)
                     tgt_ships = []
                     for tgt_fit in self.__solar_system.fits:
                         if (
@@ -557,36 +508,47 @@ class CalculationService(BaseSubscriber):
         EffectUnapplied: _handle_effect_unapplied,
         AttrsValueChanged: _revise_regular_attr_dependents}
 
+    # Dependent values are cleared as soon as attributes they depend on
+    # change, including changes done within batch
+    _batch_immediate = True
+
     def _notify(self, msg):
         BaseSubscriber._notify(self, msg)
         # Relay all messages to python modifiers, as in case of python modifiers
         # any message may result in deleting dependent attributes
         self._revise_python_attr_dependents(msg)
 
+    def _get_msg_handler(self, msg_type):
+        revise_python_attr_dependents = self._revise_python_attr_dependents
+        try:
+            handler = self._handler_map[msg_type]
+        except KeyError:
+            return revise_python_attr_dependents
+
+        def notify(msg):
+            handler(self, msg)
+            revise_python_attr_dependents(msg)
+
+        return notify
+
     # Affector-related methods
     def __generate_local_affector_specs(self, item, effect_ids):
         """Get local affector specs for passed item and effects."""
         affector_specs = set()
-        item_effects = item._type_effects
         for effect_id in effect_ids:
-            effect = item_effects[effect_id]
-            for modifier in effect.local_modifiers:
-                affector_spec = AffectorSpec(item, effect, modifier)
-                affector_specs.add(affector_spec)
+            _, local_specs, _ = self.__get_effect_entities(item, effect_id)
+            affector_specs.update(local_specs)
         return affector_specs
 
     def __generate_projected_affectors(self, item, effect_ids):
         """Get projected affector specs for passed item and effects."""
         affector_specs = set()
-        item_effects = item._type_effects
         for effect_id in effect_ids:
-            effect = item_effects[effect_id]
-            projector = Projector(item, effect)
+            projector, _, projected_specs = self.__get_effect_entities(
+                item, effect_id)
             if projector in self.__warfare_buffs:
                 affector_specs.update(self.__warfare_buffs[projector])
-            for modifier in effect.projected_modifiers:
-                affector_spec = AffectorSpec(item, effect, modifier)
-                affector_specs.add(affector_spec)
+            affector_specs.update(projected_specs)
         return affector_specs
 
     def __subscribe_python_affector_spec(self, fit, affector_spec):
@@ -621,23 +583,133 @@ class CalculationService(BaseSubscriber):
         if to_ubsubscribe:
             fit._unsubscribe(self, to_ubsubscribe)
 
+    @staticmethod
+    def __index_dependent(storage, affector_spec):
+        """Make affector spec discoverable via its affector attribute."""
+        modifier = affector_spec.modifier
+        # Only dogma modifiers have source attribute specified, python
+        # modifiers are processed separately
+        if not isinstance(modifier, DogmaModifier):
+            return
+        storage.add_data_entry(
+            (affector_spec.item, modifier.affector_attr_id), affector_spec)
+
+    @staticmethod
+    def __unindex_dependent(storage, affector_spec):
+        modifier = affector_spec.modifier
+        if not isinstance(modifier, DogmaModifier):
+            return
+        storage.rm_data_entry(
+            (affector_spec.item, modifier.affector_attr_id), affector_spec)
+
     # Warfare buffs-related methods
+    def __get_buff_modifiers(self, buff_id, affector_attr_id):
+        """Get modifiers for warfare buff with passed ID.
+
+        Returns:
+            Tuple with modifiers. When buff templates cannot be fetched, empty
+            tuple is returned.
+        """
+        cache_handler = self.__solar_system.source.cache_handler
+        fingerprint = cache_handler.get_fingerprint()
+        try:
+            cache_fingerprint, buff_modifiers = (
+                buff_modifier_cache[cache_handler])
+        except KeyError:
+            cache_fingerprint = buff_modifiers = None
+        # Cache handler contents could be updated, modifiers are rebuilt then
+        if buff_modifiers is None or cache_fingerprint != fingerprint:
+            buff_modifiers = {}
+            buff_modifier_cache[cache_handler] = (fingerprint, buff_modifiers)
+        key = (buff_id, affector_attr_id)
+        try:
+            return buff_modifiers[key]
+        except KeyError:
+            pass
+        try:
+            buff_templates = cache_handler.get_buff_templates(buff_id)
+        except BuffTemplatesFetchError:
+            buff_templates = ()
+        modifiers = buff_modifiers[key] = tuple(
+            DogmaModifier._make_from_buff_template(t, affector_attr_id)
+            for t in buff_templates)
+        return modifiers
+
+    def __get_fleet_buff_applications(self, fleet_fit):
+        """Get warfare buff applications related to fleet membership change.
+
+        Args:
+            fleet_fit: Fit which joined or is about to leave fleet.
+
+        Returns:
+            Warfare buff applications in {fit: [(projector, target items)]}
+            format, where fit is fit of projector.
+        """
+        fits_effect_applications = {}
+        fleet_fits = fleet_fit.fleet.fits
+        # Only fits in the same fleet can exchange buffs, thus we need to check
+        # just projectors of fleet members
+        for projector_fit in fleet_fits:
+            for projector in self.__fit_warfare_projectors.get(
+                projector_fit, ()
+            ):
+                # Buffs existing in fleet affect passed fit
+                if fleet_fit.ship is not None:
+                    fits_effect_applications.setdefault(
+                        projector_fit, []).append(
+                        (projector, [fleet_fit.ship]))
+                # Buffs from passed fit affect other fits
+                if projector_fit is fleet_fit:
+                    for fit in fleet_fits:
+                        if fit is fleet_fit:
+                            continue
+                        fits_effect_applications.setdefault(
+                            projector_fit, []).append(
+                            (projector, [fit.ship]))
+        return fits_effect_applications
+
+    def __unregister_warfare_buffs(self, projector):
+        for affector_spec in self.__warfare_buffs.pop(projector):
+            self.__unindex_dependent(self.__projected_dependents, affector_spec)
 
     # Projector-related methods
     def __generate_projectors(self, item, effect_ids):
         """Get projectors spawned by the item."""
         projectors = set()
-        item_effects = item._type_effects
         for effect_id in effect_ids:
-            effect = item_effects[effect_id]
+            projector, _, _ = self.__get_effect_entities(item, effect_id)
+            effect = projector.effect
             if (
                 effect.category_id == EffectCategoryId.target or
                 isinstance(effect, WarfareBuffEffect)
             ):
-                projector = Projector(item, effect)
                 projectors.add(projector)
         return projectors
 
+    # Running effect-related methods
+    def __get_effect_entities(self, item, effect_id):
+        """Get projector and affector specs for passed item and effect.
+
+        For running effects, stored entities are returned, for the rest they
+        are generated on the fly.
+        """
+        try:
+            return self.__effect_entities[(item, effect_id)]
+        except KeyError:
+            return self.__make_effect_entities(
+                item, item._type_effects[effect_id])
+
+    @staticmethod
+    def __make_effect_entities(item, effect):
+        projector = Projector(item, effect)
+        local_specs = tuple(
+            AffectorSpec(item, effect, modifier)
+            for modifier in effect.local_modifiers)
+        projected_specs = tuple(
+            AffectorSpec(item, effect, modifier)
+            for modifier in effect.projected_modifiers)
+        return projector, local_specs, projected_specs
+
     # Auxiliary methods
     def __publish_attr_changes(self, attr_changes):
         # Format: {fit: {item: {attr_ids}}}
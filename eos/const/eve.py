@@ -440,3 +440,17 @@ fighter_ability_map = {
         EffectId.fighter_ability_warp_disruption,
     FighterAbilityId.webs:
         EffectId.fighter_ability_stasis_webifier}
+
+
+# Item types from these categories and groups are always kept by eve object
+# builder
+STRONG_CATEGORY_IDS = (
+    TypeCategoryId.charge,
+    TypeCategoryId.drone,
+    TypeCategoryId.fighter,
+    TypeCategoryId.implant,
+    TypeCategoryId.module,
+    TypeCategoryId.ship,
+    TypeCategoryId.skill,
+    TypeCategoryId.subsystem)
+STRONG_GROUP_IDS = (TypeGroupId.character, TypeGroupId.effect_beacon)
@@ -30,8 +30,18 @@ class BaseDataHandler(metaclass=ABCMeta):
     are named against data structures (usually tables) they request, returning
     iterable with rows, each row being dictionary in {field name: field value}
     format.
+
+    Data handler can be used as context manager, which defines data fetching
+    session. Within it, handler may keep data it has already loaded to serve
+    subsequent requests faster.
     """
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
     @abstractmethod
     def get_evetypes(self):
         """
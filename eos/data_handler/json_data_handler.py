@@ -32,75 +32,87 @@ class JsonDataHandler(BaseDataHandler):
     Implements loading of raw data from JSON files produced by Phobos script,
     which can be found at https://github.com/pyfa-org/Phobos.
 
+    Rows are produced by generators. Within data fetching session, parsed
+    files are kept in memory, so that files which are used by several getters
+    are parsed only once; they are released when outermost session ends.
+
     Args:
         basepath: Path to folder with JSON files.
     """
 
     def __init__(self, basepath):
         self.basepath = os.path.abspath(basepath)
+        # Quantity of currently open data fetching sessions
+        self.__session_depth = 0
+        # Format: {(miner, file name): data}
+        self.__file_cache = None
+
+    def __enter__(self):
+        if self.__session_depth == 0:
+            self.__file_cache = {}
+        self.__session_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__session_depth -= 1
+        if self.__session_depth == 0:
+            self.__file_cache = None
 
     def get_evetypes(self):
-        return self.__fetch_file('fsd_built', 'types', values_only=True)
+        yield from self.__fetch_file('fsd_built', 'types').values()
 
     def get_evegroups(self):
-        return self.__fetch_file('fsd_built', 'groups', values_only=True)
+        yield from self.__fetch_file('fsd_built', 'groups').values()
 
     def get_dgmattribs(self):
-        return self.__fetch_file('fsd_built', 'dogmaattributes', values_only=True)
+        yield from self.__fetch_file('fsd_built', 'dogmaattributes').values()
 
     def get_dgmtypeattribs(self):
-        rows = []
         for type_id, type_data in self.__fetch_file('fsd_built', 'typedogma').items():
             type_id = int(type_id)
             for tdrow in type_data.get('dogmaAttributes', ()):
-                rows.append({'typeID': type_id, 'attributeID': tdrow['attributeID'], 'value': tdrow['value']})
-        return rows
+                yield {'typeID': type_id, 'attributeID': tdrow['attributeID'], 'value': tdrow['value']}
 
     def get_dgmeffects(self):
-        return self.__fetch_file('fsd_built', 'dogmaeffects', values_only=True)
+        yield from self.__fetch_file('fsd_built', 'dogmaeffects').values()
 
     def get_dgmtypeeffects(self):
-        rows = []
         for type_id, type_data in self.__fetch_file('fsd_built', 'typedogma').items():
             type_id = int(type_id)
             for tdrow in type_data.get('dogmaEffects', ()):
-                rows.append({'typeID': type_id, 'effectID': tdrow['effectID'], 'isDefault': bool(tdrow['isDefault'])})
-        return rows
+                yield {'typeID': type_id, 'effectID': tdrow['effectID'], 'isDefault': bool(tdrow['isDefault'])}
 
     def get_dbuffcollections(self):
-        rows = []
         dbuffs = self.__fetch_file('fsd_lite', 'dbuffcollections')
         for buff_id, row in dbuffs.items():
             row['buffID'] = int(buff_id)
-            rows.append(row)
-        return rows
+            yield row
 
     def get_skillreqs(self):
-        rows = []
         skillreq_datas = self.__fetch_file('fsd_built', 'requiredskillsfortypes')
         for type_id, skillreq_data in skillreq_datas.items():
             type_id = int(type_id)
             for skill_type_id, skill_level in skillreq_data.items():
                 skill_type_id = int(skill_type_id)
-                rows.append({'typeID': type_id, 'skillTypeID': skill_type_id, 'level': skill_level})
-        return rows
+                yield {'typeID': type_id, 'skillTypeID': skill_type_id, 'level': skill_level}
 
     def get_typefighterabils(self):
-        rows = []
         fighter_abils = self.__fetch_file('fsd_lite', 'fighterabilitiesbytype')
         for type_id, type_abilities in fighter_abils.items():
             for ability_slot, ability_data in type_abilities.items():
                 ability_row = {'typeID': int(type_id)}
                 self.__collapse_dict(ability_data, ability_row)
-                rows.append(ability_row)
-        return rows
+                yield ability_row
 
-    def __fetch_file(self, miner, filename, values_only=False):
+    def __fetch_file(self, miner, filename):
+        file_cache = self.__file_cache
+        if file_cache is not None and (miner, filename) in file_cache:
+            return file_cache[(miner, filename)]
         filepath = os.path.join(self.basepath, miner, '{}.json'.format(filename))
         with open(filepath, mode='r', encoding='utf8') as file:
             data = json.load(file)
-        if values_only:
-            data = list(data.values())
+        if file_cache is not None:
+            file_cache[(miner, filename)] = data
         return data
 
     def __collapse_dict(self, src, tgt):
@@ -18,8 +18,11 @@
 # ==============================================================================
 
 
+import json
 import sqlite3
 
+from eos.const.eve import STRONG_CATEGORY_IDS
+from eos.const.eve import STRONG_GROUP_IDS
 from eos.util.repr import make_repr_str
 from .base import BaseDataHandler
 
@@ -29,21 +32,46 @@ class SQLiteDataHandler(BaseDataHandler):
     SQLite data handler implementation.
 
     Handler for loading data from SQLite database. Data should be in Phobos-like
-    format, for details on it refer to JSON data handler doc string.
+    format, for details on it refer to JSON data handler doc string. Each
+    data handler method reads table with the same name, except for metadata
+    which is read from phbmetadata table. Columns which contain nested data
+    (like modifierInfo of effects or modifier lists of warfare buffs) should be
+    declared with JSON type and contain JSON text.
+
+    Rows are streamed from database cursors as they are requested.
 
     Args:
         db_path: Path to database file.
+        prefilter (optional): If True, only item types from categories and
+            groups which eve object builder always keeps are fetched, along
+            with rows which belong to them. This way rows which would be
+            cleaned up anyway are never loaded, but item types which are only
+            referenced from other data are skipped as well.
     """
 
-    def __init__(self, db_path):
-        # SQLite stores bools as 0 or 1, convert them to python bool
-        sqlite3.register_converter('BOOLEAN', lambda v: int(v) == 1)
-        conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-        conn.row_factory = sqlite3.Row
-        self.cursor = conn.cursor()
+    def __init__(self, db_path, prefilter=False):
+        self.db_path = db_path
+        self.prefilter = prefilter
+        self.__conn = None
+
+    @property
+    def _conn(self):
+        if self.__conn is None:
+            # SQLite stores bools as 0 or 1, convert them to python bool
+            sqlite3.register_converter('BOOLEAN', lambda v: int(v) == 1)
+            conn = sqlite3.connect(
+                self.db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+            conn.row_factory = sqlite3.Row
+            self.__conn = conn
+        return self.__conn
 
     def get_evetypes(self):
-        return self.__fetch_table('evetypes')
+        if not self.prefilter:
+            return self.__fetch_table('evetypes')
+        condition, params = self.__get_strong_type_condition()
+        return self.__fetch_rows(
+            'evetypes', 'SELECT * FROM evetypes WHERE {}'.format(condition),
+            params)
 
     def get_evegroups(self):
         return self.__fetch_table('evegroups')
@@ -52,26 +80,83 @@ class SQLiteDataHandler(BaseDataHandler):
         return self.__fetch_table('dgmattribs')
 
     def get_dgmtypeattribs(self):
-        return self.__fetch_table('dgmtypeattribs')
+        return self.__fetch_type_table('dgmtypeattribs')
 
     def get_dgmeffects(self):
         return self.__fetch_table('dgmeffects')
 
     def get_dgmtypeeffects(self):
-        return self.__fetch_table('dgmtypeeffects')
-
-    def __fetch_table(self, tablename):
-        self.cursor.execute('SELECT * FROM {}'.format(tablename))
-        return [dict(row) for row in self.cursor]
+        return self.__fetch_type_table('dgmtypeeffects')
+
+    def get_dbuffcollections(self):
+        return self.__fetch_table('dbuffcollections')
+
+    def get_skillreqs(self):
+        return self.__fetch_type_table('skillreqs')
+
+    def get_typefighterabils(self):
+        return self.__fetch_type_table('typefighterabils')
+
+    def __fetch_table(self, table_name):
+        return self.__fetch_rows(
+            table_name, 'SELECT * FROM {}'.format(table_name))
+
+    def __fetch_type_table(self, table_name):
+        """Fetch table whose rows belong to item types."""
+        if not self.prefilter:
+            return self.__fetch_table(table_name)
+        condition, params = self.__get_strong_type_condition()
+        return self.__fetch_rows(
+            table_name,
+            'SELECT * FROM {} WHERE typeID IN '
+            '(SELECT typeID FROM evetypes WHERE {})'.format(
+                table_name, condition),
+            params)
+
+    def __fetch_rows(self, table_name, query, params=()):
+        json_columns = self.__get_json_columns(table_name)
+        # Each request uses its own cursor, thus several tables can be
+        # streamed at the same time
+        cursor = self._conn.execute(query, params)
+        for row in cursor:
+            row = dict(row)
+            for column in json_columns:
+                value = row.get(column)
+                if value is not None:
+                    row[column] = json.loads(value)
+            yield row
+
+    def __get_json_columns(self, table_name):
+        """Get names of table columns which are declared with JSON type."""
+        cursor = self._conn.execute('PRAGMA table_info({})'.format(table_name))
+        return tuple(
+            row['name'] for row in cursor if row['type'].upper() == 'JSON')
+
+    @staticmethod
+    def __get_strong_type_condition():
+        condition = (
+            'groupID IN (SELECT groupID FROM evegroups '
+            'WHERE categoryID IN ({})) OR groupID IN ({})'
+        ).format(
+            ', '.join('?' * len(STRONG_CATEGORY_IDS)),
+            ', '.join('?' * len(STRONG_GROUP_IDS)))
+        return condition, (*STRONG_CATEGORY_IDS, *STRONG_GROUP_IDS)
 
     def get_version(self):
-        self.cursor.execute(
+        cursor = self._conn.execute(
             'SELECT field_value FROM phbmetadata '
-            'WHERE field_name = "client_build"')
-        for row in self.cursor:
+            "WHERE field_name = 'client_build'")
+        for row in cursor:
             return row[0]
         else:
             return None
 
+    def __getstate__(self):
+        # Connections cannot be pickled, new one is opened on demand
+        state = self.__dict__.copy()
+        state['_SQLiteDataHandler__conn'] = None
+        return state
+
     def __repr__(self):
-        return make_repr_str(self)
+        spec = ['db_path']
+        return make_repr_str(self, spec)
@@ -29,6 +29,10 @@ from eos.const.eve import EffectId
 logger = getLogger(__name__)
 
 
+# Effect run mode which is used when item doesn't override it
+DEFAULT_EFFECT_MODE = EffectMode.full_compliance
+
+
 class EffectStatusResolver:
 
     @staticmethod
@@ -56,7 +60,46 @@ class EffectStatusResolver:
             boolean flag, True when effect should be running, False when it
             should not.
         """
-        item_effects = item._type_effects
+        if state_override is not None:
+            item_state = state_override
+        else:
+            item_state = item.state
+        return EffectStatusResolver.__resolve_effects_status(
+            item._type_effects, item._type_default_effect, item_state,
+            item.get_effect_mode, effect_ids)
+
+    @staticmethod
+    def resolve_running_effect_ids(item):
+        """Get IDs of effects which should be running on item.
+
+        Returns:
+            Set with effect IDs.
+        """
+        # For items without effect mode overrides, result depends only on item
+        # type and state, thus we can use table precomputed for item type
+        if not item._has_effect_mode_overrides and item._type is not None:
+            return item._type.default_running_effect_ids[item.state]
+        effects_status = EffectStatusResolver.resolve_effects_status(item)
+        return {e for e, status in effects_status.items() if status}
+
+    @staticmethod
+    def get_default_running_effect_ids(item_type, state):
+        """Get IDs of effects running on item of passed type and state.
+
+        Effects are considered to be in their default run mode.
+
+        Returns:
+            Set with effect IDs.
+        """
+        effects_status = EffectStatusResolver.__resolve_effects_status(
+            item_type.effects, item_type.default_effect, state,
+            lambda _: DEFAULT_EFFECT_MODE)
+        return {e for e, status in effects_status.items() if status}
+
+    @staticmethod
+    def __resolve_effects_status(
+            item_effects, default_effect, item_state, get_effect_mode,
+            effect_ids=None):
         if effect_ids is None:
             rq_effect_ids = set(item_effects)
         else:
@@ -66,7 +109,8 @@ class EffectStatusResolver:
         # effects from online categories
         if EffectId.online in item_effects:
             online_running = EffectStatusResolver.__resolve_effect_status(
-                item, item_effects[EffectId.online], None, state_override)
+                item_effects[EffectId.online], get_effect_mode(EffectId.online),
+                item_state, None, default_effect)
             if EffectId.online in rq_effect_ids:
                 effects_status[EffectId.online] = online_running
         else:
@@ -77,38 +121,27 @@ class EffectStatusResolver:
                 continue
             effect = item_effects[effect_id]
             effect_status = EffectStatusResolver.__resolve_effect_status(
-                item, effect, online_running, state_override)
+                effect, get_effect_mode(effect_id), item_state, online_running,
+                default_effect)
             effects_status[effect_id] = effect_status
         return effects_status
 
     @staticmethod
-    def __resolve_effect_status(item, effect, online_running, state_override):
-        resolver_map = {
-            EffectMode.full_compliance:
-                EffectStatusResolver.__resolve_full_compliance,
-            EffectMode.state_compliance:
-                EffectStatusResolver.__resolve_state_compliance,
-            EffectMode.force_run:
-                EffectStatusResolver.__resolve_force_run,
-            EffectMode.force_stop:
-                EffectStatusResolver.__resolve_force_stop}
+    def __resolve_effect_status(
+            effect, effect_mode, item_state, online_running, default_effect):
         # Decide how we handle effect based on its run mode
-        effect_mode = item.get_effect_mode(effect.id)
         try:
-            resolver = resolver_map[effect_mode]
+            resolver = EffectStatusResolver.__resolver_map[effect_mode]
         except KeyError:
             msg = 'unknown effect mode {}'.format(effect_mode)
             logger.warning(msg)
             return False
         else:
-            return resolver(item, effect, online_running, state_override)
+            return resolver(effect, item_state, online_running, default_effect)
 
     @staticmethod
-    def __resolve_full_compliance(item, effect, online_running, state_override):
-        if state_override is not None:
-            item_state = state_override
-        else:
-            item_state = item.state
+    def __resolve_full_compliance(
+            effect, item_state, online_running, default_effect):
         # Check state restriction first, as it should be checked regardless of
         # effect category
         effect_state = effect._state
@@ -128,7 +161,7 @@ class EffectStatusResolver:
                 return online_running
         # Only default active effect is run in full compliance
         elif effect_state == State.active:
-            return item._type_default_effect is effect
+            return default_effect is effect
         # No additional restrictions for overload effects
         elif effect_state == State.overload:
             return True
@@ -137,11 +170,7 @@ class EffectStatusResolver:
             return False
 
     @staticmethod
-    def __resolve_state_compliance(item, effect, _, state_override):
-        if state_override is not None:
-            item_state = state_override
-        else:
-            item_state = item.state
+    def __resolve_state_compliance(effect, item_state, *_):
         # In state compliance, consider effect running if item's state is at
         # least as high as required by the effect
         return item_state >= effect._state
@@ -153,3 +182,10 @@ class EffectStatusResolver:
     @staticmethod
     def __resolve_force_stop(*_):
         return False
+
+    # Format: {effect mode: resolver}
+    __resolver_map = {
+        EffectMode.full_compliance: __resolve_full_compliance.__func__,
+        EffectMode.state_compliance: __resolve_state_compliance.__func__,
+        EffectMode.force_run: __resolve_force_run.__func__,
+        EffectMode.force_stop: __resolve_force_stop.__func__}
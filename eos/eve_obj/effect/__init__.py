@@ -19,19 +19,6 @@
 # ==============================================================================
 
 
-from .dmg_dealer import load_dmg_dealers
-from .cap_transmit import load_cap_transmit
+# Modules with custom effect classes are imported by effect factory on demand
 from .effect import Effect
-from .ewar import load_ewar
 from .factory import EffectFactory
-from .neut import load_neuts
-from .repairs import load_repairers
-from .warfare_buff import load_warfare_buffs
-
-
-load_cap_transmit()
-load_dmg_dealers()
-load_ewar()
-load_neuts()
-load_repairers()
-load_warfare_buffs()
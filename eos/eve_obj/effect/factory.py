@@ -19,7 +19,10 @@
 # ==============================================================================
 
 
+from importlib import import_module
+
 from .effect import Effect
+from .registry import effect_class_modules
 
 
 class EffectFactory:
@@ -44,12 +47,25 @@ class EffectFactory:
         Returns:
             Effect instance.
         """
-        effect_class = cls._class_id_map.get(effect_id, Effect)
+        try:
+            effect_class = cls._class_id_map[effect_id]
+        except KeyError:
+            effect_class = cls._load_class(effect_id)
         effect = effect_class(effect_id, *args, **kwargs)
         for cust_func in cls._instance_id_map.get(effect.id, ()):
             cust_func(effect)
         return effect
 
+    @classmethod
+    def _load_class(cls, effect_id):
+        """Import module with custom class for effect ID, if there is one."""
+        try:
+            module_name = effect_class_modules[effect_id]
+        except KeyError:
+            return Effect
+        import_module(module_name, __package__)
+        return cls._class_id_map.get(effect_id, Effect)
+
     @classmethod
     def register_class_by_id(cls, effect_class, effect_id):
         """Register custom effect class against effect ID."""
@@ -0,0 +1,110 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+"""Declarative map of effect IDs to modules with custom effect classes.
+
+Modules are imported only when effect with one of their IDs is produced for
+the first time; each module registers its classes in effect factory when
+imported. Module names are relative to effect package.
+"""
+
+
+from eos.const.eve import EffectId
+
+
+# Format: {effect ID: module name}
+effect_class_modules = {
+    EffectId.ship_module_remote_capacitor_transmitter:
+        '.cap_transmit.ship_module_remote_capacitor_transmitter',
+    EffectId.super_weapon_amarr:
+        '.dmg_dealer.doomsday',
+    EffectId.super_weapon_caldari:
+        '.dmg_dealer.doomsday',
+    EffectId.super_weapon_gallente:
+        '.dmg_dealer.doomsday',
+    EffectId.super_weapon_minmatar:
+        '.dmg_dealer.doomsday',
+    EffectId.emp_wave:
+        '.dmg_dealer.emp_wave',
+    EffectId.fighter_ability_attack_m:
+        '.dmg_dealer.fighter',
+    EffectId.fighter_ability_kamikaze:
+        '.dmg_dealer.fighter',
+    EffectId.fighter_ability_launch_bomb:
+        '.dmg_dealer.fighter',
+    EffectId.fighter_ability_missiles:
+        '.dmg_dealer.fighter',
+    EffectId.chain_lightning:
+        '.dmg_dealer.turret',
+    EffectId.projectile_fired:
+        '.dmg_dealer.turret',
+    EffectId.target_disintegrator_attack:
+        '.dmg_dealer.turret',
+    EffectId.target_attack:
+        '.dmg_dealer.turret',
+    EffectId.use_missiles:
+        '.dmg_dealer.use_missiles',
+    EffectId.remote_sensor_damp_falloff:
+        '.ewar.damp',
+    EffectId.ship_module_guidance_disruptor:
+        '.ewar.guidance_disruptor',
+    EffectId.ship_module_tracking_disruptor:
+        '.ewar.tracking_disruptor',
+    EffectId.remote_webifier_falloff:
+        '.ewar.web',
+    EffectId.energy_neutralizer_falloff:
+        '.neut.energy_neutralizer_falloff',
+    EffectId.energy_nosferatu_falloff:
+        '.neut.energy_nosferatu_falloff',
+    EffectId.entity_energy_neutralizer_falloff:
+        '.neut.entity_energy_neutralizer_falloff',
+    EffectId.armor_repair:
+        '.repairs.armor_repair',
+    EffectId.fueled_armor_repair:
+        '.repairs.fueled_armor_repair',
+    EffectId.fueled_shield_boosting:
+        '.repairs.fueled_shield_boosting',
+    EffectId.npc_entity_remote_armor_repairer:
+        '.repairs.npc_entity_remote_armor_repairer',
+    EffectId.npc_entity_remote_shield_booster:
+        '.repairs.npc_entity_remote_shield_booster',
+    EffectId.shield_boosting:
+        '.repairs.shield_boosting',
+    EffectId.ship_module_ancillary_remote_armor_repairer:
+        '.repairs.ship_module_ancillary_remote_armor_repairer',
+    EffectId.ship_module_ancillary_remote_shield_booster:
+        '.repairs.ship_module_ancillary_remote_shield_booster',
+    EffectId.ship_module_remote_armor_mutadaptive_repairer:
+        '.repairs.ship_module_remote_armor_mutadaptive_repairer',
+    EffectId.ship_module_remote_armor_repairer:
+        '.repairs.ship_module_remote_armor_repairer',
+    EffectId.ship_module_remote_shield_booster:
+        '.repairs.ship_module_remote_shield_booster',
+    EffectId.module_bonus_warfare_link_armor:
+        '.warfare_buff.command_armor',
+    EffectId.module_bonus_warfare_link_info:
+        '.warfare_buff.command_info',
+    EffectId.module_bonus_warfare_link_mining:
+        '.warfare_buff.command_mining',
+    EffectId.module_bonus_warfare_link_shield:
+        '.warfare_buff.command_shield',
+    EffectId.module_bonus_warfare_link_skirmish:
+        '.warfare_buff.command_skirmish'}
@@ -24,6 +24,7 @@ from collections import namedtuple
 from eos.const.eos import State
 from eos.const.eve import AttrId
 from eos.const.eve import fighter_ability_map
+from eos.effect_status import EffectStatusResolver
 from eos.util.cached_property import cached_property
 from eos.util.repr import make_repr_str
 
@@ -92,6 +93,21 @@ class Type:
             max_state = max(max_state, effect._state)
         return max_state
 
+    @cached_property
+    def default_running_effect_ids(self):
+        """Get running effects for items of this type per item state.
+
+        Effects are considered to be in their default run modes.
+
+        Returns:
+            Map in {state: frozenset(effect IDs)} format.
+        """
+        return {
+            state: frozenset(
+                EffectStatusResolver.get_default_running_effect_ids(
+                    self, state))
+            for state in State}
+
     # Auxiliary methods
     def __repr__(self):
         spec = ['id']
@@ -19,4 +19,5 @@
 # ==============================================================================
 
 
+from .build_state import BuildState
 from .builder import EveObjBuilder
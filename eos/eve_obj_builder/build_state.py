@@ -0,0 +1,196 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import hashlib
+import os
+import pickle
+from collections.abc import Mapping
+from logging import getLogger
+
+from eos import __version__
+from eos.util.repr import make_repr_str
+
+
+logger = getLogger(__name__)
+
+
+# Version of build state format and of builder logic it has been produced
+# with. Has to be incremented whenever builder output for the same data changes
+BUILDER_FORMAT_VERSION = 1
+
+
+def _get_builder_version():
+    return __version__, BUILDER_FORMAT_VERSION
+
+
+def _canonicalize(data):
+    """Convert data into form with stable representation.
+
+    Representation of sets and dictionaries depends on insertion order and
+    string hash randomization, thus they are converted into sorted tuples.
+    """
+    if isinstance(data, Mapping):
+        return ('dict', tuple(sorted(
+            ((_canonicalize(k), _canonicalize(v)) for k, v in data.items()),
+            key=repr)))
+    if isinstance(data, (set, frozenset)):
+        return ('set', tuple(sorted(
+            (_canonicalize(i) for i in data), key=repr)))
+    if isinstance(data, (tuple, list)):
+        return tuple(_canonicalize(i) for i in data)
+    return data
+
+
+def digest(data):
+    """Return content hash of data, which is stable across processes."""
+    return hashlib.sha1(repr(_canonicalize(data)).encode()).hexdigest()
+
+
+def digest_table(table):
+    """Return content hash of a table, which does not depend on row order."""
+    table_hash = hashlib.sha1()
+    for row_digest in sorted(digest(row) for row in table):
+        table_hash.update(row_digest.encode())
+    return table_hash.hexdigest()
+
+
+def digest_row(row):
+    """Return content hash of row, ignoring its position in source table."""
+    return digest({k: v for k, v in row.items() if k != 'table_pos'})
+
+
+class BuildState:
+    """Results of previous eve object build.
+
+    They are used to avoid doing the same work again when eve objects are
+    rebuilt from data which is only slightly different.
+
+    Attributes:
+        version: Eos and builder format versions which produced the state.
+            State produced by other versions is discarded on load.
+        table_hashes: Content hashes of source tables in {table name: hash}
+            format.
+        eve_objects: 4 iterables with types, attributes, effects and warfare
+            buff templates, which were built last time.
+        converted: Map with intermediate converted objects in {(object kind,
+            content hash): object} format.
+    """
+
+    def __init__(self):
+        self.version = _get_builder_version()
+        self.table_hashes = {}
+        self.eve_objects = None
+        self.converted = {}
+
+    @classmethod
+    def load(cls, path):
+        """Load build state from file.
+
+        If file cannot be loaded, or it has been produced by different version
+        of eos or builder, empty build state is returned.
+        """
+        try:
+            with open(path, 'rb') as file:
+                build_state = pickle.load(file)
+        except FileNotFoundError:
+            return cls()
+        except:
+            msg = 'unable to load build state from "{}"'.format(path)
+            logger.warning(msg)
+            return cls()
+        if not isinstance(build_state, cls):
+            msg = 'file "{}" does not contain build state'.format(path)
+            logger.warning(msg)
+            return cls()
+        if getattr(build_state, 'version', None) != _get_builder_version():
+            msg = (
+                'build state in "{}" was produced by different builder '
+                'version, discarding it'
+            ).format(path)
+            logger.info(msg)
+            return cls()
+        return build_state
+
+    def save(self, path):
+        """Write build state to file."""
+        tmp_path = '{}.tmp'.format(path)
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def __repr__(self):
+        spec = [['tables', 'table_hashes']]
+        return make_repr_str(self, spec)
+
+
+class ConversionMemo:
+    """Provides objects converted from data with the same content earlier.
+
+    Args:
+        converted (optional): Map in {(object kind, content hash): object}
+            format with objects converted during previous build. If None,
+            objects are always converted anew and nothing is tracked.
+
+    Attributes:
+        converted: Map with objects used during current build, in the same
+            format.
+    """
+
+    def __init__(self, converted=None):
+        self.__previous = converted
+        self.converted = {}
+        # Format: {object ID: content hash}
+        self.__digests = {}
+
+    def get(self, kind, content, factory):
+        """Get object converted from passed content.
+
+        Args:
+            kind: Object kind, objects of different kinds do not share
+                content hashes.
+            content: Data which fully defines the object.
+            factory: Callable which converts content into object.
+
+        Returns:
+            Object converted from passed content, possibly during previous
+            build.
+        """
+        if self.__previous is None:
+            return factory()
+        content_hash = digest(content)
+        key = (kind, content_hash)
+        try:
+            obj = self.__previous[key]
+        except KeyError:
+            obj = factory()
+        self.converted[key] = obj
+        self.__digests[id(obj)] = content_hash
+        return obj
+
+    def has(self, kind, content):
+        """Check if object converted from passed content is available."""
+        if self.__previous is None:
+            return False
+        return (kind, digest(content)) in self.__previous
+
+    def get_digest(self, obj):
+        """Get content hash of object provided earlier by the memo."""
+        return self.__digests.get(id(obj))
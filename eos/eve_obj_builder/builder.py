@@ -19,19 +19,44 @@
 # ==============================================================================
 
 
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from logging import getLogger
+
 from eos.util.frozendict import frozendict
+from .build_state import ConversionMemo
+from .build_state import digest_table
 from .cleaner import Cleaner
 from .converter import Converter
+from .frozen_row import FrozenRow
 from .normalizer import Normalizer
 from .validator_preclean import ValidatorPreClean
 from .validator_preconv import ValidatorPreConv
 
 
+logger = getLogger(__name__)
+
+
+# Names of tables, grouped by source data they are likely to be fetched from.
+# When tables are fetched in parallel, tables from the same group are fetched
+# by the same worker task
+TABLE_GROUPS = (
+    ('evetypes',),
+    ('evegroups',),
+    ('dgmattribs',),
+    ('dgmtypeattribs', 'dgmtypeeffects'),
+    ('dgmeffects',),
+    ('dbuffcollections',),
+    ('skillreqs',),
+    ('typefighterabils',))
+
+
 class EveObjBuilder:
     """Builds Eos-specific eve objects from passed data."""
 
     @classmethod
-    def run(cls, data_handler):
+    def run(cls, data_handler, build_state=None, workers=None):
         """Run eve object building process.
 
         Use data provided by passed cache handler to compose various objects
@@ -40,40 +65,70 @@ class EveObjBuilder:
         Args:
             data_handler: Data handler instance, which should provide access to
                 raw eve data.
+            build_state (optional): Build state instance. When passed, results
+                of previous build stored on it are reused as much as possible,
+                and then it is updated with results of this build.
+            workers (optional): Quantity of worker processes. When specified,
+                data tables are fetched and modifiers of effects are built in
+                parallel. Tables are fetched in parallel only if data handler
+                can be pickled. Every worker task gets its own copy of data
+                handler, thus data cached within data handler session is
+                shared only by tables fetched by the same task.
 
         Returns:
             4 iterables, which contain types, attributes, effects and warfare
             buff templates.
         """
+        if workers is None:
+            return cls._run(data_handler, build_state, None)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return cls._run(data_handler, build_state, executor)
+
+    @classmethod
+    def _run(cls, data_handler, build_state, executor):
         # Put all the data we need into single dictionary Format, as usual,
         # {table name: table}, where table is set of rows, which are
-        # represented by frozendicts {fieldName: fieldValue}. Combination of
-        # sets and frozendicts is used to speed up several stages of the
+        # represented by immutable maps {fieldName: fieldValue}. Combination of
+        # sets and immutable maps is used to speed up several stages of the
         # builder.
         data = {}
-        getter_map = {
-            'evetypes': data_handler.get_evetypes,
-            'evegroups': data_handler.get_evegroups,
-            'dgmattribs': data_handler.get_dgmattribs,
-            'dgmtypeattribs': data_handler.get_dgmtypeattribs,
-            'dgmeffects': data_handler.get_dgmeffects,
-            'dgmtypeeffects': data_handler.get_dgmtypeeffects,
-            'dbuffcollections': data_handler.get_dbuffcollections,
-            'skillreqs': data_handler.get_skillreqs,
-            'typefighterabils': data_handler.get_typefighterabils}
-
-        for table_name, getter in getter_map.items():
-            table_pos = 0
-            table = set()
-            for row in getter():
-                # During further builder stages. some of rows may fall in risk
-                # groups, where all rows but one need to be removed. To
-                # deterministically remove rows based on position in original
-                # data, write position to each row
-                row['table_pos'] = table_pos
-                table_pos += 1
-                table.add(cls._freeze_data(row))
-            data[table_name] = table
+        pickled_data_handler = None
+        if executor is not None:
+            pickled_data_handler = cls._pickle_data_handler(data_handler)
+        if pickled_data_handler is not None:
+            futures = [
+                executor.submit(
+                    cls._fetch_tables, pickled_data_handler, table_names)
+                for table_names in TABLE_GROUPS]
+            for future in futures:
+                data.update(future.result())
+        else:
+            # Numbers are shared across all the tables
+            numbers = {}
+            for table_names in TABLE_GROUPS:
+                for table_name in table_names:
+                    getter = getattr(data_handler, 'get_' + table_name)
+                    data[table_name] = cls._fetch_table(getter, numbers)
+
+        if build_state is not None:
+            table_hashes = {
+                table_name: digest_table(table)
+                for table_name, table in data.items()}
+            # When source data is the same, there is no need to rebuild
+            # anything, even if data version has changed
+            if (
+                build_state.eve_objects is not None and
+                table_hashes == build_state.table_hashes
+            ):
+                logger.info('source data did not change, reusing eve objects')
+                return build_state.eve_objects
+            changed_tables = sorted(
+                table_name for table_name, table_hash in table_hashes.items()
+                if build_state.table_hashes.get(table_name) != table_hash)
+            logger.info('changed tables: {}'.format(', '.join(changed_tables)))
+            memo = ConversionMemo(build_state.converted)
+        else:
+            memo = None
 
         # Run pre-cleanup checks, as cleanup stage and further stages rely on
         # some assumptions about the data
@@ -90,10 +145,118 @@ class EveObjBuilder:
         ValidatorPreConv.run(data)
 
         # Convert data into Eos-specific objects
-        types, attrs, effects, buff_templates = Converter.run(data)
+        types, attrs, effects, buff_templates = Converter.run(
+            data, memo, executor)
+
+        if build_state is not None:
+            build_state.table_hashes = table_hashes
+            build_state.eve_objects = types, attrs, effects, buff_templates
+            build_state.converted = memo.converted
 
         return types, attrs, effects, buff_templates
 
+    @staticmethod
+    def _pickle_data_handler(data_handler):
+        """Pickle data handler to pass it to worker processes.
+
+        Returns:
+            Pickled data handler, or None if it cannot be pickled.
+        """
+        try:
+            return pickle.dumps(data_handler)
+        except Exception:
+            msg = (
+                'data handler cannot be pickled, fetching tables in current '
+                'process')
+            logger.info(msg)
+            return None
+
+    @classmethod
+    def _fetch_tables(cls, pickled_data_handler, table_names):
+        """Fetch group of tables in worker process.
+
+        Tables are fetched within single data handler session, if data handler
+        supports it.
+
+        Returns:
+            Dictionary in {table name: table} format.
+        """
+        data_handler = pickle.loads(pickled_data_handler)
+        numbers = {}
+        with ExitStack() as stack:
+            if getattr(data_handler, '__enter__', None) is not None:
+                stack.enter_context(data_handler)
+            return {
+                table_name: cls._fetch_table(
+                    getattr(data_handler, 'get_' + table_name), numbers)
+                for table_name in table_names}
+
+    @classmethod
+    def _fetch_table(cls, getter, numbers=None):
+        """Fetch table and convert its rows into immutable form.
+
+        Rows are processed one by one as getter provides them, thus if getter
+        is a generator, raw rows are not kept in memory.
+
+        Args:
+            getter: Callable which provides rows of the table.
+            numbers (optional): Dictionary with numbers seen in rows of tables
+                which were fetched earlier, to make rows of all of them refer
+                the same number objects.
+
+        Returns:
+            Set with frozen rows.
+        """
+        # Format: {field names: {field name: value position}}
+        field_maps = {}
+        # Numbers are repeated a lot across rows, e.g. item type IDs and
+        # attribute values, thus make rows refer the same number objects
+        # Format: {(number type, number key): number}
+        if numbers is None:
+            numbers = {}
+        table = set()
+        for table_pos, row in enumerate(getter()):
+            # During further builder stages. some of rows may fall in risk
+            # groups, where all rows but one need to be removed. To
+            # deterministically remove rows based on position in original
+            # data, write position to each row
+            row.pop('table_pos', None)
+            table.add(cls._freeze_row(row, table_pos, field_maps, numbers))
+        return table
+
+    @classmethod
+    def _freeze_row(cls, row, table_pos, field_maps, numbers):
+        """Convert row into compact immutable form.
+
+        Args:
+            row: Dictionary with row data.
+            table_pos: Position of the row in source table.
+            field_maps: Dictionary with field maps of rows which were frozen
+                earlier, rows with the same fields share them.
+            numbers: Dictionary with numbers seen in rows which were frozen
+                earlier.
+        """
+        field_names = (*row, 'table_pos')
+        try:
+            fields = field_maps[field_names]
+        except KeyError:
+            fields = field_maps[field_names] = {
+                n: i for i, n in enumerate(field_names)}
+        values = []
+        for value in row.values():
+            value_type = type(value)
+            if value_type is int:
+                value = numbers.setdefault((int, value), value)
+            # Floats are keyed by their exact representation, as 0.0 and -0.0
+            # are equal
+            elif value_type is float:
+                value = numbers.setdefault((float, value.hex()), value)
+            else:
+                value = cls._freeze_data(value)
+            values.append(value)
+        values.append(table_pos)
+        return FrozenRow(fields, tuple(values))
+
     @classmethod
     def _freeze_data(cls, data):
         if isinstance(data, dict):
@@ -20,12 +20,11 @@
 
 
 from collections.abc import Iterable
-from itertools import chain
 from logging import getLogger
 
 from eos.const.eve import AttrId
-from eos.const.eve import TypeCategoryId
-from eos.const.eve import TypeGroupId
+from eos.const.eve import STRONG_CATEGORY_IDS
+from eos.const.eve import STRONG_GROUP_IDS
 
 
 logger = getLogger(__name__)
@@ -58,22 +57,12 @@ class Cleaner:
 
     def _pump_evetypes(self):
         """Mark some hardcoded item types as strong."""
-        # Tuple with category IDs of item types we want to keep
-        strong_category_ids = (
-            TypeCategoryId.charge,
-            TypeCategoryId.drone,
-            TypeCategoryId.fighter,
-            TypeCategoryId.implant,
-            TypeCategoryId.module,
-            TypeCategoryId.ship,
-            TypeCategoryId.skill,
-            TypeCategoryId.subsystem)
         # Set with group IDs of item types we want to keep
-        strong_group_ids = {TypeGroupId.character, TypeGroupId.effect_beacon}
+        strong_group_ids = set(STRONG_GROUP_IDS)
         # Go through table data, filling valid groups set according to valid
         # categories
         for datarow in self.data['evegroups']:
-            if datarow.get('categoryID') in strong_category_ids:
+            if datarow.get('categoryID') in STRONG_CATEGORY_IDS:
                 strong_group_ids.add(datarow['groupID'])
         rows_to_pump = set()
         for datarow in self.data['evetypes']:
@@ -82,16 +71,32 @@ class Cleaner:
         self._pump_data('evetypes', rows_to_pump)
 
     def _autocleanup(self):
-        """Run auto-cleanup"""
+        """Run auto-cleanup.
+
+        Restore all trashed rows which are reachable via references from actual
+        data. Every row's references are followed once, and each reference is
+        resolved via index of trashed rows, thus amount of work is proportional
+        to amount of data which is kept.
+        """
         self._kill_weak()
-        self._changed = True
-        # Cycle as long as we have changes during previous iteration. We need
-        # this because contents of even evetypes may change, which, in turn,
-        # will need to pull additional data into other tables
-        while self._changed is True:
-            self._changed = False
-            self._reanimate_auxiliary_friends()
-            self._reestablish_broken_relationships()
+        # Format: {(table name, column name): {column value: {rows}}}
+        trash_index = self._index_trash()
+        # Actual data rows whose references have not been followed yet
+        # Format: [(table name, row)]
+        pending = [
+            (table_name, row)
+            for table_name, table in self.data.items()
+            for row in table]
+        while pending:
+            table_name, row = pending.pop()
+            for tgt_spec, value in self._get_references(table_name, row):
+                try:
+                    tgt_rows = trash_index[tgt_spec].pop(value)
+                except KeyError:
+                    continue
+                tgt_table_name = tgt_spec[0]
+                self._restore_data(tgt_table_name, tgt_rows)
+                pending.extend((tgt_table_name, r) for r in tgt_rows)
 
     def _kill_weak(self):
         """Trash all data which isn't marked as strong."""
@@ -101,269 +106,172 @@ class Cleaner:
             to_trash.update(table.difference(strong_rows))
             self._trash_data(table_name, to_trash)
 
-    def _reanimate_auxiliary_friends(self):
-        """Move auxiliary rows from trash into actual data.
+    def _index_trash(self):
+        """Index trashed rows by values of columns they are referenced by.
 
-        Restore rows in tables, which complement evetypes or serve as m:n
-        mapping between evetypes and other tables.
+        Returns:
+            Dictionary in {(table name, column name): {column value: {rows}}}
+            format.
         """
-        # As we filter whole database using evetypes table, gather type IDs we
-        # currently have in there
-        type_ids = {row['typeID'] for row in self.data['evetypes']}
-        # Auxiliary tables are those which do not define any entities, they just
-        # map one entities to others or complement entities with additional data
-        aux_tables = ('dgmtypeattribs', 'dgmtypeeffects', 'skillreqs', 'typefighterabils')
-        for table_name in aux_tables:
-            to_restore = set()
-            # Restore rows which map other entities to types
-            for row in self.trashed_data[table_name]:
-                if row['typeID'] in type_ids:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(table_name, to_restore)
-
-    def _reestablish_broken_relationships(self):
-        """Restore all trashed rows which are referenced from actual data."""
-        # Container for 'target data', matches with which are going to be
-        # restored
-        # Format: {(target table name, target column name): {values to have}}}
-        tgt_data = {}
-        self._get_tgts_relational(tgt_data)
-        self._get_tgts_modinfo(tgt_data)
-        self._get_tgts_attr_autocharge(tgt_data)
-        self._get_tgts_attr_buff(tgt_data)
-        self._get_tgts_buff(tgt_data)
-        # Now, when we have all the target data values, we may look for rows,
-        # which have matching values, and restore them
-        for tgt_spec, tgt_values in tgt_data.items():
-            tgt_table_name, tgt_column_name = tgt_spec
-            to_restore = set()
-            for row in self.trashed_data[tgt_table_name]:
-                if row.get(tgt_column_name) in tgt_values:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(tgt_table_name, to_restore)
-
-    def _get_tgts_relational(self, tgt_data):
-        """Find out which data relationally is referenced from actual data.
-
-        In this method, we get only references defined in 'relational' format,
-        that is, references defined as foreign keys. Foreign keys scheme is
-        hardcoded in this method and needs to be updated if it changes.
+        trash_index = {}
+        for table_name, column_name in self._ref_tgt_columns.items():
+            table_index = trash_index[(table_name, column_name)] = {}
+            for row in self.trashed_data.get(table_name, ()):
+                table_index.setdefault(row.get(column_name), set()).add(row)
+        return trash_index
+
+    # Each table can be referenced only via single column
+    # Format: {table name: column name}
+    _ref_tgt_columns = {
+        'evetypes': 'typeID',
+        'evegroups': 'groupID',
+        'dgmattribs': 'attributeID',
+        'dgmeffects': 'effectID',
+        'dbuffcollections': 'buffID',
+        'dgmtypeattribs': 'typeID',
+        'dgmtypeeffects': 'typeID',
+        'skillreqs': 'typeID',
+        'typefighterabils': 'typeID'}
+
+    # Format: {source table: {source column: (target table, target column)}}
+    _foreign_keys = {
+        'dgmattribs': {
+            'maxAttributeID': ('dgmattribs', 'attributeID')},
+        'dgmeffects': {
+            'durationAttributeID': ('dgmattribs', 'attributeID'),
+            'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
+            'dischargeAttributeID': ('dgmattribs', 'attributeID'),
+            'rangeAttributeID': ('dgmattribs', 'attributeID'),
+            'falloffAttributeID': ('dgmattribs', 'attributeID'),
+            'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID'),
+            'resistanceID': ('dgmattribs', 'attributeID')},
+        'dgmtypeattribs': {
+            'typeID': ('evetypes', 'typeID'),
+            'attributeID': ('dgmattribs', 'attributeID')},
+        'dgmtypeeffects': {
+            'typeID': ('evetypes', 'typeID'),
+            'effectID': ('dgmeffects', 'effectID')},
+        'evetypes': {
+            'groupID': ('evegroups', 'groupID')},
+        'skillreqs': {
+            'typeID': ('evetypes', 'typeID'),
+            'skillTypeID': ('evetypes', 'typeID')},
+        'typefighterabils': {
+            'typeID': ('evetypes', 'typeID')}}
+
+    # Auxiliary tables are those which do not define any entities, they just map
+    # one entities to others or complement entities with additional data
+    _aux_tables = (
+        'dgmtypeattribs', 'dgmtypeeffects', 'skillreqs', 'typefighterabils')
+
+    def _get_references(self, table_name, row):
+        """Get references from passed row to other data.
+
+        Foreign keys scheme and other relationships are hardcoded in this class
+        and need to be updated if they change.
 
         Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
+            table_name: Name of a table where row resides.
+            row: Data row.
+
+        Yields:
+            Tuples in ((target table name, target column name), value) format.
         """
-        # Format: {source table: {source column: (target table, target column)}}
-        foreign_keys = {
-            'dgmattribs': {
-                'maxAttributeID': ('dgmattribs', 'attributeID')},
-            'dgmeffects': {
-                'durationAttributeID': ('dgmattribs', 'attributeID'),
-                'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
-                'dischargeAttributeID': ('dgmattribs', 'attributeID'),
-                'rangeAttributeID': ('dgmattribs', 'attributeID'),
-                'falloffAttributeID': ('dgmattribs', 'attributeID'),
-                'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID'),
-                'resistanceID': ('dgmattribs', 'attributeID')},
-            'dgmtypeattribs': {
-                'typeID': ('evetypes', 'typeID'),
-                'attributeID': ('dgmattribs', 'attributeID')},
-            'dgmtypeeffects': {
-                'typeID': ('evetypes', 'typeID'),
-                'effectID': ('dgmeffects', 'effectID')},
-            'evetypes': {
-                'groupID': ('evegroups', 'groupID')},
-            'skillreqs': {
-                'typeID': ('evetypes', 'typeID'),
-                'skillTypeID': ('evetypes', 'typeID')},
-            'typefighterabils': {
-                'typeID': ('evetypes', 'typeID')}}
-        for src_table_name, table_fks in foreign_keys.items():
-            for src_column_name, fk_tgt in table_fks.items():
-                tgt_table_name, tgt_column_name = fk_tgt
-                for row in self.data[src_table_name]:
-                    fk_value = row.get(src_column_name)
-                    # If there's no such field in a row or it is None, this is
-                    # not a valid FK reference
-                    if fk_value is None:
-                        continue
-                    tgt_spec = (tgt_table_name, tgt_column_name)
-                    tgt_data.setdefault(tgt_spec, set()).add(fk_value)
-
-    def _get_tgts_modinfo(self, tgt_data):
-        """Find out which data is referenced from modinfo in actual data.
+        for src_column_name, tgt_spec in self._foreign_keys.get(
+            table_name, {}
+        ).items():
+            fk_value = row.get(src_column_name)
+            # If there's no such field in a row or it is None, this is not a
+            # valid FK reference
+            if fk_value is not None:
+                yield tgt_spec, fk_value
+        if table_name == 'evetypes':
+            # As we filter whole database using evetypes table, restore rows in
+            # tables which complement item types or serve as m:n mapping
+            # between them and other tables
+            for aux_table_name in self._aux_tables:
+                yield (aux_table_name, 'typeID'), row['typeID']
+        elif table_name == 'dgmeffects':
+            yield from self._get_refs_modinfo(row)
+        elif table_name == 'dgmtypeattribs':
+            yield from self._get_refs_attr(row)
+        elif table_name == 'dbuffcollections':
+            yield from self._get_refs_buff(row)
+
+    def _get_refs_modinfo(self, effect_row):
+        """Find out which data is referenced from modinfo of an effect.
 
         Method knows where to look for modinfo data and which references it
         contains. If modinfo data format is somehow changed, this method also
         needs to be updated.
-
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
         """
-        modinfo_relations = self._modinfo_relations()
-        for effect_row in self.data['dgmeffects']:
-            effect_id = effect_row['effectID']
-            try:
-                relations = modinfo_relations[effect_id]
-            except KeyError:
-                continue
-            type_ids, group_ids, attr_ids = relations
-            for references, tgt_table_name, tgt_column_name in (
-                (type_ids, 'evetypes', 'typeID'),
-                (group_ids, 'evegroups', 'groupID'),
-                (attr_ids, 'dgmattribs', 'attributeID')
+        mod_infos = effect_row.get('modifierInfo')
+        # We do not need anything here if modifier info is empty
+        if not mod_infos:
+            return
+        # Modifier infos should be basic python iterable
+        if not isinstance(mod_infos, Iterable):
+            return
+        for mod_info in mod_infos:
+            for attr_name, tgt_spec in (
+                ('skillTypeID', ('evetypes', 'typeID')),
+                ('groupID', ('evegroups', 'groupID')),
+                ('modifyingAttributeID', ('dgmattribs', 'attributeID')),
+                ('modifiedAttributeID', ('dgmattribs', 'attributeID'))
             ):
-                # If there're any references for given entity, add them to
-                # dictionary
-                if references:
-                    tgt_spec = (tgt_table_name, tgt_column_name)
-                    tgt_data.setdefault(tgt_spec, set()).update(references)
+                try:
+                    entity_id = mod_info[attr_name]
+                except KeyError:
+                    continue
+                yield tgt_spec, entity_id
 
-    def _modinfo_relations(self):
-        """Helper method for modinfo reference getter.
+    def _get_refs_attr(self, type_attr_row):
+        """Find out which data is referenced via values of item attributes.
 
-        Generates auxiliary map to avoid re-parsing YAML on each cleanup cycle.
-
-        Returns:
-            Dictionary in {effect ID: ({type IDs}, {group IDs}, {attribute
-            IDs})} format.
+        Some item types specify which ammo is loaded into them, and some refer
+        warfare buffs they apply.
         """
-
-        # Helper function to fetch actual attribute values from modinfo dicts
-        def add_entity(mod_info, attr_name, entities):
-            try:
-                entity_id = mod_info[attr_name]
-            except KeyError:
-                pass
-            else:
-                entities.add(entity_id)
-
-        # Format: {effect ID: ({type IDs}, {group IDs}, {attribute IDs})}
-        relations = {}
-        # Cycle through both data and trashed data, to make sure all rows are
-        # processed regardless of stage during which this property is accessed
-        for effect_row in chain(
-            self.data['dgmeffects'],
-            self.trashed_data['dgmeffects']
+        attr_id = type_attr_row['attributeID']
+        if attr_id in (
+            AttrId.ammo_loaded,
+            AttrId.fighter_ability_launch_bomb_type
         ):
-            # We do not need anything here if modifier info is empty
-            mod_infos = effect_row.get('modifierInfo')
-            if not mod_infos:
-                continue
-            # Modifier infos should be basic python iterable
-            if not isinstance(mod_infos, Iterable):
-                continue
-            type_ids = set()
-            group_ids = set()
-            attr_ids = set()
-            # Fill in sets with IDs from each modifier info dict
-            for mod_info in mod_infos:
-                add_entity(mod_info, 'skillTypeID', type_ids)
-                add_entity(mod_info, 'groupID', group_ids)
-                add_entity(mod_info, 'modifyingAttributeID', attr_ids)
-                add_entity(mod_info, 'modifiedAttributeID', attr_ids)
-            # If all of the sets are empty, do not add anything to primary
-            # container
-            if not type_ids and not group_ids and not attr_ids:
-                continue
-            # Otherwise, add all the data we've gathered for current effect to
-            # container
-            relations[effect_row['effectID']] = (type_ids, group_ids, attr_ids)
-        return relations
-
-    def _get_tgts_attr_autocharge(self, tgt_data):
-        """Find out which types are referred via 'ammo loaded' attributes.
-
-        Some item types specify which ammo is loaded into them, and here we
-        ensure these ammo types are kept.
-
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
-        """
-        for row in self.data['dgmtypeattribs']:
-            if row['attributeID'] not in (
-                AttrId.ammo_loaded,
-                AttrId.fighter_ability_launch_bomb_type
-            ):
-                continue
-            value = row.get('value')
-            try:
-                ammo_type_id = int(value)
-            except TypeError:
-                continue
             tgt_spec = ('evetypes', 'typeID')
-            tgt_data.setdefault(tgt_spec, set()).add(ammo_type_id)
-
-    def _get_tgts_attr_buff(self, tgt_data):
-        """Find out which warfare buffs are referenced from item types we keep.
-
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
-        """
-        for row in self.data['dgmtypeattribs']:
-            if row['attributeID'] not in (
-                AttrId.warfare_buff_1_id,
-                AttrId.warfare_buff_2_id,
-                AttrId.warfare_buff_3_id,
-                AttrId.warfare_buff_4_id
-            ):
-                continue
-            value = row.get('value')
-            try:
-                buff_id = int(value)
-            except TypeError:
-                continue
+        elif attr_id in (
+            AttrId.warfare_buff_1_id,
+            AttrId.warfare_buff_2_id,
+            AttrId.warfare_buff_3_id,
+            AttrId.warfare_buff_4_id
+        ):
             tgt_spec = ('dbuffcollections', 'buffID')
-            tgt_data.setdefault(tgt_spec, set()).add(buff_id)
-
-    def _get_tgts_buff(self, tgt_data):
-        """Find out which entities are used in warfare buff data.
-
-        Args:
-            tgt_data: Dictionary which will be filled during the process. Its
-                contents should specify target field and which values this field
-                should have.
-        """
-        def add_attr(mod_row):
-            attr_id = mod_row.get('dogmaAttributeID')
-            if attr_id is not None:
-                tgt_spec = ('dgmattribs', 'attributeID')
-                tgt_data.setdefault(tgt_spec, set()).add(attr_id)
-
-        def add_group(mod_row):
-            group_id = mod_row.get('groupID')
-            if group_id is not None:
-                tgt_spec = ('evegroups', 'groupID')
-                tgt_data.setdefault(tgt_spec, set()).add(group_id)
-
-        def add_type(mod_row):
-            type_id = mod_row.get('skillID')
-            if type_id is not None:
-                tgt_spec = ('evetypes', 'typeID')
-                tgt_data.setdefault(tgt_spec, set()).add(type_id)
-
-        for row in self.data['dbuffcollections']:
-            for mod_row in row.get('itemModifiers', ()):
-                add_attr(mod_row)
-            for mod_row in row.get('locationModifiers', ()):
-                add_attr(mod_row)
-            for mod_row in row.get('locationGroupModifiers', ()):
-                add_attr(mod_row)
-                add_group(mod_row)
-            for mod_row in row.get('locationRequiredSkillModifiers', ()):
-                add_attr(mod_row)
-                add_type(mod_row)
+        else:
+            return
+        value = type_attr_row.get('value')
+        try:
+            tgt_id = int(value)
+        except TypeError:
+            return
+        yield tgt_spec, tgt_id
+
+    def _get_refs_buff(self, buff_row):
+        """Find out which entities are used in warfare buff data."""
+        for mod_table_name, column_names in (
+            ('itemModifiers', ('dogmaAttributeID',)),
+            ('locationModifiers', ('dogmaAttributeID',)),
+            ('locationGroupModifiers', ('dogmaAttributeID', 'groupID')),
+            ('locationRequiredSkillModifiers', ('dogmaAttributeID', 'skillID'))
+        ):
+            for mod_row in buff_row.get(mod_table_name, ()):
+                for column_name in column_names:
+                    tgt_id = mod_row.get(column_name)
+                    if tgt_id is not None:
+                        yield self._buff_ref_tgts[column_name], tgt_id
+
+    # Format: {buff modifier column: (target table, target column)}
+    _buff_ref_tgts = {
+        'dogmaAttributeID': ('dgmattribs', 'attributeID'),
+        'groupID': ('evegroups', 'groupID'),
+        'skillID': ('evetypes', 'typeID')}
 
     def _report_results(self):
         """Log cleanup results."""
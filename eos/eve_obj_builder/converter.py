@@ -20,28 +20,42 @@
 
 
 import math
+from logging import getLogger
 
 from eos.eve_obj.attribute import Attribute
 from eos.eve_obj.effect import Effect
 from eos.eve_obj.type import AbilityData
 from eos.eve_obj.type import Type
 from .buff_template_builder import WarfareBuffTemplateBuilder
+from .build_state import ConversionMemo
+from .build_state import digest_row
 from .mod_builder import ModBuilder
 
 
+# Quantity of effects whose modifiers are built by a worker at once
+MOD_BUILD_CHUNK_SIZE = 100
+
+
 class Converter:
 
     @staticmethod
-    def run(data):
+    def run(data, memo=None, executor=None):
         """Convert data into eve objects.
 
         Args:
             data: Dictionary in {table name: {table, rows}} format.
+            memo (optional): Conversion memo. When passed, types, effects and
+                warfare buff templates are taken from it if their source data
+                did not change since they were converted.
+            executor (optional): Executor which is used to build modifiers of
+                effects in parallel.
 
         Returns:
             4 iterables, which contain types, attributes, effects and warfare
             buff templates.
         """
+        if memo is None:
+            memo = ConversionMemo()
         # Before actually instantiating anything, we need to collect some data
         # in convenient form
         # Format: {group ID: group row}
@@ -89,23 +103,32 @@ class Converter:
         # Convert effects
         effects = []
         mod_builder = ModBuilder()
+        # Format: {effect row: (modifiers, build status)}
+        mod_build_results = {}
+        if executor is not None:
+            rows_to_build = [
+                row for row in data['dgmeffects']
+                if not memo.has('effect', digest_row(row))]
+            for row, (build_results, log_records) in zip(
+                rows_to_build, executor.map(
+                    mod_builder.build_collecting_log, rows_to_build,
+                    chunksize=MOD_BUILD_CHUNK_SIZE)
+            ):
+                # Log what was logged by workers
+                for log_record in log_records:
+                    getLogger(log_record.name).handle(log_record)
+                mod_build_results[row] = build_results
+
+        def build_modifiers(effect_row):
+            try:
+                return mod_build_results.pop(effect_row)
+            except KeyError:
+                return mod_builder.build(effect_row)
+
         for row in data['dgmeffects']:
-            modifiers, build_status = mod_builder.build(row)
-            effects.append(Effect(
-                effect_id=row['effectID'],
-                category_id=row.get('effectCategory'),
-                is_offensive=row.get('isOffensive'),
-                is_assistance=row.get('isAssistance'),
-                duration_attr_id=row.get('durationAttributeID'),
-                discharge_attr_id=row.get('dischargeAttributeID'),
-                range_attr_id=row.get('rangeAttributeID'),
-                falloff_attr_id=row.get('falloffAttributeID'),
-                tracking_speed_attr_id=row.get('trackingSpeedAttributeID'),
-                fitting_usage_chance_attr_id=(
-                    row.get('fittingUsageChanceAttributeID')),
-                resist_attr_id=row.get('resistanceAttributeID'),
-                build_status=build_status,
-                modifiers=tuple(modifiers)))
+            effects.append(memo.get(
+                'effect', digest_row(row),
+                lambda: Converter._convert_effect(row, build_modifiers)))
 
         # Convert types
         types = []
@@ -115,19 +138,54 @@ class Converter:
             type_group = row.get('groupID')
             type_effect_ids = types_effects.get(type_id, set())
             type_effect_ids.intersection_update(effect_map)
-            types.append(Type(
-                type_id=type_id,
-                group_id=type_group,
-                category_id=groups_keyed.get(type_group, {}).get('categoryID'),
-                attrs=types_attrs.get(type_id, {}),
-                effects=tuple(effect_map[eid] for eid in type_effect_ids),
-                default_effect=effect_map.get(types_defeff_map.get(type_id)),
-                abilities_data=types_abilities_data.get(type_id, {}),
-                required_skills=types_skillreq_data.get(type_id)))
+            type_effects = tuple(
+                effect_map[eid] for eid in sorted(type_effect_ids))
+            type_kwargs = {
+                'type_id': type_id,
+                'group_id': type_group,
+                'category_id': groups_keyed.get(
+                    type_group, {}).get('categoryID'),
+                'attrs': types_attrs.get(type_id, {}),
+                'effects': type_effects,
+                'default_effect': effect_map.get(
+                    types_defeff_map.get(type_id)),
+                'abilities_data': types_abilities_data.get(type_id, {}),
+                'required_skills': types_skillreq_data.get(type_id)}
+            # Type refers effect objects, thus it can be reused only when all
+            # its effects were reused as well
+            type_content = (
+                digest_row(row),
+                {k: v for k, v in type_kwargs.items()
+                 if k not in ('effects', 'default_effect')},
+                tuple(memo.get_digest(e) for e in type_effects),
+                types_defeff_map.get(type_id))
+            types.append(memo.get(
+                'type', type_content, lambda: Type(**type_kwargs)))
 
         # Convert buff templates
         buff_templates = []
         for row in data['dbuffcollections']:
-            buff_templates.extend(WarfareBuffTemplateBuilder.build(row))
+            buff_templates.extend(memo.get(
+                'buff_templates', digest_row(row),
+                lambda: tuple(WarfareBuffTemplateBuilder.build(row))))
 
         return types, attrs, effects, buff_templates
+
+    @staticmethod
+    def _convert_effect(row, build_modifiers):
+        modifiers, build_status = build_modifiers(row)
+        return Effect(
+            effect_id=row['effectID'],
+            category_id=row.get('effectCategory'),
+            is_offensive=row.get('isOffensive'),
+            is_assistance=row.get('isAssistance'),
+            duration_attr_id=row.get('durationAttributeID'),
+            discharge_attr_id=row.get('dischargeAttributeID'),
+            range_attr_id=row.get('rangeAttributeID'),
+            falloff_attr_id=row.get('falloffAttributeID'),
+            tracking_speed_attr_id=row.get('trackingSpeedAttributeID'),
+            fitting_usage_chance_attr_id=(
+                row.get('fittingUsageChanceAttributeID')),
+            resist_attr_id=row.get('resistanceAttributeID'),
+            build_status=build_status,
+            modifiers=tuple(modifiers))
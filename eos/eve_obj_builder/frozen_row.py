@@ -0,0 +1,77 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from collections.abc import Mapping
+
+
+class FrozenRow(Mapping):
+    """Immutable data row with compact representation.
+
+    Row stores only tuple with field values, while map of field names to
+    positions in this tuple is shared between all rows with the same fields.
+    Rows are hashable and compare equal to frozendicts with the same contents.
+
+    Args:
+        fields: Map in {field name: value position} format.
+        values: Tuple with field values.
+    """
+
+    __slots__ = ('__fields', '__values', '__hash')
+
+    def __init__(self, fields, values):
+        self.__fields = fields
+        self.__values = values
+        self.__hash = None
+
+    def __getitem__(self, key):
+        return self.__values[self.__fields[key]]
+
+    def get(self, key, default=None):
+        try:
+            position = self.__fields[key]
+        except KeyError:
+            return default
+        return self.__values[position]
+
+    def __contains__(self, key):
+        return key in self.__fields
+
+    def __iter__(self):
+        return iter(self.__fields)
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenRow) and other.__fields is self.__fields:
+            return other.__values == self.__values
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        if self.__hash is None:
+            self.__hash = hash(frozenset(zip(self.__fields, self.__values)))
+        return self.__hash
+
+    def __reduce__(self):
+        return type(self), (self.__fields, self.__values)
+
+    def __repr__(self):
+        return 'FrozenRow({})'.format(dict(zip(self.__fields, self.__values)))
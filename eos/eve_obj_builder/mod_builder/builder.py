@@ -19,6 +19,7 @@
 # ==============================================================================
 
 
+from logging import Handler
 from logging import getLogger
 
 from eos.const.eos import EffectBuildStatus
@@ -29,6 +30,24 @@ from .exception import YamlParsingError
 logger = getLogger(__name__)
 
 
+class LogRecordCollector(Handler):
+    """Keeps log records instead of emitting them.
+
+    Records are prepared to be pickled, similarly to how queue handler does it.
+    """
+
+    def __init__(self):
+        Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        self.records.append(record)
+
+
 class ModBuilder:
     """Builds modifiers out of effect data.
 
@@ -81,6 +100,30 @@ class ModBuilder:
             else:
                 return (), EffectBuildStatus.error
 
+    def build_collecting_log(self, effect_row):
+        """Generate modifiers, returning log records instead of emitting them.
+
+        Used in worker processes, as their log records do not reach handlers of
+        parent process.
+
+        Args:
+            effect_row: Effect row with effect category and modifier info data.
+
+        Returns:
+            Tuple with build results (see build method) and list with log
+            records.
+        """
+        collector = LogRecordCollector()
+        propagate = logger.propagate
+        logger.addHandler(collector)
+        logger.propagate = False
+        try:
+            build_results = self.build(effect_row)
+        finally:
+            logger.removeHandler(collector)
+            logger.propagate = propagate
+        return build_results, collector.records
+
     @staticmethod
     def __get_valid_mods(mods):
         valid_mods = []
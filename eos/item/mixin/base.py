@@ -25,14 +25,11 @@ from collections import namedtuple
 
 from eos.cache_handler import TypeFetchError
 from eos.calculator.map import MutableAttrMap
-from eos.const.eos import EffectMode
+from eos.effect_status import DEFAULT_EFFECT_MODE
 from eos.item_container import ItemDict
 from eos.pubsub.message.helper import MsgHelper
 
 
-DEFAULT_EFFECT_MODE = EffectMode.full_compliance
-
-
 EffectData = namedtuple('EffectData', ('effect', 'mode', 'status'))
 
 
@@ -168,6 +165,10 @@ class BaseItemMixin(metaclass=ABCMeta):
             return DEFAULT_EFFECT_MODE
         return self.__effect_mode_overrides.get(effect_id, DEFAULT_EFFECT_MODE)
 
+    @property
+    def _has_effect_mode_overrides(self):
+        return self.__effect_mode_overrides is not None
+
     def set_effect_mode(self, effect_id, effect_mode):
         """Set effect's run mode for this item."""
         self._set_effects_modes({effect_id: effect_mode})
@@ -245,22 +246,36 @@ class BaseItemMixin(metaclass=ABCMeta):
 
     def _load(self):
         """Load item's source-specific data."""
+        if not self._load_type():
+            return
+        # If fetch is successful, launch bunch of messages
+        fit = self._fit
+        if fit is not None:
+            msgs = MsgHelper.get_item_loaded_msgs(self)
+            fit._publish_bulk(msgs)
+        self._load_autocharges()
+
+    def _load_type(self):
+        """Fetch item type without notifying anyone about it.
+
+        Returns:
+            True if item type has been fetched, False otherwise.
+        """
         fit = self._fit
         # Do nothing if we cannot reach cache handler
         try:
             getter = fit.solar_system.source.cache_handler.get_type
         except AttributeError:
-            return
+            return False
         # Do nothing if cache handler doesn't have item type we need
         try:
             self._type = getter(self._type_id)
         except TypeFetchError:
-            return
-        # If fetch is successful, launch bunch of messages
-        if fit is not None:
-            msgs = MsgHelper.get_item_loaded_msgs(self)
-            fit._publish_bulk(msgs)
-        # Add autocharges, if effects specify any
+            return False
+        return True
+
+    def _load_autocharges(self):
+        """Add autocharges, if effects specify any."""
         for effect_id, effect in self._type_effects.items():
             autocharge_type_id = effect.get_autocharge_type_id(self)
             if autocharge_type_id is None:
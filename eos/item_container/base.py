@@ -19,6 +19,8 @@
 # ==============================================================================
 
 
+from contextlib import contextmanager
+
 from eos.pubsub.message.helper import MsgHelper
 from .exception import ItemAlreadyAssignedError
 
@@ -39,17 +41,49 @@ class ItemContainerBase:
         Must be called after item has been assigned to specific container, so
         that presence checks during addition pass.
         """
+        self._assign_item(item, container)
+        self._publish_items_addition((item,))
+
+    def _assign_item(self, item, container):
+        """Assign item to container without notifying anyone about it.
+
+        Raises:
+            ItemAlreadyAssignedError: If item already belongs to other
+                container.
+        """
         # Make sure we're not adding item which already belongs to other
         # container
         if item._container:
             raise ItemAlreadyAssignedError(item)
         item._container = container
-        fit = item._fit
-        if fit is not None:
+
+    def _publish_items_addition(self, items):
+        """Load assigned items and notify fit about them.
+
+        All the items and their child items are loaded first, and then
+        messages about all of them are published in single pass. Autocharges
+        are added after that, as they rely on parent items being loaded.
+
+        Args:
+            items: Sequence with items which belong to the same fit.
+        """
+        if not items:
+            return
+        # Passed items are always assigned to the same fit
+        fit = items[0]._fit
+        if fit is None:
+            return
+        msgs = []
+        loaded_items = []
+        for item in items:
             for subitem in self.__subitem_iter(item):
-                msgs = MsgHelper.get_item_added_msgs(subitem)
-                fit._publish_bulk(msgs)
-                subitem._load()
+                msgs.extend(MsgHelper.get_item_added_msgs(subitem))
+                if subitem._load_type():
+                    msgs.extend(MsgHelper.get_item_loaded_msgs(subitem))
+                    loaded_items.append(subitem)
+        fit._publish_bulk(msgs)
+        for item in loaded_items:
+            item._load_autocharges()
 
     def _handle_item_removal(self, item):
         """Do all the generic work to remove item to container.
@@ -65,6 +99,19 @@ class ItemContainerBase:
                 fit._publish_bulk(msgs)
         item._container = None
 
+    @contextmanager
+    def _batch(self):
+        """Coalesce attribute change notifications on container's fit.
+
+        Used by methods which add multiple items at once.
+        """
+        fit = self._fit
+        if fit is None:
+            yield
+            return
+        with fit.batch():
+            yield
+
     def __subitem_iter(self, item):
         """Iterate through passed item and its child items."""
         yield item
@@ -90,6 +90,59 @@ class ItemList(ItemContainerBase):
             del self.__list[-1]
             raise ValueError(*e.args) from e
 
+    def extend(self, values):
+        """Append multiple values to the end of the container.
+
+        All the items are appended and loaded first, and then messages about
+        them are published in single pass. Attribute change notifications are
+        coalesced until all items are added.
+
+        Args:
+            values: Iterable with items or Nones. None can be used to append
+                empty slots between items.
+
+        Raises:
+            TypeError: If item of unacceptable class is passed. In this case
+                nothing is appended.
+            ValueError: If item cannot be added to the container (e.g. already
+                belongs to other container). Values which were processed before
+                it stay in the container.
+        """
+        values = list(values)
+        for value in values:
+            self._check_class(value, allow_none=True)
+        with self._batch():
+            added_items = []
+            try:
+                self._append_silently(values, added_items)
+            finally:
+                self._publish_items_addition(added_items)
+
+    def _append_silently(self, values, added_items):
+        """Append values without notifying fit about added items.
+
+        Args:
+            values: Iterable with items or Nones.
+            added_items: List, to which successfully appended items are added.
+                Fit has to be notified about them afterwards.
+
+        Raises:
+            ValueError: If item cannot be added to the container.
+        """
+        try:
+            for value in values:
+                self.__list.append(value)
+                if value is None:
+                    continue
+                try:
+                    self._assign_item(value, self)
+                except ItemAlreadyAssignedError as e:
+                    del self.__list[-1]
+                    raise ValueError(*e.args) from e
+                added_items.append(value)
+        finally:
+            self._cleanup()
+
     def place(self, index, item):
         """Put item to given position.
 
@@ -35,6 +35,40 @@ class ModuleRacks:
         self.mid = mid
         self.low = low
 
+    def load(self, high=(), mid=(), low=()):
+        """Append modules to racks.
+
+        Modules of all racks are appended and loaded first, and then messages
+        about them are published in single pass. Attribute change notifications
+        are coalesced until all modules are added.
+
+        Args:
+            high (optional): Iterable with items or Nones for high slots.
+            mid (optional): Iterable with items or Nones for medium slots.
+            low (optional): Iterable with items or Nones for low slots.
+
+        Raises:
+            TypeError: If item of unacceptable class is passed. In this case
+                no modules are added.
+            ValueError: If item cannot be added to rack (e.g. already belongs to
+                other container). Modules which were processed before it stay
+                in racks.
+        """
+        rack_values = (
+            (self.high, list(high)),
+            (self.mid, list(mid)),
+            (self.low, list(low)))
+        for rack, values in rack_values:
+            for value in values:
+                rack._check_class(value, allow_none=True)
+        with self.high._batch():
+            added_items = []
+            try:
+                for rack, values in rack_values:
+                    rack._append_silently(values, added_items)
+            finally:
+                self.high._publish_items_addition(added_items)
+
     def items(self):
         """Return view over all module items."""
         return ModuleItemView(self)
@@ -54,13 +54,51 @@ class ItemSet(ItemContainerBase):
                 belongs to some fit).
         """
         self._check_class(item)
+        self._add_silently(item)
+        self._publish_items_addition((item,))
+
+    def update(self, items):
+        """Add multiple items to the container.
+
+        All the items are added and loaded first, and then messages about them
+        are published in single pass. Attribute change notifications are
+        coalesced until all items are added.
+
+        Args:
+            items: Iterable with items to add.
+
+        Raises:
+            TypeError: If item of unacceptable class is passed. In this case
+                no items are added.
+            ValueError: If item cannot be added to the container (e.g. already
+                belongs to some fit). Items which were processed before it stay
+                in the container.
+        """
+        items = list(items)
+        for item in items:
+            self._check_class(item)
+        with self._batch():
+            added_items = []
+            try:
+                for item in items:
+                    self._add_silently(item)
+                    added_items.append(item)
+            finally:
+                self._publish_items_addition(added_items)
+
+    def _add_silently(self, item):
+        """Add item without notifying fit about it.
+
+        Raises:
+            ValueError: If item cannot be added to the container.
+        """
         self.__set.add(item)
         if self.__container_override is not None:
             item_container = self.__container_override
         else:
             item_container = self
         try:
-            self._handle_item_addition(item, item_container)
+            self._assign_item(item, item_container)
         except ItemAlreadyAssignedError as e:
             self.__set.remove(item)
             raise ValueError from e
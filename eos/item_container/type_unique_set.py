@@ -50,7 +50,39 @@ class TypeUniqueItemSet(ItemSet):
                 belongs to other container or item with this type ID exists in
                 the container).
         """
-        self._check_class(item)
+        ItemSet.add(self, item)
+
+    def update(self, items):
+        """Add multiple items to the container.
+
+        Attribute change notifications are coalesced until all items are
+        added.
+
+        Args:
+            items: Iterable with items to add.
+
+        Raises:
+            TypeError: If item of unacceptable class is passed. In this case
+                no items are added.
+            ValueError: If item cannot be added to the container (e.g. already
+                belongs to other container). If reason is type ID conflict, no
+                items are added, otherwise items which were processed before it
+                stay in the container.
+        """
+        items = list(items)
+        type_ids = set()
+        for item in items:
+            self._check_class(item)
+            type_id = item._type_id
+            if type_id in self.__type_id_map or type_id in type_ids:
+                msg = (
+                    'item with type ID {} already exists in this set'
+                ).format(type_id)
+                raise ValueError(msg)
+            type_ids.add(type_id)
+        ItemSet.update(self, items)
+
+    def _add_silently(self, item):
         type_id = item._type_id
         if type_id in self.__type_id_map:
             msg = (
@@ -59,8 +91,8 @@ class TypeUniqueItemSet(ItemSet):
             raise ValueError(msg)
         self.__type_id_map[type_id] = item
         try:
-            ItemSet.add(self, item)
-        except (TypeError, ValueError):
+            ItemSet._add_silently(self, item)
+        except ValueError:
             del self.__type_id_map[type_id]
             raise
 
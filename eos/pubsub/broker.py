@@ -19,17 +19,100 @@
 # ==============================================================================
 
 
+from contextlib import contextmanager
+
+from .instrumentation import MsgStats
+from .message import AttrsValueChanged
+from .message import AttrsValueChangedMasked
+
+
+# Messages of these types are merged into single message of the same type when
+# published within batch
+MERGEABLE_MSG_TYPES = (AttrsValueChanged, AttrsValueChangedMasked)
+
+
 class FitMsgBroker:
     """Manages message subscriptions and dispatch messages to recipients."""
 
     def __init__(self):
-        # Format: {event class: {subscribers}}
+        # Dictionaries are used as ordered sets
+        # Format: {message type: {subscriber: None}}
         self.__subscribers = {}
+        # Handlers of subscribers, compiled when subscriptions change
+        # Format: {message type: (handlers)}
+        self.__dispatch_table = {}
+        # Classes of subscribers which own handlers from dispatch table
+        # Format: {message type: (subscriber classes)}
+        self.__dispatch_subscriber_classes = {}
+        # Handlers and their owner classes split by when they receive
+        # attribute changes published within batch
+        # Format: {message type: (handlers, subscriber classes)}
+        self.__batch_immediate_dispatch = {}
+        self.__batch_deferred_dispatch = {}
+        # Message dispatching stats, collected only when enabled
+        self.__msg_stats = None
+        # Quantity of currently open batches
+        self.__batch_depth = 0
+        # Attribute changes which were published within batch
+        # Format: {message type: {item: {attr IDs}}}
+        self.__batch_attr_changes = {}
+
+    @contextmanager
+    def batch(self):
+        """Coalesce attribute change notifications within context.
+
+        While batch is open, messages about changed attribute values are
+        dispatched right away only to subscribers which keep attribute values
+        consistent, like calculator, thus values requested within batch are
+        always up to date. For the rest of subscribers these messages are
+        merged, and when outermost batch is closed, they receive single
+        consolidated message per message type. Other messages are dispatched
+        right away, to keep all the services consistent with fit contents.
+
+        Consolidated messages are dispatched even when batch is closed due to
+        exception: changes done within batch before it stay in effect, and
+        without these messages values which depend on them would be stale.
+        """
+        self.__batch_depth += 1
+        try:
+            yield
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__commit_batch()
+
+    @property
+    def msg_stats(self):
+        """Access point for message dispatching stats.
+
+        None if collection of stats is not enabled.
+        """
+        return self.__msg_stats
+
+    def enable_msg_stats(self):
+        """Start collecting message dispatching stats.
+
+        Stats include message counts, handler call counts and handler time per
+        message type and per subscriber class, and message fanout. Collection
+        adds some overhead to every dispatched message.
+
+        Returns:
+            Stats container, which can be used to get snapshot of stats or to
+            reset them.
+        """
+        if self.__msg_stats is None:
+            self.__msg_stats = MsgStats()
+        return self.__msg_stats
+
+    def disable_msg_stats(self):
+        """Stop collecting message dispatching stats."""
+        self.__msg_stats = None
 
     def _subscribe(self, subscriber, msg_types):
         """Register subscriber for passed message types."""
         for msg_type in msg_types:
-            self.__subscribers.setdefault(msg_type, set()).add(subscriber)
+            self.__subscribers.setdefault(msg_type, {})[subscriber] = None
+            self.__compile_dispatch(msg_type)
 
     def _unsubscribe(self, subscriber, msg_types):
         """Unregister subscriber from passed message types."""
@@ -39,21 +122,132 @@ class FitMsgBroker:
                 subscribers = self.__subscribers[msg_type]
             except KeyError:
                 continue
-            subscribers.discard(subscriber)
+            subscribers.pop(subscriber, None)
             if not subscribers:
                 msgtypes_to_remove.add(msg_type)
+            self.__compile_dispatch(msg_type)
         for msg_type in msgtypes_to_remove:
             del self.__subscribers[msg_type]
 
+    def __compile_dispatch(self, msg_type):
+        handlers = []
+        subscriber_classes = []
+        immediate_handlers = []
+        immediate_classes = []
+        deferred_handlers = []
+        deferred_classes = []
+        for subscriber in self.__subscribers.get(msg_type, ()):
+            handler = subscriber._get_msg_handler(msg_type)
+            if handler is not None:
+                handlers.append(handler)
+                subscriber_classes.append(type(subscriber))
+                if subscriber._batch_immediate:
+                    immediate_handlers.append(handler)
+                    immediate_classes.append(type(subscriber))
+                else:
+                    deferred_handlers.append(handler)
+                    deferred_classes.append(type(subscriber))
+        if handlers:
+            self.__dispatch_table[msg_type] = tuple(handlers)
+            self.__dispatch_subscriber_classes[msg_type] = tuple(
+                subscriber_classes)
+        else:
+            self.__dispatch_table.pop(msg_type, None)
+            self.__dispatch_subscriber_classes.pop(msg_type, None)
+        if handlers and msg_type in MERGEABLE_MSG_TYPES:
+            self.__batch_immediate_dispatch[msg_type] = (
+                tuple(immediate_handlers), tuple(immediate_classes))
+            self.__batch_deferred_dispatch[msg_type] = (
+                tuple(deferred_handlers), tuple(deferred_classes))
+        else:
+            self.__batch_immediate_dispatch.pop(msg_type, None)
+            self.__batch_deferred_dispatch.pop(msg_type, None)
+
     def _publish(self, msg):
         """Publish single message."""
-        msg.fit = self
-        for subscriber in self.__subscribers.get(type(msg), ()):
-            subscriber._notify(msg)
+        if self.__batch_depth and type(msg) in MERGEABLE_MSG_TYPES:
+            self.__publish_in_batch(msg)
+            return
+        self.__dispatch(msg)
 
     def _publish_bulk(self, msgs):
-        """Publish multiple messages."""
+        """Publish multiple messages.
+
+        Adjacent messages about attribute changes of the same type are merged
+        into single message before dispatching.
+        """
+        # Attribute change message which can absorb next messages
+        merged_msg = None
+        for msg in msgs:
+            msg_type = type(msg)
+            if msg_type in MERGEABLE_MSG_TYPES:
+                if self.__batch_depth:
+                    self.__publish_in_batch(msg)
+                    continue
+                if merged_msg is not None and type(merged_msg) is msg_type:
+                    merged_msg = self.__merge_attr_changes(merged_msg, msg)
+                    continue
+            if merged_msg is not None:
+                self.__dispatch(merged_msg)
+                merged_msg = None
+            if msg_type in MERGEABLE_MSG_TYPES:
+                merged_msg = msg
+            else:
+                self.__dispatch(msg)
+        if merged_msg is not None:
+            self.__dispatch(merged_msg)
+
+    def __dispatch(self, msg):
+        msg_type = type(msg)
+        self.__dispatch_to(
+            msg, self.__dispatch_table.get(msg_type, ()),
+            self.__dispatch_subscriber_classes.get(msg_type, ()))
+
+    def __dispatch_to(self, msg, handlers, subscriber_classes):
+        msg.fit = self
+        if self.__msg_stats is not None:
+            self.__msg_stats._dispatch(msg, handlers, subscriber_classes)
+            return
+        for handler in handlers:
+            handler(msg)
+
+    @staticmethod
+    def __merge_attr_changes(msg1, msg2):
+        attr_changes = {
+            item: set(attr_ids) for item, attr_ids in msg1.attr_changes.items()}
+        for item, attr_ids in msg2.attr_changes.items():
+            attr_changes.setdefault(item, set()).update(attr_ids)
+        return type(msg1)(attr_changes)
+
+    def __publish_in_batch(self, msg):
+        handlers, subscriber_classes = self.__batch_immediate_dispatch.get(
+            type(msg), ((), ()))
+        if handlers:
+            self.__dispatch_to(msg, handlers, subscriber_classes)
+        self.__defer_attr_changes(msg)
+
+    def __defer_attr_changes(self, msg):
+        attr_changes = self.__batch_attr_changes.setdefault(type(msg), {})
+        for item, attr_ids in msg.attr_changes.items():
+            attr_changes.setdefault(item, set()).update(attr_ids)
+
+    def __commit_batch(self):
+        msgs = []
+        for msg_type in MERGEABLE_MSG_TYPES:
+            try:
+                attr_changes = self.__batch_attr_changes.pop(msg_type)
+            except KeyError:
+                continue
+            # Items could've been removed from the fit within batch, nobody
+            # cares about their attributes anymore
+            attr_changes = {
+                i: a for i, a in attr_changes.items() if i._fit is self}
+            if attr_changes:
+                msgs.append(msg_type(attr_changes))
+        # Subscribers which need attribute changes right away have received
+        # them already
         for msg in msgs:
-            msg.fit = self
-            for subscriber in self.__subscribers.get(type(msg), ()):
-                subscriber._notify(msg)
+            handlers, subscriber_classes = self.__batch_deferred_dispatch.get(
+                type(msg), ((), ()))
+            if handlers:
+                self.__dispatch_to(msg, handlers, subscriber_classes)
@@ -0,0 +1,147 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from time import perf_counter
+
+from .message import AttrsValueChanged
+from .message import AttrsValueChangedMasked
+from .message import DefaultIncomingDmgChanged
+from .message import EffectApplied
+from .message import EffectUnapplied
+from .message import EffectsStarted
+from .message import EffectsStopped
+from .message import FleetFitAdded
+from .message import FleetFitRemoved
+from .message import ItemAdded
+from .message import ItemLoaded
+from .message import ItemRemoved
+from .message import ItemUnloaded
+from .message import RahIncomingDmgChanged
+from .message import StatesActivated
+from .message import StatesActivatedLoaded
+from .message import StatesDeactivated
+from .message import StatesDeactivatedLoaded
+
+
+def _get_single_fanout(_):
+    return 1
+
+
+# Format: {message type: callable which returns size of message payload}
+FANOUT_GETTERS = {
+    AttrsValueChanged: lambda msg: len(msg.attr_changes),
+    AttrsValueChangedMasked: lambda msg: len(msg.attr_changes),
+    DefaultIncomingDmgChanged: _get_single_fanout,
+    RahIncomingDmgChanged: _get_single_fanout,
+    FleetFitAdded: _get_single_fanout,
+    FleetFitRemoved: _get_single_fanout,
+    ItemAdded: _get_single_fanout,
+    ItemRemoved: _get_single_fanout,
+    StatesActivated: lambda msg: len(msg.states),
+    StatesDeactivated: lambda msg: len(msg.states),
+    ItemLoaded: _get_single_fanout,
+    ItemUnloaded: _get_single_fanout,
+    StatesActivatedLoaded: lambda msg: len(msg.states),
+    StatesDeactivatedLoaded: lambda msg: len(msg.states),
+    EffectsStarted: lambda msg: len(msg.effect_ids),
+    EffectsStopped: lambda msg: len(msg.effect_ids),
+    EffectApplied: lambda msg: len(msg.tgt_items),
+    EffectUnapplied: lambda msg: len(msg.tgt_items)}
+
+
+def get_msg_fanout(msg):
+    """Get size of message payload.
+
+    Returns:
+        Quantity of items with changed attributes for attribute change
+        messages, quantity of effects, states or target items for messages
+        which carry them, and 1 for the rest, including messages of unknown
+        types.
+    """
+    return FANOUT_GETTERS.get(type(msg), _get_single_fanout)(msg)
+
+
+class MsgStats:
+    """Accumulates data about message dispatching on a fit.
+
+    All handler times are in seconds, and they include time spent dispatching
+    messages which were published by handlers themselves.
+    """
+
+    def __init__(self):
+        # Format: {message type: [message count, handler calls, time, fanout]}
+        self.__msg_types = {}
+        # Format: {subscriber class: [handler calls, time]}
+        self.__subscribers = {}
+
+    def _record_msg(self, msg):
+        msg_type = type(msg)
+        entry = self.__msg_types.get(msg_type)
+        if entry is None:
+            entry = self.__msg_types[msg_type] = [0, 0, 0.0, 0]
+        entry[0] += 1
+        entry[3] += get_msg_fanout(msg)
+        return entry
+
+    def _record_handler(self, msg_entry, subscriber_cls, handler_time):
+        msg_entry[1] += 1
+        msg_entry[2] += handler_time
+        entry = self.__subscribers.get(subscriber_cls)
+        if entry is None:
+            entry = self.__subscribers[subscriber_cls] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += handler_time
+
+    def _dispatch(self, msg, handlers, subscriber_classes):
+        """Dispatch message to handlers, recording stats along the way."""
+        msg_entry = self._record_msg(msg)
+        for handler, subscriber_cls in zip(handlers, subscriber_classes):
+            started = perf_counter()
+            try:
+                handler(msg)
+            finally:
+                self._record_handler(
+                    msg_entry, subscriber_cls, perf_counter() - started)
+
+    def snapshot(self):
+        """Get copy of accumulated data.
+
+        Returns:
+            Dictionary in {'msg_types': {message type name: {'count': int,
+            'calls': int, 'time': float, 'fanout': int}}, 'subscribers':
+            {subscriber class name: {'calls': int, 'time': float}}} format.
+        """
+        return {
+            'msg_types': {
+                msg_type.__name__: {
+                    'count': count, 'calls': calls, 'time': time,
+                    'fanout': fanout}
+                for msg_type, (count, calls, time, fanout)
+                in self.__msg_types.items()},
+            'subscribers': {
+                subscriber_cls.__name__: {'calls': calls, 'time': time}
+                for subscriber_cls, (calls, time)
+                in self.__subscribers.items()}}
+
+    def reset(self):
+        """Drop all accumulated data."""
+        self.__msg_types.clear()
+        self.__subscribers.clear()
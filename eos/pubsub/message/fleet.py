@@ -24,6 +24,8 @@ from eos.util.repr import make_repr_str
 
 class FleetFitAdded:
 
+    __slots__ = ('fit',)
+
     def __init__(self):
         self.fit = None
 
@@ -34,6 +36,8 @@ class FleetFitAdded:
 
 class FleetFitRemoved:
 
+    __slots__ = ('fit',)
+
     def __init__(self):
         self.fit = None
 
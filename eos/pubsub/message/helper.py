@@ -37,6 +37,17 @@ from .item_loaded import StatesActivatedLoaded
 from .item_loaded import StatesDeactivatedLoaded
 
 
+# Messages never modify state sets they carry, thus the same immutable set
+# can be shared between all messages about the same state range
+# Format: {(exclusive lower state, inclusive upper state): frozenset(states)}
+_state_ranges = {}
+for _low in (None, *State):
+    for _high in State:
+        _state_ranges[(_low, _high)] = frozenset(
+            s for s in State if (_low is None or _low < s) and s <= _high)
+del _low, _high
+
+
 class MsgHelper:
     """Assists with generation of messages."""
 
@@ -47,7 +58,7 @@ class MsgHelper:
         # Item
         msgs.append(ItemAdded(item))
         # States
-        states = {s for s in State if s <= item.state}
+        states = _state_ranges[(None, item.state)]
         msgs.append(StatesActivated(item, states))
         return msgs
 
@@ -56,7 +67,7 @@ class MsgHelper:
         """Generate messages about item being removed."""
         msgs = []
         # States
-        states = {s for s in State if s <= item.state}
+        states = _state_ranges[(None, item.state)]
         msgs.append(StatesDeactivated(item, states))
         # Item
         msgs.append(ItemRemoved(item))
@@ -69,7 +80,7 @@ class MsgHelper:
         # Item
         msgs.append(ItemLoaded(item))
         # States
-        states = {s for s in State if s <= item.state}
+        states = _state_ranges[(None, item.state)]
         msgs.append(StatesActivatedLoaded(item, states))
         # Effects
         msgs.extend(MsgHelper.get_effects_status_update_msgs(item))
@@ -94,7 +105,7 @@ class MsgHelper:
             msgs.append(EffectsStopped(item, copy(running_effect_ids)))
             running_effect_ids.clear()
         # States
-        states = {s for s in State if s <= item.state}
+        states = _state_ranges[(None, item.state)]
         msgs.append(StatesDeactivatedLoaded(item, states))
         # Item
         msgs.append(ItemUnloaded(item))
@@ -106,13 +117,13 @@ class MsgHelper:
         msgs = []
         # State switching upwards
         if new_state > old_state:
-            states = {s for s in State if old_state < s <= new_state}
+            states = _state_ranges[(old_state, new_state)]
             msgs.append(StatesActivated(item, states))
             if item._is_loaded:
                 msgs.append(StatesActivatedLoaded(item, states))
         # State switching downwards
         else:
-            states = {s for s in State if new_state < s <= old_state}
+            states = _state_ranges[(new_state, old_state)]
             if item._is_loaded:
                 msgs.append(StatesDeactivatedLoaded(item, states))
             msgs.append(StatesDeactivated(item, states))
@@ -129,11 +140,8 @@ class MsgHelper:
         which are considered as running.
         """
         # Set of effects which should be running according to new conditions
-        new_running_effect_ids = set()
-        effects_status = EffectStatusResolver.resolve_effects_status(item)
-        for effect_id, status in effects_status.items():
-            if status:
-                new_running_effect_ids.add(effect_id)
+        new_running_effect_ids = (
+            EffectStatusResolver.resolve_running_effect_ids(item))
         start_ids = new_running_effect_ids.difference(item._running_effect_ids)
         stop_ids = item._running_effect_ids.difference(new_running_effect_ids)
         msgs = []
@@ -26,6 +26,10 @@ from abc import abstractmethod
 class BaseSubscriber(metaclass=ABCMeta):
     """Base class for subscribers."""
 
+    # Subscribers which keep attribute values consistent receive attribute
+    # change messages right away, even when they are published within batch
+    _batch_immediate = False
+
     @property
     @abstractmethod
     def _handler_map(self):
@@ -37,3 +41,20 @@ class BaseSubscriber(metaclass=ABCMeta):
         except KeyError:
             return
         handler(self, msg)
+
+    def _get_msg_handler(self, msg_type):
+        """Get callable which should receive messages of passed type.
+
+        Returns:
+            Callable which accepts message, or None if subscriber does not
+            handle messages of passed type.
+        """
+        # If subscriber customizes how messages are received, it should get
+        # all of them
+        if type(self)._notify is not BaseSubscriber._notify:
+            return self._notify
+        try:
+            handler = self._handler_map[msg_type]
+        except KeyError:
+            return None
+        return handler.__get__(self)
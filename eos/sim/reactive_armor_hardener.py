@@ -488,6 +488,10 @@ class ReactiveArmorHardenerSimulator(BaseSubscriber):
         AttrsValueChangedMasked: _handle_attr_changed_masked,
         RahIncomingDmgChanged: _handle_changed_dmg_profile}
 
+    # Simulation results are cleared as soon as attributes they depend on
+    # change, including changes done within batch
+    _batch_immediate = True
+
     def _notify(self, msg):
         # Do not react to messages while sim is running
         if self.__running is True:
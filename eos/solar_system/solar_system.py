@@ -21,6 +21,7 @@
 
 from math import sqrt
 
+from eos.calculator.misc import get_attr_metadata_map
 from eos.calculator.service import CalculationService
 from eos.const.eve import AttrId
 from eos.source import Source
@@ -42,6 +43,8 @@ class SolarSystem:
 
     def __init__(self, source=DEFAULT):
         self.__source = None
+        # Attribute metadata of current source, used by attribute maps
+        self._attr_metadata = None
         self._calculator = CalculationService(self)
         self.fits = FitSet(self)
         # Initialize defaults
@@ -70,7 +73,10 @@ class SolarSystem:
             for fit in self.fits:
                 fit._unload_items()
         self.__source = new_source
+        self._attr_metadata = None
         if new_source is not None:
+            self._attr_metadata = get_attr_metadata_map(
+                new_source.cache_handler)
             for fit in self.fits:
                 fit._load_items()
 
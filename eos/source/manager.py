@@ -19,9 +19,11 @@
 # ==============================================================================
 
 
+from contextlib import ExitStack
 from logging import getLogger
 
 from eos import __version__ as eos_version
+from eos.eve_obj_builder import BuildState
 from eos.eve_obj_builder import EveObjBuilder
 from eos.util.repr import make_repr_str
 from .exception import ExistingSourceError
@@ -47,7 +49,9 @@ class SourceManager:
     default = None
 
     @classmethod
-    def add(cls, alias, data_handler, cache_handler, make_default=False):
+    def add(
+            cls, alias, data_handler, cache_handler, make_default=False,
+            build_state_path=None, build_workers=None):
         """Add source to source manager.
 
         Adding includes initializing all facilities hidden behind name 'source'.
@@ -60,11 +64,35 @@ class SourceManager:
             make_default (optional): Do we need to mark passed source as default
                 or not. Default source will be used for instantiating new fits,
                 if no other source is specified.
+            build_state_path (optional): Path to file where results of eve
+                object building are stored. When specified, they are used to
+                rebuild only objects whose source data has changed.
+            build_workers (optional): Quantity of worker processes used to
+                build eve objects. By default, they are built in current
+                process.
         """
         logger.info('adding source with alias "{}"'.format(alias))
         if alias in cls._sources:
             raise ExistingSourceError(alias)
 
+        # Data fetched within session can be reused by data handler, and is
+        # released when cache is up to date. Data handlers are not required to
+        # support sessions
+        with ExitStack() as stack:
+            if getattr(data_handler, '__enter__', None) is not None:
+                stack.enter_context(data_handler)
+            cls.__update_cache(
+                data_handler, cache_handler, build_state_path, build_workers)
+
+        # Finally, add record to list of sources
+        source = Source(alias=alias, cache_handler=cache_handler)
+        cls._sources[alias] = source
+        if make_default is True:
+            cls.default = source
+
+    @classmethod
+    def __update_cache(
+            cls, data_handler, cache_handler, build_state_path, build_workers):
         # Compare fingerprints from data and cache
         cache_fp = cache_handler.get_fingerprint()
         data_version = data_handler.get_version()
@@ -83,14 +111,15 @@ class SourceManager:
 
             # Generate eve objects and cache them, as generation takes
             # significant amount of time
-            eve_objects = EveObjBuilder.run(data_handler)
+            if build_state_path is None:
+                build_state = None
+            else:
+                build_state = BuildState.load(build_state_path)
+            eve_objects = EveObjBuilder.run(
+                data_handler, build_state, build_workers)
             cache_handler.update_cache(eve_objects, current_fp)
-
-        # Finally, add record to list of sources
-        source = Source(alias=alias, cache_handler=cache_handler)
-        cls._sources[alias] = source
-        if make_default is True:
-            cls.default = source
+            if build_state is not None:
+                build_state.save(build_state_path)
 
     @classmethod
     def get(cls, alias):
@@ -28,6 +28,8 @@ with further modifications by me.
 
 class frozendict(dict):
 
+    __slots__ = ('__hash',)
+
     def __init__(self, *args, **kwargs):
         dict.__init__(self, *args, **kwargs)
         self.__hash = None
@@ -39,6 +41,9 @@ class frozendict(dict):
     __delitem__ = __setitem__ = clear = pop = popitem = setdefault = update = (
         __blocked_attr)
 
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
     def __hash__(self):
         if self.__hash is None:
             self.__hash = hash(frozenset(self.items()))
@@ -23,5 +23,6 @@ setup(
     author_email='',
     url='https://github.com/pyfa-org/eos',
     packages=find_packages(exclude=['tests', 'tests.*']),
+    python_requires='>=3.7',
     install_requires=install_requires
 )
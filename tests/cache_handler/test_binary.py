@@ -0,0 +1,149 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import pytest
+
+from eos.cache_handler import AttrFetchError
+from eos.cache_handler import BinaryCacheHandler
+from eos.cache_handler import BuffTemplatesFetchError
+from eos.cache_handler import EffectFetchError
+from eos.cache_handler import TypeFetchError
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModAggregateMode
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.buff_template import WarfareBuffTemplate
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import TypeFactory
+
+
+@pytest.fixture
+def eve_objects():
+    modifier = DogmaModifier(
+        affectee_filter=ModAffecteeFilter.item,
+        affectee_domain=ModDomain.self,
+        affectee_attr_id=2,
+        operator=ModOperator.post_mul,
+        affector_attr_id=1)
+    effect = EffectFactory.make(
+        effect_id=11, category_id=0, modifiers=(modifier,))
+    item_type = TypeFactory.make(
+        type_id=21, group_id=31, category_id=41, attrs={1: 5.5, 2: 10},
+        effects=(effect,), default_effect=effect,
+        abilities_data={5: (30, 2)}, required_skills={51: 3})
+    attrs = (
+        AttrFactory.make(attr_id=1, default_value=1.0, high_is_good=True),
+        AttrFactory.make(attr_id=2, max_attr_id=1, stackable=False))
+    buff_template = WarfareBuffTemplate(
+        buff_id=61,
+        affectee_filter=ModAffecteeFilter.domain,
+        affectee_attr_id=2,
+        operator=ModOperator.post_percent,
+        aggregate_mode=ModAggregateMode.stack)
+    return (item_type,), attrs, (effect,), (buff_template,)
+
+
+@pytest.fixture
+def cache_path(tmpdir):
+    return str(tmpdir.join('cache', 'eos_tq.bin'))
+
+
+def test_roundtrip(eve_objects, cache_path):
+    BinaryCacheHandler(cache_path).update_cache(eve_objects, 'fp')
+    cache_handler = BinaryCacheHandler(cache_path)
+
+    assert cache_handler.get_fingerprint() == 'fp'
+    item_type = cache_handler.get_type(21)
+    assert item_type.group_id == 31
+    assert item_type.category_id == 41
+    assert item_type.attrs == {1: 5.5, 2: 10}
+    assert item_type.abilities_data[5].cooldown_time == 30
+    assert item_type.required_skills == {51: 3}
+    effect = cache_handler.get_effect(11)
+    assert item_type.effects == {11: effect}
+    assert item_type.default_effect is effect
+    assert len(effect.modifiers) == 1
+    modifier = effect.modifiers[0]
+    assert modifier.affectee_filter == ModAffecteeFilter.item
+    assert modifier.operator == ModOperator.post_mul
+    assert modifier.affector_attr_id == 1
+    attr = cache_handler.get_attr(2)
+    assert attr.max_attr_id == 1
+    assert attr.stackable is False
+    buff_templates = cache_handler.get_buff_templates(61)
+    assert len(buff_templates) == 1
+    buff_template = next(iter(buff_templates))
+    assert buff_template.operator == ModOperator.post_percent
+
+
+def test_decoded_once(eve_objects, cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    cache_handler.update_cache(eve_objects, 'fp')
+
+    assert cache_handler.get_type(21) is cache_handler.get_type(21)
+    assert cache_handler.get_attr(1) is cache_handler.get_attr(1)
+    assert cache_handler.get_effect(11) is cache_handler.get_effect(11)
+
+
+def test_type_evicted_reused(eve_objects, cache_path):
+    cache_handler = BinaryCacheHandler(cache_path, type_cache_size=0)
+    cache_handler.update_cache(eve_objects, 'fp')
+
+    # Evicted type is still returned while it's referenced
+    item_type = cache_handler.get_type(21)
+    assert cache_handler.get_type(21) is item_type
+
+
+def test_fetch_errors(eve_objects, cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+    cache_handler.update_cache(eve_objects, 'fp')
+
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(22)
+    with pytest.raises(AttrFetchError):
+        cache_handler.get_attr(3)
+    with pytest.raises(EffectFetchError):
+        cache_handler.get_effect(12)
+    with pytest.raises(BuffTemplatesFetchError):
+        cache_handler.get_buff_templates(62)
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(None)
+
+
+def test_no_file(cache_path):
+    cache_handler = BinaryCacheHandler(cache_path)
+
+    assert cache_handler.get_fingerprint() is None
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(21)
+
+
+def test_malformed_file(tmpdir, caplog):
+    cache_path = str(tmpdir.join('eos_tq.bin'))
+    with open(cache_path, 'wb') as file:
+        file.write(b'garbage')
+
+    cache_handler = BinaryCacheHandler(cache_path)
+
+    assert cache_handler.get_fingerprint() is None
+    assert 'error during reading cache' in caplog.text
@@ -0,0 +1,125 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import pytest
+
+from eos.cache_handler import JsonCacheHandler
+from eos.cache_handler import MmapCacheHandler
+from eos.cache_handler import TypeFetchError
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.type import TypeFactory
+
+
+@pytest.fixture
+def eve_objects():
+    effect = EffectFactory.make(effect_id=11, category_id=0)
+    item_types = (
+        TypeFactory.make(
+            type_id=21, attrs={7: 5.5, 2: 10, 300: 0.0, 301: True},
+            effects=(effect,), default_effect=effect),
+        TypeFactory.make(type_id=22, attrs={2: 3}),
+        TypeFactory.make(type_id=23))
+    return item_types, (), (effect,), ()
+
+
+@pytest.fixture
+def cache_handler(eve_objects, tmpdir):
+    cache_path = str(tmpdir.join('eos_tq.mmap'))
+    MmapCacheHandler(cache_path).update_cache(eve_objects, 'fp')
+    return MmapCacheHandler(cache_path)
+
+
+def test_type_attrs(cache_handler):
+    attrs = cache_handler.get_type(21).attrs
+    assert attrs == {2: 10, 7: 5.5, 300: 0.0, 301: True}
+    assert len(attrs) == 4
+    assert list(attrs) == [2, 7, 300, 301]
+    assert attrs[7] == 5.5
+    # Integer values are kept integer
+    assert type(attrs[2]) is int
+    assert attrs[301] is True
+    assert 300 in attrs
+    assert 8 not in attrs
+    assert attrs.get(8) is None
+    assert attrs.get(None) is None
+    with pytest.raises(KeyError):
+        attrs[1]
+
+
+def test_type_attrs_spans(cache_handler):
+    assert cache_handler.get_type(22).attrs == {2: 3}
+    assert cache_handler.get_type(23).attrs == {}
+
+
+def test_type_attrs_read_only(cache_handler):
+    attrs = cache_handler.get_type(21).attrs
+    with pytest.raises(TypeError):
+        attrs[2] = 11
+
+
+def test_type(cache_handler):
+    item_type = cache_handler.get_type(21)
+    assert cache_handler.get_fingerprint() == 'fp'
+    assert item_type.default_effect is cache_handler.get_effect(11)
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(24)
+
+
+def test_update(eve_objects, tmpdir):
+    cache_handler = MmapCacheHandler(str(tmpdir.join('eos_tq.mmap')))
+    assert cache_handler.get_fingerprint() is None
+
+    cache_handler.update_cache(eve_objects, 'fp')
+
+    assert cache_handler.get_fingerprint() == 'fp'
+    assert cache_handler.get_type(22).attrs == {2: 3}
+
+
+def test_type_attrs_match_json(eve_objects, cache_handler, tmpdir):
+    json_cache_handler = JsonCacheHandler(str(tmpdir.join('eos_tq.json.bz2')))
+    json_cache_handler.update_cache(eve_objects, 'fp')
+    for type_id in (21, 22, 23):
+        json_attrs = json_cache_handler.get_type(type_id).attrs
+        attrs = cache_handler.get_type(type_id).attrs
+        assert dict(attrs) == json_attrs
+        for attr_id, value in json_attrs.items():
+            assert type(attrs[attr_id]) is type(value)
+
+
+def test_update_closes_mapping(eve_objects, cache_handler):
+    mapped = cache_handler._BinaryCacheHandler__data.obj
+
+    cache_handler.update_cache(eve_objects, 'fp2')
+
+    assert mapped.closed
+    assert cache_handler.get_type(21).attrs[7] == 5.5
+
+
+def test_update_keeps_used_types(eve_objects, cache_handler):
+    item_type = cache_handler.get_type(21)
+    mapped = cache_handler._BinaryCacheHandler__data.obj
+
+    cache_handler.update_cache(eve_objects, 'fp2')
+
+    # Mapping is still referred by item type composed from it
+    assert not mapped.closed
+    assert item_type.attrs[7] == 5.5
+    assert cache_handler.get_type(21) is not item_type
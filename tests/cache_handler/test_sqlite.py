@@ -0,0 +1,214 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import sqlite3
+
+import pytest
+
+from eos.cache_handler import AttrFetchError
+from eos.cache_handler import BuffTemplatesFetchError
+from eos.cache_handler import EffectFetchError
+from eos.cache_handler import SQLiteCacheHandler
+from eos.cache_handler import TypeFetchError
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModAggregateMode
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.eve_obj.attribute import AttrFactory
+from eos.eve_obj.buff_template import WarfareBuffTemplate
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.modifier import DogmaModifier
+from eos.eve_obj.type import TypeFactory
+
+
+@pytest.fixture
+def eve_objects():
+    modifier1 = DogmaModifier(
+        affectee_filter=ModAffecteeFilter.item,
+        affectee_domain=ModDomain.self,
+        affectee_attr_id=2,
+        operator=ModOperator.post_mul,
+        affector_attr_id=1)
+    modifier2 = DogmaModifier(
+        affectee_filter=ModAffecteeFilter.domain,
+        affectee_domain=ModDomain.ship,
+        affectee_attr_id=1,
+        operator=ModOperator.pre_assign,
+        affector_attr_id=2)
+    effect = EffectFactory.make(
+        effect_id=11, category_id=0, is_offensive=True,
+        modifiers=(modifier1, modifier2))
+    item_type = TypeFactory.make(
+        type_id=21, group_id=31, category_id=41,
+        attrs={1: 5.5, 2: 10, 3: True, 4: 0},
+        effects=(effect,), default_effect=effect,
+        abilities_data={5: (30, 2)}, required_skills={51: 3})
+    attrs = (
+        AttrFactory.make(attr_id=1, default_value=1.0, high_is_good=False),
+        AttrFactory.make(attr_id=2, max_attr_id=1, stackable=False))
+    buff_templates = (
+        WarfareBuffTemplate(
+            buff_id=61,
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_attr_id=2,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack),
+        WarfareBuffTemplate(
+            buff_id=61,
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_attr_id=1,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.stack))
+    return (item_type,), attrs, (effect,), buff_templates
+
+
+@pytest.fixture
+def cache_path(tmpdir):
+    return str(tmpdir.join('cache', 'eos_tq.sqlite'))
+
+
+def test_roundtrip(eve_objects, cache_path):
+    SQLiteCacheHandler(cache_path).update_cache(eve_objects, 'fp')
+    cache_handler = SQLiteCacheHandler(cache_path)
+
+    assert cache_handler.get_fingerprint() == 'fp'
+    item_type = cache_handler.get_type(21)
+    assert item_type.group_id == 31
+    assert item_type.category_id == 41
+    assert item_type.attrs == {1: 5.5, 2: 10, 3: True, 4: 0}
+    assert type(item_type.attrs[2]) is int
+    assert type(item_type.attrs[3]) is bool
+    assert type(item_type.attrs[4]) is int
+    assert item_type.abilities_data[5].charge_quantity == 2
+    assert item_type.required_skills == {51: 3}
+    effect = cache_handler.get_effect(11)
+    assert item_type.effects == {11: effect}
+    assert item_type.default_effect is effect
+    assert effect.is_offensive is True
+    assert len(effect.modifiers) == 2
+    assert effect.modifiers[0].operator == ModOperator.post_mul
+    assert effect.modifiers[1].operator == ModOperator.pre_assign
+    attr = cache_handler.get_attr(1)
+    assert attr.default_value == 1.0
+    assert attr.high_is_good is False
+    assert cache_handler.get_attr(2).max_attr_id == 1
+    assert len(cache_handler.get_buff_templates(61)) == 2
+
+
+def test_reused(eve_objects, cache_path):
+    cache_handler = SQLiteCacheHandler(cache_path, obj_cache_size=0)
+    cache_handler.update_cache(eve_objects, 'fp')
+
+    item_type = cache_handler.get_type(21)
+    assert cache_handler.get_type(21) is item_type
+
+
+def test_update_replaces(eve_objects, cache_path):
+    cache_handler = SQLiteCacheHandler(cache_path)
+    cache_handler.update_cache(eve_objects, 'fp1')
+    cache_handler.update_cache(((), (), (), ()), 'fp2')
+
+    assert cache_handler.get_fingerprint() == 'fp2'
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(21)
+
+
+def test_fetch_errors(eve_objects, cache_path):
+    cache_handler = SQLiteCacheHandler(cache_path)
+    cache_handler.update_cache(eve_objects, 'fp')
+
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(22)
+    with pytest.raises(AttrFetchError):
+        cache_handler.get_attr(3)
+    with pytest.raises(EffectFetchError):
+        cache_handler.get_effect(12)
+    with pytest.raises(BuffTemplatesFetchError):
+        cache_handler.get_buff_templates(62)
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(None)
+
+
+def test_empty(cache_path):
+    cache_handler = SQLiteCacheHandler(cache_path)
+
+    assert cache_handler.get_fingerprint() is None
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(21)
+
+
+def test_fingerprint_kept_in_memory(eve_objects, cache_path):
+    cache_handler = SQLiteCacheHandler(cache_path)
+    cache_handler.update_cache(eve_objects, 'fp')
+    cache_handler.close()
+    # Fingerprint does not need database connection
+    assert cache_handler.get_fingerprint() == 'fp'
+
+
+def test_query_errors_propagate(eve_objects, cache_path):
+    cache_handler = SQLiteCacheHandler(cache_path)
+    cache_handler.update_cache(eve_objects, 'fp')
+    # Break database under the handler
+    conn = sqlite3.connect(cache_path)
+    conn.execute('DROP TABLE types')
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(sqlite3.OperationalError):
+        cache_handler.get_type(21)
+
+
+def test_partial_schema(cache_path):
+    SQLiteCacheHandler(cache_path).close()
+    conn = sqlite3.connect(cache_path)
+    conn.execute('CREATE TABLE metadata (field_name, field_value)')
+    conn.commit()
+    conn.close()
+    cache_handler = SQLiteCacheHandler(cache_path)
+
+    assert cache_handler.get_fingerprint() is None
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(21)
+
+
+def test_old_schema(eve_objects, cache_path):
+    SQLiteCacheHandler(cache_path).update_cache(eve_objects, 'fp')
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        "UPDATE metadata SET field_value = 1 "
+        "WHERE field_name = 'schema_version'")
+    conn.commit()
+    conn.close()
+    cache_handler = SQLiteCacheHandler(cache_path)
+
+    # Cache stored using old schema is considered empty, to get it rebuilt
+    assert cache_handler.get_fingerprint() is None
+    with pytest.raises(TypeFetchError):
+        cache_handler.get_type(21)
+
+
+def test_context_manager(eve_objects, cache_path):
+    with SQLiteCacheHandler(cache_path) as cache_handler:
+        cache_handler.update_cache(eve_objects, 'fp')
+        assert cache_handler.get_type(21).id == 21
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        cache_handler.get_attr(1)
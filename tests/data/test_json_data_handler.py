@@ -0,0 +1,87 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from eos import JsonDataHandler
+
+
+@pytest.fixture
+def data_handler(tmpdir):
+    files = {
+        ('fsd_built', 'typedogma'): {
+            '1': {
+                'dogmaAttributes': [{'attributeID': 5, 'value': 10.0}],
+                'dogmaEffects': [{'effectID': 11, 'isDefault': 1}]}},
+        ('fsd_built', 'types'): {'1': {'typeID': 1, 'groupID': 2}},
+        ('phobos', 'metadata'): [
+            {'field_name': 'client_build', 'field_value': 1000}]}
+    for (miner, filename), data in files.items():
+        dirpath = os.path.join(str(tmpdir), miner)
+        os.makedirs(dirpath, exist_ok=True)
+        filepath = os.path.join(dirpath, '{}.json'.format(filename))
+        with open(filepath, mode='w', encoding='utf8') as file:
+            json.dump(data, file)
+    return JsonDataHandler(str(tmpdir))
+
+
+def test_rows(data_handler):
+    assert list(data_handler.get_evetypes()) == [{'typeID': 1, 'groupID': 2}]
+    assert list(data_handler.get_dgmtypeattribs()) == [
+        {'typeID': 1, 'attributeID': 5, 'value': 10.0}]
+    assert list(data_handler.get_dgmtypeeffects()) == [
+        {'typeID': 1, 'effectID': 11, 'isDefault': True}]
+    assert data_handler.get_version() == 1000
+
+
+def test_session_parses_once(data_handler):
+    with patch('json.load', wraps=json.load) as json_load:
+        with data_handler:
+            list(data_handler.get_dgmtypeattribs())
+            list(data_handler.get_dgmtypeeffects())
+            assert json_load.call_count == 1
+        # Parsed files are released when session ends
+        list(data_handler.get_dgmtypeattribs())
+        assert json_load.call_count == 2
+
+
+def test_nested_session(data_handler):
+    with patch('json.load', wraps=json.load) as json_load:
+        with data_handler:
+            list(data_handler.get_dgmtypeattribs())
+            with data_handler:
+                list(data_handler.get_dgmtypeeffects())
+            # Parsed files are kept until outermost session ends
+            list(data_handler.get_dgmtypeattribs())
+            assert json_load.call_count == 1
+        list(data_handler.get_dgmtypeattribs())
+        assert json_load.call_count == 2
+
+
+def test_no_session_parses_each_time(data_handler):
+    with patch('json.load', wraps=json.load) as json_load:
+        list(data_handler.get_dgmtypeattribs())
+        list(data_handler.get_dgmtypeeffects())
+        assert json_load.call_count == 2
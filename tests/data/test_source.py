@@ -97,6 +97,27 @@ def test_add_fingerprint_mismatch(
     assert log_msg in caplog.text
 
 
+def test_add_data_handler_without_session(mock_cache_handler, monkeypatch):
+    monkeypatch.setattr(
+        'eos.source.manager.EveObjBuilder.run',
+        Mock(return_value=((), (), (), ())))
+    # Data handler which does not support context manager protocol
+    data_handler = Mock(spec=('get_version',))
+    data_handler.get_version.return_value = None
+
+    SourceManager.add('test', data_handler, mock_cache_handler)
+
+    assert 'test' in SourceManager._sources
+    assert mock_cache_handler.update_cache.called
+
+
+def test_add_data_handler_session(mock_data_handler, mock_cache_handler):
+    SourceManager.add('test', mock_data_handler, mock_cache_handler)
+
+    assert mock_data_handler.__enter__.called
+    assert mock_data_handler.__exit__.called
+
+
 def test_removing_known_source(mock_data_handler, mock_cache_handler):
     SourceManager.add('test', mock_data_handler, mock_cache_handler)
     SourceManager.remove('test')
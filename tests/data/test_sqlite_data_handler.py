@@ -0,0 +1,163 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import os
+import pickle
+import sqlite3
+
+import pytest
+
+from eos import SQLiteDataHandler
+from eos.const.eve import TypeCategoryId
+from eos.eve_obj_builder import EveObjBuilder
+
+
+SCHEMA = (
+    'CREATE TABLE evetypes (typeID INTEGER, groupID INTEGER)',
+    'CREATE TABLE evegroups (groupID INTEGER, categoryID INTEGER)',
+    'CREATE TABLE dgmattribs (attributeID INTEGER, stackable BOOLEAN)',
+    'CREATE TABLE dgmtypeattribs '
+    '(typeID INTEGER, attributeID INTEGER, value REAL)',
+    'CREATE TABLE dgmeffects '
+    '(effectID INTEGER, effectCategory INTEGER, modifierInfo JSON)',
+    'CREATE TABLE dgmtypeeffects '
+    '(typeID INTEGER, effectID INTEGER, isDefault BOOLEAN)',
+    'CREATE TABLE dbuffcollections '
+    '(buffID INTEGER, operationName TEXT, aggregateMode TEXT, '
+    'itemModifiers JSON)',
+    'CREATE TABLE skillreqs (typeID INTEGER, skillTypeID INTEGER, '
+    'level INTEGER)',
+    'CREATE TABLE typefighterabils (typeID INTEGER, abilityID INTEGER)',
+    'CREATE TABLE phbmetadata (field_name TEXT, field_value TEXT)')
+
+
+@pytest.fixture
+def db_path(tmpdir):
+    path = os.path.join(str(tmpdir), 'eve.db')
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany('INSERT INTO evetypes VALUES (?, ?)', ((1, 6), (2, 50)))
+    conn.executemany(
+        'INSERT INTO evegroups VALUES (?, ?)',
+        ((6, TypeCategoryId.ship), (50, 99)))
+    conn.execute('INSERT INTO dgmattribs VALUES (5, 1)')
+    conn.executemany(
+        'INSERT INTO dgmtypeattribs VALUES (?, ?, ?)',
+        ((1, 5, 10.0), (2, 5, 20.0)))
+    conn.execute(
+        'INSERT INTO dgmeffects VALUES (11, 0, ?)',
+        ('[{"func": "ItemModifier", "domain": "shipID", '
+         '"modifiedAttributeID": 5, "modifyingAttributeID": 5, '
+         '"operation": 6}]',))
+    conn.executemany(
+        'INSERT INTO dgmtypeeffects VALUES (?, ?, ?)',
+        ((1, 11, 1), (2, 11, 0)))
+    conn.execute(
+        'INSERT INTO dbuffcollections VALUES (10, ?, ?, ?)',
+        ('PostPercent', 'Maximum', '[{"dogmaAttributeID": 5}]'))
+    conn.executemany(
+        'INSERT INTO skillreqs VALUES (?, ?, ?)', ((1, 3, 1), (2, 3, 2)))
+    conn.execute('INSERT INTO typefighterabils VALUES (2, 1)')
+    conn.execute("INSERT INTO phbmetadata VALUES ('client_build', '1000')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_rows(db_path):
+    data_handler = SQLiteDataHandler(db_path)
+    assert list(data_handler.get_dgmattribs()) == [
+        {'attributeID': 5, 'stackable': True}]
+    assert list(data_handler.get_dgmeffects()) == [{
+        'effectID': 11, 'effectCategory': 0, 'modifierInfo': [{
+            'func': 'ItemModifier', 'domain': 'shipID',
+            'modifiedAttributeID': 5, 'modifyingAttributeID': 5,
+            'operation': 6}]}]
+    assert list(data_handler.get_dbuffcollections()) == [{
+        'buffID': 10, 'operationName': 'PostPercent',
+        'aggregateMode': 'Maximum',
+        'itemModifiers': [{'dogmaAttributeID': 5}]}]
+    assert len(list(data_handler.get_skillreqs())) == 2
+    assert list(data_handler.get_typefighterabils()) == [
+        {'typeID': 2, 'abilityID': 1}]
+    assert data_handler.get_version() == '1000'
+
+
+def test_json_null(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute('INSERT INTO dgmeffects VALUES (12, 0, NULL)')
+    conn.commit()
+    conn.close()
+    data_handler = SQLiteDataHandler(db_path)
+    assert list(data_handler.get_dgmeffects())[1] == {
+        'effectID': 12, 'effectCategory': 0, 'modifierInfo': None}
+
+
+def test_json_converter_not_registered(db_path):
+    data_handler = SQLiteDataHandler(db_path)
+    list(data_handler.get_dgmeffects())
+    # Other connections which detect declared types get JSON text as is
+    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    modifier_info, = conn.execute(
+        'SELECT modifierInfo FROM dgmeffects').fetchone()
+    conn.close()
+    assert isinstance(modifier_info, str)
+
+
+def test_streaming(db_path):
+    data_handler = SQLiteDataHandler(db_path)
+    types = data_handler.get_evetypes()
+    type_attrs = data_handler.get_dgmtypeattribs()
+    assert next(types) == {'typeID': 1, 'groupID': 6}
+    assert next(type_attrs) == {'typeID': 1, 'attributeID': 5, 'value': 10.0}
+    assert next(types) == {'typeID': 2, 'groupID': 50}
+    assert next(type_attrs) == {'typeID': 2, 'attributeID': 5, 'value': 20.0}
+
+
+def test_prefilter(db_path):
+    data_handler = SQLiteDataHandler(db_path, prefilter=True)
+    assert list(data_handler.get_evetypes()) == [{'typeID': 1, 'groupID': 6}]
+    assert list(data_handler.get_dgmtypeattribs()) == [
+        {'typeID': 1, 'attributeID': 5, 'value': 10.0}]
+    assert list(data_handler.get_dgmtypeeffects()) == [
+        {'typeID': 1, 'effectID': 11, 'isDefault': True}]
+    assert list(data_handler.get_skillreqs()) == [
+        {'typeID': 1, 'skillTypeID': 3, 'level': 1}]
+    assert list(data_handler.get_typefighterabils()) == []
+    assert len(list(data_handler.get_evegroups())) == 2
+
+
+def test_pickle(db_path):
+    data_handler = SQLiteDataHandler(db_path, prefilter=True)
+    data_handler.get_version()
+    data_handler = pickle.loads(pickle.dumps(data_handler))
+    assert data_handler.prefilter is True
+    assert data_handler.get_version() == '1000'
+
+
+def test_builder(db_path):
+    types, attrs, effects, buff_templates = EveObjBuilder.run(
+        SQLiteDataHandler(db_path))
+    assert [t.id for t in types] == [1]
+    assert types[0].attrs == {5: 10.0}
+    assert [e.id for e in effects] == [11]
+    assert len(effects[0].modifiers) == 1
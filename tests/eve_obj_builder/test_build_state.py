@@ -0,0 +1,143 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from eos.eve_obj_builder import BuildState
+from tests.eve_obj_builder.testcase import EveObjBuilderTestCase
+
+
+class TestBuildState(EveObjBuilderTestCase):
+    """Results of previous build should be reused where possible."""
+
+    def setUp(self):
+        EveObjBuilderTestCase.setUp(self)
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 1})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 11})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 2, 'effectID': 22})
+        self.dh.data['dgmeffects'].append({'effectID': 11, 'effectCategory': 0})
+        self.dh.data['dgmeffects'].append({'effectID': 22, 'effectCategory': 0})
+        self.build_state = BuildState()
+
+    def get_log(self, name='eos.eve_obj_builder.builder'):
+        return EveObjBuilderTestCase.get_log(self, name=name)
+
+    def run_builder(self):
+        EveObjBuilderTestCase.run_builder(self, build_state=self.build_state)
+
+    @patch('eos.eve_obj_builder.converter.ModBuilder')
+    def test_unchanged(self, mod_builder):
+        mod_builder.return_value.build.return_value = ([], 1)
+        self.run_builder()
+        types = self.types
+        effects = self.effects
+        self.run_builder()
+        self.assertEqual(mod_builder.return_value.build.call_count, 2)
+        self.assertIs(self.types[1], types[1])
+        self.assertIs(self.types[2], types[2])
+        self.assertIs(self.effects[11], effects[11])
+        self.assertIs(self.effects[22], effects[22])
+        self.assertEqual(
+            self.log[-1].msg, 'source data did not change, reusing eve objects')
+
+    @patch('eos.eve_obj_builder.converter.ModBuilder')
+    def test_effect_changed(self, mod_builder):
+        mod_builder.return_value.build.return_value = ([], 1)
+        self.run_builder()
+        types = self.types
+        effects = self.effects
+        self.dh.data['dgmeffects'][1] = {'effectID': 22, 'effectCategory': 1}
+        self.run_builder()
+        # Only changed effect is passed to modifier builder again
+        self.assertEqual(mod_builder.return_value.build.call_count, 3)
+        self.assertIs(self.effects[11], effects[11])
+        self.assertIsNot(self.effects[22], effects[22])
+        self.assertEqual(self.effects[22].category_id, 1)
+        self.assertIs(self.types[1], types[1])
+        # Type which refers changed effect has to be converted again
+        self.assertIsNot(self.types[2], types[2])
+        self.assertIs(self.types[2].effects[22], self.effects[22])
+        self.assertEqual(
+            self.log[-1].msg, 'changed tables: dgmeffects')
+
+    @patch('eos.eve_obj_builder.converter.ModBuilder')
+    def test_type_changed(self, mod_builder):
+        mod_builder.return_value.build.return_value = ([], 1)
+        self.run_builder()
+        types = self.types
+        effects = self.effects
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 5, 'value': 10.0})
+        self.dh.data['dgmattribs'].append({'attributeID': 5})
+        self.run_builder()
+        self.assertEqual(mod_builder.return_value.build.call_count, 2)
+        self.assertIs(self.effects[11], effects[11])
+        self.assertIs(self.effects[22], effects[22])
+        self.assertIsNot(self.types[1], types[1])
+        self.assertEqual(self.types[1].attrs, {5: 10.0})
+        self.assertIs(self.types[2], types[2])
+
+    @patch('eos.eve_obj_builder.converter.ModBuilder')
+    def test_persistence(self, mod_builder):
+        mod_builder.return_value.build.return_value = ([], 1)
+        self.run_builder()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'build_state')
+            self.build_state.save(path)
+            self.build_state = BuildState.load(path)
+        self.dh.data['dgmeffects'][1] = {'effectID': 22, 'effectCategory': 1}
+        self.run_builder()
+        self.assertEqual(mod_builder.return_value.build.call_count, 3)
+        self.assertEqual(self.effects[11].category_id, 0)
+        self.assertEqual(self.effects[22].category_id, 1)
+        self.assertEqual(len(self.types), 2)
+
+    @patch('eos.eve_obj_builder.converter.ModBuilder')
+    def test_version_mismatch(self, mod_builder):
+        mod_builder.return_value.build.return_value = ([], 1)
+        self.run_builder()
+        types = self.types
+        effects = self.effects
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'build_state')
+            self.build_state.save(path)
+            with patch(
+                'eos.eve_obj_builder.build_state.BUILDER_FORMAT_VERSION', 0
+            ):
+                self.build_state = BuildState.load(path)
+        self.assertEqual(self.build_state.table_hashes, {})
+        self.assertIsNone(self.build_state.eve_objects)
+        self.run_builder()
+        # Everything is built anew, despite source data being the same
+        self.assertEqual(mod_builder.return_value.build.call_count, 4)
+        self.assertIsNot(self.types[1], types[1])
+        self.assertIsNot(self.types[2], types[2])
+        self.assertIsNot(self.effects[11], effects[11])
+        self.assertIsNot(self.effects[22], effects[22])
+
+    def test_load_missing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            build_state = BuildState.load(os.path.join(tmpdir, 'missing'))
+        self.assertEqual(build_state.table_hashes, {})
+        self.assertIsNone(build_state.eve_objects)
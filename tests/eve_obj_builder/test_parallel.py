@@ -0,0 +1,110 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import logging
+import pickle
+
+from eos.const.eos import EffectBuildStatus
+from eos.const.eos import ModOperator
+from eos.eve_obj_builder import BuildState
+from eos.eve_obj_builder import EveObjBuilder
+from tests.eve_obj_builder.testcase import EveObjBuilderTestCase
+
+
+class TestParallel(EveObjBuilderTestCase):
+    """Builder should produce the same results using worker processes."""
+
+    def setUp(self):
+        EveObjBuilderTestCase.setUp(self)
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 5, 'value': 10.0})
+        self.dh.data['dgmattribs'].append({'attributeID': 5})
+        self.dh.data['dgmattribs'].append({'attributeID': 6})
+        for effect_id in range(100, 150):
+            self.dh.data['dgmtypeeffects'].append(
+                {'typeID': 1, 'effectID': effect_id})
+            self.dh.data['dgmeffects'].append({
+                'effectID': effect_id, 'effectCategory': 0,
+                'modifierInfo': [{
+                    'domain': 'shipID', 'func': 'ItemModifier',
+                    'modifiedAttributeID': 6, 'modifyingAttributeID': 5,
+                    'operation': 6}]})
+
+    def test_workers(self):
+        self.run_builder(workers=2)
+        self.assertEqual(len(self.types), 1)
+        self.assertEqual(len(self.types[1].effects), 50)
+        self.assertEqual(self.types[1].attrs, {5: 10.0})
+        self.assertEqual(len(self.effects), 50)
+        for effect in self.effects.values():
+            self.assertEqual(effect.build_status, EffectBuildStatus.success)
+            self.assertEqual(len(effect.modifiers), 1)
+            modifier = effect.modifiers[0]
+            self.assertEqual(modifier.operator, ModOperator.post_percent)
+            self.assertEqual(modifier.affectee_attr_id, 6)
+            self.assertEqual(modifier.affector_attr_id, 5)
+
+    def test_workers_build_state(self):
+        build_state = BuildState()
+        self.run_builder(build_state=build_state)
+        effects = self.effects
+        self.dh.data['dgmeffects'][0]['effectCategory'] = 1
+        self.run_builder(build_state=build_state, workers=2)
+        self.assertIsNot(self.effects[100], effects[100])
+        self.assertEqual(self.effects[100].category_id, 1)
+        self.assertEqual(len(self.effects[100].modifiers), 1)
+        self.assertIs(self.effects[101], effects[101])
+
+    def test_workers_log(self):
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 150})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 150, 'effectCategory': 0,
+            'modifierInfo': [{
+                'domain': 'shipID', 'func': 'ItemModifier',
+                'modifiedAttributeID': 6, 'modifyingAttributeID': 5,
+                'operation': 99}]})
+        self.run_builder(workers=2)
+        self.assertEqual(
+            self.effects[150].build_status, EffectBuildStatus.error)
+        # Records logged in worker processes are passed to parent process
+        log = self.get_log(name='eos.eve_obj_builder.mod_builder.*')
+        self.assertEqual(len(log), 1)
+        log_record = log[0]
+        self.assertEqual(log_record.levelno, logging.ERROR)
+        self.assertEqual(
+            log_record.msg,
+            'effect 150, building 1 modifiers: 1 build errors')
+
+    def test_grouped_tables_share_numbers(self):
+        # Make sure number objects are distinct in source data
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': int('100000'), 'attributeID': 5, 'value': 10.0})
+        self.dh.data['dgmtypeeffects'].append(
+            {'typeID': int('100000'), 'effectID': 100})
+        # Tables from the same group are fetched by single worker task
+        tables = EveObjBuilder._fetch_tables(
+            pickle.dumps(self.dh), ('dgmtypeattribs', 'dgmtypeeffects'))
+        attr_row = next(
+            r for r in tables['dgmtypeattribs'] if r['typeID'] == 100000)
+        effect_row = next(
+            r for r in tables['dgmtypeeffects'] if r['typeID'] == 100000)
+        self.assertIs(attr_row['typeID'], effect_row['typeID'])
@@ -0,0 +1,54 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from tests.eve_obj_builder.testcase import EveObjBuilderTestCase
+
+
+class TestStreaming(EveObjBuilderTestCase):
+    """Builder should accept rows from generators."""
+
+    def setUp(self):
+        EveObjBuilderTestCase.setUp(self)
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 5, 'value': 10.0})
+        self.dh.data['dgmtypeattribs'].append(
+            {'typeID': 1, 'attributeID': 6, 'value': -0.0})
+        self.dh.data['dgmattribs'].append({'attributeID': 5})
+        self.dh.data['dgmattribs'].append({'attributeID': 6})
+        for table_name, rows in self.dh.data.items():
+            self.dh.data[table_name] = self.make_generator(rows)
+
+    def get_log(self, name='eos.eve_obj_builder.validator*'):
+        return EveObjBuilderTestCase.get_log(self, name=name)
+
+    @staticmethod
+    def make_generator(rows):
+        for row in rows:
+            yield row
+
+    def test_generators(self):
+        self.run_builder()
+        self.assertEqual(len(self.types), 1)
+        self.assertEqual(self.types[1].attrs, {5: 10.0, 6: 0.0})
+        self.assertEqual(str(self.types[1].attrs[6]), '-0.0')
+        self.assertEqual(len(self.attrs), 2)
+        self.assert_log_entries(0)
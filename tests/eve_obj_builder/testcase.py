@@ -37,7 +37,7 @@ class EveObjBuilderTestCase(EosTestCase):
         EosTestCase.setUp(self)
         self.dh = DataHandler()
 
-    def run_builder(self):
+    def run_builder(self, build_state=None, workers=None):
         """Shortcut to running eve object builder.
 
         Default data handler is passed to builder as data source, and results
@@ -46,7 +46,8 @@ class EveObjBuilderTestCase(EosTestCase):
             attrs: Map in {attribute ID: attribute} format.
             effects: Map in {effect ID: effect} format.
         """
-        types, attrs, effects, buff_templates = EveObjBuilder.run(self.dh)
+        types, attrs, effects, buff_templates = EveObjBuilder.run(
+            self.dh, build_state, workers)
         self.types = {t.id: t for t in types}
         self.attrs = {a.id: a for a in attrs}
         self.effects = {e.id: e for e in effects}
@@ -70,3 +70,54 @@ class TestCleanupChainRemoval(CalculatorTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_attr_affector_removed(self):
+        # Setup
+        attr1 = self.mkattr()
+        attr2 = self.mkattr()
+        attr3 = self.mkattr()
+        modifier1 = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=attr2.id,
+            operator=ModOperator.post_mul,
+            affector_attr_id=attr1.id)
+        effect1 = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier1])
+        modifier2 = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=attr3.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=attr2.id)
+        effect2 = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier2])
+        implant = Implant(self.mktype(
+            attrs={attr1.id: 5}, effects=[effect1]).id)
+        ship = Ship(self.mktype(attrs={attr2.id: 7.5}, effects=[effect2]).id)
+        rig = Rig(self.mktype(attrs={attr3.id: 0.5}).id)
+        self.fit.implants.add(implant)
+        self.fit.ship = ship
+        self.fit.rigs.add(rig)
+        self.assertAlmostEqual(rig.attrs[attr3.id], 0.6875)
+        # Action
+        self.fit.ship = None
+        # Verification
+        self.assertAlmostEqual(rig.attrs[attr3.id], 0.5)
+        # Action
+        # Changes of attributes of removed affector item must not be routed to
+        # its former affectees
+        self.fit.implants.remove(implant)
+        # Verification
+        self.assertAlmostEqual(rig.attrs[attr3.id], 0.5)
+        # Action
+        self.fit.ship = ship
+        # Verification
+        self.assertAlmostEqual(rig.attrs[attr3.id], 0.5375)
+        # Action
+        self.fit.implants.add(implant)
+        # Verification
+        self.assertAlmostEqual(rig.attrs[attr3.id], 0.6875)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -0,0 +1,54 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import gc
+from weakref import ref
+
+from eos import Fit
+from eos import Implant
+from eos import SolarSystem
+from eos import SourceManager
+from tests.integration.environment import CacheHandler
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestAttrMetadata(CalculatorTestCase):
+
+    def test_cache_handler_collected(self):
+        cache_handler = CacheHandler()
+        self._make_source('src2', cache_handler)
+        attr = self.mkattr(src='src2', default_value=5)
+        item = Implant(self.mktype(src='src2').id)
+        fit = Fit(SolarSystem('src2'))
+        fit.implants.add(item)
+        self.assertAlmostEqual(item.attrs[attr.id], 5)
+        fit.solar_system.source = None
+        cache_handler_ref = ref(cache_handler)
+        # Action
+        SourceManager.remove('src2')
+        del cache_handler
+        gc.collect()
+        # Verification
+        # Attribute metadata registry should not keep cache handler alive
+        self.assertIsNone(cache_handler_ref())
+        # Cleanup
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
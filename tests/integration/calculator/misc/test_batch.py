@@ -0,0 +1,370 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos import Fit
+from eos import Implant
+from eos import ModuleHigh
+from eos import ModuleLow
+from eos import Rig
+from eos import Ship
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from eos.pubsub.message import AttrsValueChanged
+from eos.pubsub.message import AttrsValueChangedMasked
+from eos.pubsub.subscriber import BaseSubscriber
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class AttrChangeRecorder(BaseSubscriber):
+
+    def __init__(self):
+        self.msgs = []
+
+    def _handle_attr_changed(self, msg):
+        self.msgs.append(msg)
+
+    _handler_map = {AttrsValueChanged: _handle_attr_changed}
+
+
+class ImmediateAttrChangeRecorder(AttrChangeRecorder):
+    """Receives attribute changes the same way calculator does."""
+
+    _batch_immediate = True
+
+
+class TestBatch(CalculatorTestCase):
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attr = self.mkattr()
+        self.chained_attr = self.mkattr()
+        src_attr = self.mkattr()
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=src_attr.id)
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier])
+        self.implant_type = self.mktype(
+            attrs={src_attr.id: 20}, effects=[effect])
+        self.module_type = self.mktype(
+            attrs={src_attr.id: 20}, effects=[effect])
+        # Ship attribute modifies attribute of a rig
+        chained_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.chained_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=self.tgt_attr.id)
+        chained_effect = self.mkeffect(
+            category_id=EffectCategoryId.passive,
+            modifiers=[chained_modifier])
+        self.ship = Ship(self.mktype(
+            attrs={self.tgt_attr.id: 100}, effects=[chained_effect]).id)
+        self.rig = Rig(self.mktype(attrs={self.chained_attr.id: 100}).id)
+        self.fit.ship = self.ship
+        self.fit.rigs.add(self.rig)
+        self.recorder = AttrChangeRecorder()
+        self.fit._subscribe(self.recorder, self.recorder._handler_map.keys())
+
+    def test_value(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        with self.fit.batch():
+            self.fit.implants.add(Implant(self.implant_type.id))
+            self.fit.implants.add(Implant(self.implant_type.id))
+        # Verification
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 144)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 244)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_value_within_batch(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        with self.fit.batch():
+            self.fit.implants.add(Implant(self.implant_type.id))
+            # Verification
+            self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 120)
+            self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 220)
+            self.assertEqual(len(self.recorder.msgs), 0)
+            # Action
+            self.fit.implants.add(Implant(self.implant_type.id))
+            # Verification
+            self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 144)
+            self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 244)
+            self.assertEqual(len(self.recorder.msgs), 0)
+        # Verification
+        ship_msgs = [
+            m for m in self.recorder.msgs if self.ship in m.attr_changes]
+        self.assertEqual(len(ship_msgs), 1)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 144)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 244)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_msgs_merged(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        with self.fit.batch():
+            self.fit.implants.add(Implant(self.implant_type.id))
+            self.fit.implants.add(Implant(self.implant_type.id))
+            # Verification
+            self.assertEqual(len(self.recorder.msgs), 0)
+        # Verification
+        ship_msgs = [
+            m for m in self.recorder.msgs if self.ship in m.attr_changes]
+        self.assertEqual(len(ship_msgs), 1)
+        # Changes of dependent attributes are consolidated into the same
+        # message
+        self.assertEqual(ship_msgs[0].attr_changes, {
+            self.ship: {self.tgt_attr.id},
+            self.rig: {self.chained_attr.id}})
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_nested(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        with self.fit.batch():
+            self.fit.implants.add(Implant(self.implant_type.id))
+            with self.fit.batch():
+                self.fit.implants.add(Implant(self.implant_type.id))
+            # Verification
+            self.assertEqual(len(self.recorder.msgs), 0)
+        # Verification
+        ship_msgs = [
+            m for m in self.recorder.msgs if self.ship in m.attr_changes]
+        self.assertEqual(len(ship_msgs), 1)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 144)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_removed_item(self):
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        with self.fit.batch():
+            self.fit.implants.add(Implant(self.implant_type.id))
+            self.fit.ship = None
+        # Verification
+        for msg in self.recorder.msgs:
+            self.assertNotIn(self.ship, msg.attr_changes)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 100)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_bulk_adjacent_merged(self):
+        msg1 = AttrsValueChanged({self.ship: {self.tgt_attr.id}})
+        msg2 = AttrsValueChanged({self.rig: {self.chained_attr.id}})
+        # Action
+        self.fit._publish_bulk((msg1, msg2))
+        # Verification
+        self.assertEqual(len(self.recorder.msgs), 1)
+        self.assertEqual(self.recorder.msgs[0].attr_changes, {
+            self.ship: {self.tgt_attr.id},
+            self.rig: {self.chained_attr.id}})
+        # Original messages are left intact
+        self.assertEqual(msg1.attr_changes, {self.ship: {self.tgt_attr.id}})
+        self.assertEqual(msg2.attr_changes, {self.rig: {self.chained_attr.id}})
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_bulk_separated_not_merged(self):
+        # Action
+        self.fit._publish_bulk((
+            AttrsValueChanged({self.ship: {self.tgt_attr.id}}),
+            AttrsValueChangedMasked({self.ship: {self.tgt_attr.id}}),
+            AttrsValueChanged({self.rig: {self.chained_attr.id}})))
+        # Verification
+        self.assertEqual(len(self.recorder.msgs), 2)
+        self.assertEqual(
+            self.recorder.msgs[0].attr_changes,
+            {self.ship: {self.tgt_attr.id}})
+        self.assertEqual(
+            self.recorder.msgs[1].attr_changes,
+            {self.rig: {self.chained_attr.id}})
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_bulk_container_update(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        self.fit.implants.update((
+            Implant(self.implant_type.id), Implant(self.implant_type.id)))
+        # Verification
+        ship_msgs = [
+            m for m in self.recorder.msgs if self.ship in m.attr_changes]
+        self.assertEqual(len(ship_msgs), 1)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 144)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 244)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_exception(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        with self.assertRaises(ZeroDivisionError):
+            with self.fit.batch():
+                self.fit.implants.add(Implant(self.implant_type.id))
+                1 / 0
+        # Verification
+        # Implant stays on fit, thus values which depend on it are refreshed
+        ship_msgs = [
+            m for m in self.recorder.msgs if self.ship in m.attr_changes]
+        self.assertEqual(len(ship_msgs), 1)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 120)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 220)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_bulk_container_failure(self):
+        other_fit = Fit(solar_system=self.fit.solar_system)
+        other_implant = Implant(self.implant_type.id)
+        other_fit.implants.add(other_implant)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 200)
+        # Action
+        with self.assertRaises(ValueError):
+            self.fit.implants.update((
+                Implant(self.implant_type.id), other_implant))
+        # Verification
+        # Implant added before failure stays on fit, thus values which depend
+        # on it are refreshed
+        self.assertEqual(len(self.fit.implants), 1)
+        self.assertEqual(self.get_ship_msg_count(), 1)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 120)
+        self.assertAlmostEqual(self.rig.attrs[self.chained_attr.id], 220)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def get_ship_msg_count(self):
+        return len([
+            m for m in self.recorder.msgs if self.ship in m.attr_changes])
+
+    def test_msg_count_list(self):
+        self.ship.attrs[self.tgt_attr.id]
+        # Action
+        # Attribute value is requested after each addition, e.g. to be shown
+        for _ in range(3):
+            self.fit.modules.high.append(ModuleHigh(self.module_type.id))
+            self.ship.attrs[self.tgt_attr.id]
+        # Verification
+        self.assertEqual(self.get_ship_msg_count(), 3)
+        # Action
+        self.fit.modules.high.clear()
+        self.ship.attrs[self.tgt_attr.id]
+        del self.recorder.msgs[:]
+        self.fit.modules.high.extend(
+            ModuleHigh(self.module_type.id) for _ in range(3))
+        # Verification
+        self.assertEqual(self.get_ship_msg_count(), 1)
+        self.assertAlmostEqual(
+            self.ship.attrs[self.tgt_attr.id], 100 * 1.2 ** 3)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_msg_count_module_racks(self):
+        # Action
+        self.ship.attrs[self.tgt_attr.id]
+        self.fit.modules.high.append(ModuleHigh(self.module_type.id))
+        self.ship.attrs[self.tgt_attr.id]
+        self.fit.modules.low.append(ModuleLow(self.module_type.id))
+        # Verification
+        self.assertEqual(self.get_ship_msg_count(), 2)
+        # Action
+        self.fit.modules.high.clear()
+        self.fit.modules.low.clear()
+        self.ship.attrs[self.tgt_attr.id]
+        del self.recorder.msgs[:]
+        self.fit.modules.load(
+            high=[ModuleHigh(self.module_type.id)],
+            low=[ModuleLow(self.module_type.id)])
+        # Verification
+        self.assertEqual(self.get_ship_msg_count(), 1)
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 144)
+        # Cleanup
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_revision_count(self):
+        immediate_recorder = ImmediateAttrChangeRecorder()
+        self.fit._subscribe(
+            immediate_recorder, immediate_recorder._handler_map.keys())
+        self.ship.attrs[self.tgt_attr.id]
+        self.rig.attrs[self.chained_attr.id]
+        # Action
+        # Attribute values are requested after each addition
+        for _ in range(3):
+            self.fit.implants.add(Implant(self.implant_type.id))
+            self.ship.attrs[self.tgt_attr.id]
+            self.rig.attrs[self.chained_attr.id]
+        single_count = len(immediate_recorder.msgs)
+        # Action
+        self.fit.implants.clear()
+        self.ship.attrs[self.tgt_attr.id]
+        self.rig.attrs[self.chained_attr.id]
+        del immediate_recorder.msgs[:]
+        self.fit.implants.update(
+            Implant(self.implant_type.id) for _ in range(3))
+        # Verification
+        # Calculator revises dependent values as many times as for a single
+        # addition
+        self.assertEqual(len(immediate_recorder.msgs), single_count // 3)
+        self.assertAlmostEqual(
+            self.ship.attrs[self.tgt_attr.id], 100 * 1.2 ** 3)
+        # Cleanup
+        self.fit._unsubscribe(
+            immediate_recorder, immediate_recorder._handler_map.keys())
+        self.fit._unsubscribe(self.recorder, self.recorder._handler_map.keys())
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -120,8 +120,9 @@ class TestMapMethods(CalculatorTestCase):
         self.assertEqual(self.item.attrs.get(1008, 60), 60)
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         # Attempts to fetch non-existent attribute and attribute without base
-        # value generate errors, which is not related to this test
-        self.assert_log_entries(3)
+        # value generate errors, which is not related to this test. Failure to
+        # fetch the same attribute is remembered and logged only once
+        self.assert_log_entries(2)
 
     def test_get_not_loaded(self):
         self.fit.solar_system.source = None
@@ -0,0 +1,243 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos import EffectMode
+from eos import Fit
+from eos import ModuleHigh
+from eos import Rig
+from eos import Ship
+from eos import State
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestModPlanLocal(CalculatorTestCase):
+    """Check that compiled modification plans follow local modifications."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attr = self.mkattr()
+        self.src_attr = self.mkattr()
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=self.src_attr.id)
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.active,
+            modifiers=[modifier])
+        self.module = ModuleHigh(
+            self.mktype(
+                attrs={self.src_attr.id: 20},
+                effects=[effect],
+                default_effect=effect).id,
+            state=State.online)
+        self.fit.ship = Ship(self.mktype(attrs={self.tgt_attr.id: 100}).id)
+
+    def test_item_added_removed(self):
+        # Plan is compiled without any affector specs
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 100)
+        self.module.state = State.active
+        # Action
+        self.fit.modules.high.append(self.module)
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.fit.modules.high.remove(self.module)
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_effect_started_stopped(self):
+        self.fit.modules.high.append(self.module)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        self.module.state = State.active
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.module.state = State.online
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        self.module.state = State.active
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_affector_value_changed(self):
+        self.module.state = State.active
+        self.fit.modules.high.append(self.module)
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        rig_attr = self.mkattr()
+        rig_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.src_attr.id,
+            operator=ModOperator.post_mul,
+            affector_attr_id=rig_attr.id)
+        rig_effect = self.mkeffect(
+            category_id=EffectCategoryId.passive,
+            modifiers=[rig_modifier])
+        rig = Rig(self.mktype(
+            attrs={rig_attr.id: 2},
+            effects=[rig_effect]).id)
+        # Action
+        self.fit.rigs.add(rig)
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 140)
+        # Action
+        self.fit.rigs.remove(rig)
+        # Verification
+        self.assertAlmostEqual(self.fit.ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+
+class TestModPlanProjected(CalculatorTestCase):
+    """Check that compiled modification plans follow projections."""
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attr = self.mkattr()
+        src_attr = self.mkattr()
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.target,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=src_attr.id)
+        self.effect = self.mkeffect(
+            category_id=EffectCategoryId.target,
+            modifiers=[modifier])
+        self.module = ModuleHigh(
+            self.mktype(
+                attrs={src_attr.id: 20},
+                effects=[self.effect],
+                default_effect=self.effect).id,
+            state=State.active)
+        self.fit.modules.high.append(self.module)
+        self.tgt_fit = Fit(solar_system=self.fit.solar_system)
+        self.tgt_ship = Ship(self.mktype(attrs={self.tgt_attr.id: 100}).id)
+        self.tgt_fit.ship = self.tgt_ship
+
+    def test_projection_applied_unapplied(self):
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        self.module.target = self.tgt_ship
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.module.target = None
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_projector_effect_stopped_started(self):
+        self.module.target = self.tgt_ship
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.module.state = State.online
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        self.module.state = State.active
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.module.target = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_target_changed(self):
+        other_fit = Fit(solar_system=self.fit.solar_system)
+        other_ship = Ship(self.tgt_ship._type_id)
+        other_fit.ship = other_ship
+        self.module.target = self.tgt_ship
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        self.assertAlmostEqual(other_ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        self.module.target = other_ship
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        self.assertAlmostEqual(other_ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.module.target = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_effect_stopped_while_applied(self):
+        self.module.target = self.tgt_ship
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.module.set_effect_mode(self.effect.id, EffectMode.force_stop)
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        # Effect is started again with the same target, modifications must be
+        # applied only once
+        self.module.set_effect_mode(
+            self.effect.id, EffectMode.state_compliance)
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.module.target = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_projector_removed_while_applied(self):
+        self.module.target = self.tgt_ship
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Action
+        self.fit.modules.high.remove(self.module)
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        self.fit.modules.high.append(self.module)
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        # Cleanup
+        self.module.target = None
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_untargeted_after_effect_stopped(self):
+        self.module.target = self.tgt_ship
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 120)
+        self.module.set_effect_mode(self.effect.id, EffectMode.force_stop)
+        # Action
+        self.module.target = None
+        # Verification
+        self.assertAlmostEqual(self.tgt_ship.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -20,8 +20,10 @@
 
 
 import logging
+from unittest.mock import patch
 
 from eos import Implant
+from eos.calculator.map import MutableAttrMap
 from tests.integration.calculator.testcase import CalculatorTestCase
 
 
@@ -83,3 +85,39 @@ class TestNonExistent(CalculatorTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_repeated_miss(self):
+        attr = self.mkattr()
+        item = Implant(self.mktype().id)
+        self.fit.implants.add(item)
+        with self.assertRaises(KeyError):
+            item.attrs[attr.id]
+        # Action
+        with patch.object(
+            MutableAttrMap, '_MutableAttrMap__calculate'
+        ) as calculate:
+            with self.assertRaises(KeyError) as cm:
+                item.attrs[attr.id]
+            value = item.attrs.get(attr.id)
+        # Verification
+        # Repeated requests are served from negative cache
+        self.assertEqual(calculate.call_count, 0)
+        self.assertIsNone(value)
+        self.assertEqual(cm.exception.args, (attr.id,))
+        self.assert_log_entries(1)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+
+    def test_miss_force_recalc(self):
+        attr = self.mkattr()
+        item = Implant(self.mktype().id)
+        self.fit.implants.add(item)
+        self.assertIsNone(item.attrs.get(attr.id))
+        self.assert_log_entries(1)
+        # Action
+        item.attrs._force_recalc(attr.id)
+        # Verification
+        self.assertIsNone(item.attrs.get(attr.id))
+        self.assert_log_entries(2)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
@@ -0,0 +1,119 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from unittest.mock import patch
+
+from eos import Implant
+from eos import Rig
+from eos.calculator.map import penalize_values
+from eos.calculator.map import penalize_values_batch
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+from tests.testcase import EosTestCase
+
+
+class TestPenalizeValuesBatch(EosTestCase):
+    """Batch penalization should give exactly the same results as scalar."""
+
+    groups = (
+        [0.2, 0.5, -0.9, -0.25, 4],
+        [],
+        [-0.1, -0.2, -0.3],
+        [0.1] * 15,
+        [-0.05 * i for i in range(1, 14)] + [0.03 * i for i in range(1, 14)],
+        [0, 0, -0.5])
+
+    def get_expected(self):
+        return [penalize_values(g) for g in self.groups]
+
+    @patch('eos.calculator.map.PENALIZE_VECTORIZED_MIN_GROUPS', 0)
+    def test_vectorized(self):
+        results = penalize_values_batch(self.groups)
+        self.assertEqual(results, self.get_expected())
+
+    @patch('eos.calculator.map.PENALIZE_VECTORIZED_MIN_GROUPS', 1000)
+    def test_below_threshold(self):
+        results = penalize_values_batch(self.groups)
+        self.assertEqual(results, self.get_expected())
+
+    @patch('eos.calculator.map.PENALIZE_VECTORIZED_MIN_GROUPS', 0)
+    @patch('eos.calculator.map._get_numpy', return_value=None)
+    def test_no_numpy(self, _):
+        results = penalize_values_batch(self.groups)
+        self.assertEqual(results, self.get_expected())
+
+    @patch('eos.calculator.map.PENALIZE_VECTORIZED_MIN_GROUPS', 0)
+    def test_empty_groups(self):
+        self.assertEqual(penalize_values_batch([[], []]), [0, 0])
+
+
+class TestPenalizeItems(CalculatorTestCase):
+    """Values calculated via map items should match values fetched one by one.
+
+    There are enough penalized attributes to use vectorized penalization, and
+    enough sources to exceed amount of significant modifications in both
+    positive and negative penalization chains.
+    """
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attrs = [self.mkattr(stackable=False) for _ in range(40)]
+        src_attr = self.mkattr()
+        modifiers = [
+            self.mkmod(
+                affectee_filter=ModAffecteeFilter.domain,
+                affectee_domain=ModDomain.ship,
+                affectee_attr_id=tgt_attr.id,
+                operator=ModOperator.post_mul,
+                affector_attr_id=src_attr.id)
+            for tgt_attr in self.tgt_attrs]
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=modifiers)
+        for i in range(13):
+            for src_value in (1 + 0.07 * (i + 1), 1 - 0.06 * (i + 1)):
+                self.fit.implants.add(Implant(self.mktype(
+                    attrs={src_attr.id: src_value}, effects=[effect]).id))
+        tgt_type_attrs = {a.id: 100 + i for i, a in enumerate(self.tgt_attrs)}
+        self.tgt1 = Rig(self.mktype(attrs=tgt_type_attrs).id)
+        self.tgt2 = Rig(self.mktype(attrs=tgt_type_attrs).id)
+        self.fit.rigs.add(self.tgt1)
+        self.fit.rigs.add(self.tgt2)
+
+    def verify_items(self):
+        # Action
+        batch_values = dict(self.tgt1.attrs.items())
+        # Verification
+        for tgt_attr in self.tgt_attrs:
+            self.assertEqual(
+                batch_values[tgt_attr.id], self.tgt2.attrs.get(tgt_attr.id))
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_vectorized(self):
+        self.verify_items()
+
+    @patch('eos.calculator.map._get_numpy', return_value=None)
+    def test_no_numpy(self, _):
+        self.verify_items()
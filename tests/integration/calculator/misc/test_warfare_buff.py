@@ -0,0 +1,225 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from unittest.mock import call
+from unittest.mock import patch
+
+from eos import Fit
+from eos import Fleet
+from eos import ModuleHigh
+from eos import Rig
+from eos import Ship
+from eos import State
+from eos.calculator.service import WARFARE_BUFF_ATTRS
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModAggregateMode
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import AttrId
+from eos.const.eve import EffectCategoryId
+from eos.const.eve import EffectId
+from eos.source import SourceManager
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestWarfareBuff(CalculatorTestCase):
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attr = self.mkattr()
+        for buff_id_attr_id, buff_value_attr_id in (
+            WARFARE_BUFF_ATTRS.items()
+        ):
+            # Unused buff slots carry zero buff ID, like on real command
+            # modules
+            self.mkattr(attr_id=buff_id_attr_id, default_value=0)
+            self.mkattr(attr_id=buff_value_attr_id)
+        self.mkbuff_template(
+            buff_id=5,
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            aggregate_mode=ModAggregateMode.maximum)
+        self.effect = self.mkeffect(
+            effect_id=EffectId.module_bonus_warfare_link_armor,
+            category_id=EffectCategoryId.active)
+        self.module_type = self.mktype(
+            attrs={
+                AttrId.warfare_buff_1_id: 5,
+                AttrId.warfare_buff_1_value: 10},
+            effects=[self.effect],
+            default_effect=self.effect)
+        self.ship_type = self.mktype(attrs={self.tgt_attr.id: 100})
+        self.cache_handler = SourceManager.default.cache_handler
+
+    def make_buffed_fit(self, module_type=None, **kwargs):
+        if module_type is None:
+            module_type = self.module_type
+        fit = Fit(**kwargs)
+        fit.ship = Ship(self.ship_type.id)
+        fit.modules.high.append(
+            ModuleHigh(module_type.id, state=State.active))
+        return fit
+
+    def assert_fit_solsys_buffers_empty(self, fit):
+        # Remove command modules before ship, as otherwise they lose track of
+        # their carrier before they are removed
+        fit.modules.high.clear()
+        self.assert_solsys_buffers_empty(fit.solar_system)
+
+    def get_buff_modifiers(self, fit):
+        calculator = fit.solar_system._calculator
+        return {
+            s.modifier for s in calculator.get_affector_specs(
+                fit.ship, self.tgt_attr.id)}
+
+    def test_modifiers_shared_between_solar_systems(self):
+        with patch.object(
+            self.cache_handler, 'get_buff_templates',
+            wraps=self.cache_handler.get_buff_templates
+        ) as get_buff_templates:
+            # Action
+            fit1 = self.make_buffed_fit()
+            fit2 = self.make_buffed_fit()
+        # Verification
+        self.assertIsNot(fit1.solar_system, fit2.solar_system)
+        self.assertAlmostEqual(fit1.ship.attrs[self.tgt_attr.id], 110)
+        self.assertAlmostEqual(fit2.ship.attrs[self.tgt_attr.id], 110)
+        self.assertEqual(get_buff_templates.call_args_list.count(call(5)), 1)
+        modifiers1 = self.get_buff_modifiers(fit1)
+        self.assertEqual(len(modifiers1), 1)
+        self.assertEqual(self.get_buff_modifiers(fit2), modifiers1)
+        # Cleanup
+        self.assert_fit_solsys_buffers_empty(fit1)
+        self.assert_fit_solsys_buffers_empty(fit2)
+        self.assert_log_entries(0)
+
+    def test_modifiers_invalidated_by_fingerprint(self):
+        with patch.object(
+            self.cache_handler, 'get_buff_templates',
+            wraps=self.cache_handler.get_buff_templates
+        ) as get_buff_templates:
+            fit1 = self.make_buffed_fit()
+            # Action
+            self.cache_handler.fingerprint = 'changed'
+            fit2 = self.make_buffed_fit()
+        # Verification
+        self.assertAlmostEqual(fit1.ship.attrs[self.tgt_attr.id], 110)
+        self.assertAlmostEqual(fit2.ship.attrs[self.tgt_attr.id], 110)
+        self.assertEqual(get_buff_templates.call_args_list.count(call(5)), 2)
+        modifiers1 = self.get_buff_modifiers(fit1)
+        modifiers2 = self.get_buff_modifiers(fit2)
+        self.assertEqual(len(modifiers2), 1)
+        self.assertFalse(modifiers1 & modifiers2)
+        # Cleanup
+        self.assert_fit_solsys_buffers_empty(fit1)
+        self.assert_fit_solsys_buffers_empty(fit2)
+        self.assert_log_entries(0)
+
+    def test_buff_id_changed_with_compiled_plan(self):
+        self.mkbuff_template(
+            buff_id=6,
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_mul,
+            aggregate_mode=ModAggregateMode.maximum)
+        rig_attr = self.mkattr()
+        rig_modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.domain,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=AttrId.warfare_buff_1_id,
+            operator=ModOperator.pre_assign,
+            affector_attr_id=rig_attr.id)
+        rig_effect = self.mkeffect(
+            category_id=EffectCategoryId.passive,
+            modifiers=[rig_modifier])
+        rig = Rig(self.mktype(
+            attrs={rig_attr.id: 6},
+            effects=[rig_effect]).id)
+        fit = self.make_buffed_fit()
+        # Compile plan of buffed attribute
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 110)
+        # Action
+        fit.rigs.add(rig)
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 1000)
+        # Action
+        fit.rigs.remove(rig)
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 110)
+        # Cleanup
+        self.assert_fit_solsys_buffers_empty(fit)
+        self.assert_log_entries(0)
+
+    def test_buff_effect_stopped_with_compiled_plan(self):
+        fit = self.make_buffed_fit()
+        module = fit.modules.high[0]
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 110)
+        # Action
+        module.state = State.online
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        module.state = State.active
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 110)
+        # Cleanup
+        self.assert_fit_solsys_buffers_empty(fit)
+        self.assert_log_entries(0)
+
+    def test_fit_changes_fleet(self):
+        module_type2 = self.mktype(
+            attrs={
+                AttrId.warfare_buff_1_id: 5,
+                AttrId.warfare_buff_1_value: 30},
+            effects=[self.effect],
+            default_effect=self.effect)
+        fleet1 = Fleet()
+        fleet2 = Fleet()
+        booster_fit1 = self.make_buffed_fit(fleet=fleet1)
+        solar_system = booster_fit1.solar_system
+        booster_fit2 = self.make_buffed_fit(
+            module_type=module_type2, solar_system=solar_system, fleet=fleet2)
+        fit = Fit(solar_system=solar_system)
+        fit.ship = Ship(self.ship_type.id)
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 100)
+        # Action
+        fleet1.fits.add(fit)
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 110)
+        # Action
+        fleet1.fits.remove(fit)
+        fleet2.fits.add(fit)
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 130)
+        # Boosters keep their own buffs
+        self.assertAlmostEqual(booster_fit1.ship.attrs[self.tgt_attr.id], 110)
+        self.assertAlmostEqual(booster_fit2.ship.attrs[self.tgt_attr.id], 130)
+        # Action
+        fleet2.fits.remove(fit)
+        # Verification
+        self.assertAlmostEqual(fit.ship.attrs[self.tgt_attr.id], 100)
+        # Cleanup
+        fleet1.fits.clear()
+        fleet2.fits.clear()
+        booster_fit1.modules.high.clear()
+        self.assert_fit_solsys_buffers_empty(booster_fit2)
+        self.assert_log_entries(0)
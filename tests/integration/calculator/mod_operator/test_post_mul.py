@@ -76,3 +76,15 @@ class TestOperatorPostMul(CalculatorTestCase):
         # Cleanup
         self.assert_log_entries(0)
         self.assert_solsys_buffers_empty(self.fit.solar_system)
+
+    def test_penalized_items(self):
+        # Values calculated in batch via map items should be penalized the same
+        # way as values calculated one by one
+        self.tgt_attr.stackable = False
+        # Action
+        attr_values = dict(self.influence_tgt.attrs.items())
+        # Verification
+        self.assertAlmostEqual(attr_values[self.tgt_attr.id], 62.55, places=3)
+        # Cleanup
+        self.assert_log_entries(0)
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
@@ -121,3 +121,43 @@ class TestContainerModuleRacks(ContainerTestCase):
         # Cleanup
         self.verify_buffers()
         self.assert_log_entries(0)
+
+    def test_load(self):
+        fit = Fit()
+        mod_high1 = ModuleHigh(self.mktype().id)
+        mod_high2 = ModuleHigh(self.mktype().id)
+        mod_low = ModuleLow(self.mktype().id)
+        # Action
+        fit.modules.load(
+            high=(mod_high1, None, mod_high2),
+            low=[mod_low])
+        # Verification
+        self.assertEqual(len(fit.modules.high), 3)
+        self.assertIs(fit.modules.high[0], mod_high1)
+        self.assertIsNone(fit.modules.high[1])
+        self.assertIs(fit.modules.high[2], mod_high2)
+        self.assertEqual(len(fit.modules.mid), 0)
+        self.assertEqual(len(fit.modules.low), 1)
+        self.assertIs(fit.modules.low[0], mod_low)
+        # Cleanup
+        self.assert_item_buffers_empty(mod_high1)
+        self.assert_item_buffers_empty(mod_high2)
+        self.assert_item_buffers_empty(mod_low)
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_load_type_failure(self):
+        fit = Fit()
+        mod_high = ModuleHigh(self.mktype().id)
+        mod_low = ModuleLow(self.mktype().id)
+        # Action
+        with self.assertRaises(TypeError):
+            fit.modules.load(high=[mod_high], mid=[mod_low])
+        # Verification
+        self.assertEqual(len(fit.modules.high), 0)
+        self.assertEqual(len(fit.modules.mid), 0)
+        # Cleanup
+        self.assert_item_buffers_empty(mod_high)
+        self.assert_item_buffers_empty(mod_low)
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
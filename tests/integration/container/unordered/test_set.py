@@ -125,6 +125,39 @@ class TestContainerSet(ContainerTestCase):
         self.assert_solsys_buffers_empty(fit.solar_system)
         self.assert_log_entries(0)
 
+    def test_update_items(self):
+        fit = Fit()
+        item1 = Implant(self.mktype().id)
+        item2 = Implant(self.mktype().id)
+        # Action
+        fit.implants.update(iter((item1, item2)))
+        # Verification
+        self.assertEqual(len(fit.implants), 2)
+        self.assertIn(item1, fit.implants)
+        self.assertIn(item2, fit.implants)
+        # Cleanup
+        self.assert_item_buffers_empty(item1)
+        self.assert_item_buffers_empty(item2)
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_update_item_type_failure(self):
+        fit = Fit()
+        item1 = Implant(self.mktype().id)
+        item2 = Booster(self.mktype().id)
+        # Action
+        with self.assertRaises(TypeError):
+            fit.implants.update((item1, item2))
+        # Verification
+        self.assertEqual(len(fit.implants), 0)
+        fit.implants.add(item1)
+        fit.boosters.add(item2)
+        # Cleanup
+        self.assert_item_buffers_empty(item1)
+        self.assert_item_buffers_empty(item2)
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
+
     def test_bool(self):
         fit = Fit()
         item = Implant(self.mktype().id)
@@ -230,3 +230,43 @@ class TestContainerTypeUniqueSet(ContainerTestCase):
         self.assert_item_buffers_empty(item)
         self.assert_solsys_buffers_empty(fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_update_items(self):
+        fit = Fit()
+        item_type1 = self.mktype()
+        item_type2 = self.mktype()
+        item1 = Skill(item_type1.id)
+        item2 = Skill(item_type2.id)
+        # Action
+        fit.skills.update((item1, item2))
+        # Verification
+        self.assertEqual(len(fit.skills), 2)
+        self.assertIs(fit.skills[item_type1.id], item1)
+        self.assertIs(fit.skills[item_type2.id], item2)
+        # Cleanup
+        self.assert_item_buffers_empty(item1)
+        self.assert_item_buffers_empty(item2)
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_update_item_value_failure_type_id(self):
+        fit = Fit()
+        item_type1 = self.mktype()
+        item_type2 = self.mktype()
+        item1 = Skill(item_type1.id)
+        item2 = Skill(item_type2.id)
+        item3 = Skill(item_type2.id)
+        # Action
+        with self.assertRaises(ValueError):
+            fit.skills.update((item1, item2, item3))
+        # Verification
+        self.assertEqual(len(fit.skills), 0)
+        self.assertNotIn(item_type1.id, fit.skills)
+        self.assertNotIn(item_type2.id, fit.skills)
+        fit.skills.update((item1, item2))
+        # Cleanup
+        self.assert_item_buffers_empty(item1)
+        self.assert_item_buffers_empty(item2)
+        self.assert_item_buffers_empty(item3)
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(0)
@@ -19,6 +19,7 @@
 # ==============================================================================
 
 
+from eos import EffectMode
 from eos import ModuleHigh
 from eos import State
 from eos.const.eve import EffectCategoryId
@@ -67,3 +68,32 @@ class TestDefaultMode(EffectModeTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(self.fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_state_cycling_shared_type(self):
+        # Items of the same type should get effects running according to their
+        # own state and effect modes
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.active,
+            modifiers=[self.modifier])
+        item_type = self.mktype(
+            attrs={self.tgt_attr.id: 10, self.src_attr.id: 2},
+            effects=[effect],
+            default_effect=effect)
+        item1 = ModuleHigh(item_type.id, state=State.offline)
+        item2 = ModuleHigh(item_type.id, state=State.offline)
+        item2.set_effect_mode(effect.id, EffectMode.force_stop)
+        self.fit.modules.high.append(item1)
+        self.fit.modules.high.append(item2)
+        for state, value1 in (
+            (State.online, 10), (State.active, 12), (State.overload, 12),
+            (State.online, 10), (State.offline, 10)
+        ):
+            # Action
+            item1.state = state
+            item2.state = state
+            # Verification
+            self.assertAlmostEqual(item1.attrs[self.tgt_attr.id], value1)
+            self.assertAlmostEqual(item2.attrs[self.tgt_attr.id], 10)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -20,10 +20,12 @@
 
 
 from eos.cache_handler import AttrFetchError
+from eos.cache_handler import BuffTemplatesFetchError
 from eos.cache_handler import EffectFetchError
 from eos.cache_handler import TypeFetchError
 from eos.eve_obj.attribute import AttrFactory
 from eos.eve_obj.attribute import Attribute
+from eos.eve_obj.buff_template import WarfareBuffTemplate
 from eos.eve_obj.effect import Effect
 from eos.eve_obj.effect import EffectFactory
 from eos.eve_obj.type import Type
@@ -39,9 +41,12 @@ class CacheHandler:
         self.__type_data = {}
         self.__attr_data = {}
         self.__effect_data = {}
+        # Format: {buff ID: {buff templates}}
+        self.__buff_template_data = {}
         self.__allocated_type_id = 0
         self.__allocated_attr_id = 0
         self.__allocated_effect_id = 0
+        self.fingerprint = None
 
     def mktype(self, type_id=None, customize=True, **kwargs):
         # Allocate & verify ID
@@ -85,6 +90,12 @@ class CacheHandler:
         self.__effect_data[effect.id] = effect
         return effect
 
+    def mkbuff_template(self, **kwargs):
+        buff_template = WarfareBuffTemplate(**kwargs)
+        self.__buff_template_data.setdefault(
+            buff_template.buff_id, set()).add(buff_template)
+        return buff_template
+
     def get_type(self, type_id):
         try:
             return self.__type_data[type_id]
@@ -103,6 +114,15 @@ class CacheHandler:
         except KeyError:
             raise EffectFetchError(effect_id)
 
+    def get_buff_templates(self, buff_id):
+        try:
+            return self.__buff_template_data[buff_id]
+        except KeyError:
+            raise BuffTemplatesFetchError(buff_id)
+
+    def get_fingerprint(self):
+        return self.fingerprint
+
     def allocate_type_id(self):
         allocated_id = max((
             TEST_ID_START - 1, self.__allocated_type_id,
@@ -0,0 +1,110 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+from eos import Implant
+from eos import Ship
+from eos import State
+from eos.const.eos import ModAffecteeFilter
+from eos.const.eos import ModDomain
+from eos.const.eos import ModOperator
+from eos.const.eve import EffectCategoryId
+from tests.integration.calculator.testcase import CalculatorTestCase
+
+
+class TestMsgStats(CalculatorTestCase):
+
+    def setUp(self):
+        CalculatorTestCase.setUp(self)
+        self.tgt_attr = self.mkattr()
+        src_attr = self.mkattr()
+        modifier = self.mkmod(
+            affectee_filter=ModAffecteeFilter.item,
+            affectee_domain=ModDomain.ship,
+            affectee_attr_id=self.tgt_attr.id,
+            operator=ModOperator.post_percent,
+            affector_attr_id=src_attr.id)
+        effect = self.mkeffect(
+            category_id=EffectCategoryId.passive, modifiers=[modifier])
+        self.implant_type = self.mktype(
+            attrs={src_attr.id: 20}, effects=[effect])
+        self.ship = Ship(self.mktype(attrs={self.tgt_attr.id: 100}).id)
+        self.fit.ship = self.ship
+
+    def test_disabled(self):
+        self.assertIsNone(self.fit.msg_stats)
+        # Action
+        self.fit.implants.add(Implant(self.implant_type.id))
+        # Verification
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 120)
+        self.assertIsNone(self.fit.msg_stats)
+        # Cleanup
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_collected(self):
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 100)
+        msg_stats = self.fit.enable_msg_stats()
+        self.assertIs(self.fit.msg_stats, msg_stats)
+        implant = Implant(self.implant_type.id)
+        # Action
+        self.fit.implants.add(implant)
+        # Verification
+        self.assertAlmostEqual(self.ship.attrs[self.tgt_attr.id], 120)
+        snapshot = msg_stats.snapshot()
+        msg_type_stats = snapshot['msg_types']
+        self.assertEqual(msg_type_stats['ItemAdded']['count'], 1)
+        self.assertEqual(msg_type_stats['ItemAdded']['fanout'], 1)
+        self.assertEqual(
+            msg_type_stats['StatesActivated']['fanout'],
+            len([s for s in State if s <= implant.state]))
+        self.assertEqual(msg_type_stats['EffectsStarted']['count'], 1)
+        self.assertEqual(msg_type_stats['EffectsStarted']['fanout'], 1)
+        self.assertEqual(msg_type_stats['AttrsValueChanged']['count'], 1)
+        self.assertEqual(msg_type_stats['AttrsValueChanged']['fanout'], 1)
+        self.assertGreaterEqual(
+            msg_type_stats['EffectsStarted']['calls'], 1)
+        self.assertGreaterEqual(msg_type_stats['EffectsStarted']['time'], 0)
+        subscriber_stats = snapshot['subscribers']
+        self.assertIn('CalculationService', subscriber_stats)
+        self.assertGreaterEqual(
+            subscriber_stats['CalculationService']['calls'], 1)
+        # Snapshot is not affected by further collection
+        self.fit.implants.clear()
+        self.assertNotIn('ItemRemoved', snapshot['msg_types'])
+        self.assertIn('ItemRemoved', msg_stats.snapshot()['msg_types'])
+        # Cleanup
+        self.fit.disable_msg_stats()
+        self.assertIsNone(self.fit.msg_stats)
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
+
+    def test_reset(self):
+        msg_stats = self.fit.enable_msg_stats()
+        self.fit.implants.add(Implant(self.implant_type.id))
+        # Action
+        msg_stats.reset()
+        # Verification
+        self.assertEqual(
+            msg_stats.snapshot(), {'msg_types': {}, 'subscribers': {}})
+        # Cleanup
+        self.fit.disable_msg_stats()
+        self.assert_solsys_buffers_empty(self.fit.solar_system)
+        self.assert_log_entries(0)
@@ -151,3 +151,26 @@ class TestSourceSwitchCalculator(SourceSwitchTestCase):
         # Cleanup
         self.assert_solsys_buffers_empty(fit.solar_system)
         self.assert_log_entries(0)
+
+    def test_switch_missing_attr(self):
+        # Attributes which cannot be calculated with old source should be
+        # calculated again with new one
+        # Setup
+        attr_id = self.allocate_attr_id('src1', 'src2')
+        self.mkattr(src='src1', attr_id=attr_id)
+        self.mkattr(src='src2', attr_id=attr_id, default_value=5)
+        item_type_id = self.allocate_type_id('src1', 'src2')
+        self.mktype(src='src1', type_id=item_type_id)
+        self.mktype(src='src2', type_id=item_type_id)
+        fit = Fit()
+        item = Rig(item_type_id)
+        fit.rigs.add(item)
+        self.assertIsNone(item.attrs.get(attr_id))
+        self.assert_log_entries(1)
+        # Action
+        fit.solar_system.source = 'src2'
+        # Verification
+        self.assertAlmostEqual(item.attrs.get(attr_id), 5)
+        # Cleanup
+        self.assert_solsys_buffers_empty(fit.solar_system)
+        self.assert_log_entries(1)
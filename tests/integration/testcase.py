@@ -120,6 +120,24 @@ class IntegrationTestCase(EosTestCase):
             src = SourceManager.get(src)
         return src.cache_handler.mkeffect(*args, **kwargs)
 
+    def mkbuff_template(self, src=None, **kwargs):
+        """Make warfare buff template and add it to default source.
+
+        Args:
+            src (optional): Source alias to which buff template should be
+                added. Default source is used by default.
+            **kwargs: Keyword arguments which will be used to instantiate buff
+                template.
+
+        Returns:
+            Warfare buff template.
+        """
+        if src is None:
+            src = SourceManager.default
+        else:
+            src = SourceManager.get(src)
+        return src.cache_handler.mkbuff_template(**kwargs)
+
     def mkmod(self, **kwargs):
         """Shortcut to instantiating dogma modifier.
 
@@ -193,7 +211,10 @@ class IntegrationTestCase(EosTestCase):
         # Verify
         entry_num = self._get_obj_buffer_entry_count(
             solsys,
-            ignore_attrs=(('SolarSystem', '_SolarSystem__source'),))
+            ignore_attrs=(
+                ('SolarSystem', '_SolarSystem__source'),
+                # Source-specific data, shared with other solar systems
+                ('SolarSystem', '_attr_metadata')))
         # Report
         if entry_num:
             msg = (
@@ -269,6 +290,11 @@ class IntegrationTestCase(EosTestCase):
                 ('Fit', '_Fit__incoming_dmg_rah'),
                 # Restriction registers are always in subscribers
                 ('Fit', '_FitMsgBroker__subscribers'),
+                # Dispatch table is derived from subscribers
+                ('Fit', '_FitMsgBroker__dispatch_table'),
+                ('Fit', '_FitMsgBroker__dispatch_subscriber_classes'),
+                ('Fit', '_FitMsgBroker__batch_immediate_dispatch'),
+                ('Fit', '_FitMsgBroker__batch_deferred_dispatch'),
                 # Service is allowed to keep list of restrictions permanently
                 ('RestrictionService', '_RestrictionService__restrictions')))
         # Report
@@ -298,7 +324,9 @@ class IntegrationTestCase(EosTestCase):
                 # Disallow to investigate parent
                 ('BaseItemMixin', '_container'),
                 # Allowed to carry effect settings permanently
-                ('BaseItemMixin', '_BaseItemMixin__effect_mode_overrides')))
+                ('BaseItemMixin', '_BaseItemMixin__effect_mode_overrides'),
+                # Item types are allowed to cache effect statuses permanently
+                ('Type', 'default_running_effect_ids')))
         # Report
         if entry_num:
             msg = '{} entries in item buffers: buffers must be empty'.format(
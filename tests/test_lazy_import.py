@@ -0,0 +1,88 @@
+# ==============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2018 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ==============================================================================
+
+
+import os
+import subprocess
+import sys
+from importlib import import_module
+
+import pytest
+
+import eos
+from eos.eve_obj.effect import EffectFactory
+from eos.eve_obj.effect.registry import effect_class_modules
+
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    output = subprocess.check_output(
+        [sys.executable, '-c', code], cwd=ROOT_PATH, universal_newlines=True)
+    return output.strip()
+
+
+def test_import_loads_nothing():
+    # Guards import time of the package: nothing but the package itself should
+    # be loaded until its contents are accessed
+    output = run_python(
+        'import sys; import eos; '
+        'print(sorted(m for m in sys.modules if m.startswith("eos")))')
+    assert output == "['eos']"
+
+
+def test_effect_class_loaded_on_demand():
+    output = run_python(
+        'import sys; from eos.eve_obj.effect import EffectFactory; '
+        'from eos.const.eve import EffectId; '
+        'module = "eos.eve_obj.effect.repairs.armor_repair"; '
+        'print(module in sys.modules); '
+        'effect = EffectFactory.make(EffectId.armor_repair); '
+        'print(module in sys.modules, type(effect).__name__)')
+    assert output.split() == ['False', 'True', 'ArmorRepair']
+
+
+def test_public_names():
+    for name in eos.__all__:
+        assert getattr(eos, name).__name__ == name
+    assert set(eos.__all__).issubset(dir(eos))
+    with pytest.raises(AttributeError):
+        eos.NonExistentName
+
+
+def test_effect_class_registry():
+    # Load all modules with custom effect classes, every class they register
+    # has to be listed in registry
+    for package_name, load_func_name in (
+        ('cap_transmit', 'load_cap_transmit'),
+        ('dmg_dealer', 'load_dmg_dealers'),
+        ('ewar', 'load_ewar'),
+        ('neut', 'load_neuts'),
+        ('repairs', 'load_repairers'),
+        ('warfare_buff', 'load_warfare_buffs')
+    ):
+        package = import_module('.' + package_name, 'eos.eve_obj.effect')
+        getattr(package, load_func_name)()
+    assert set(EffectFactory._class_id_map) == set(effect_class_modules)
+    for effect_id, module_name in effect_class_modules.items():
+        module = import_module(module_name, 'eos.eve_obj.effect')
+        effect_class = EffectFactory._class_id_map[effect_id]
+        assert getattr(module, effect_class.__name__) is effect_class